@@ -0,0 +1,31 @@
+"""Shared helpers for the benchmark scripts in this folder."""
+import csv
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATASETS = REPO_ROOT / "datasets"
+
+# Same import convention as main.py and the tests: `from src.sindi...`
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def load_predicates(path: os.PathLike, column: str = "predicate", limit: Optional[int] = None) -> List[str]:
+    """Read one column of a dataset CSV (defaults to `predicate`)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        preds = [row[column] for row in csv.DictReader(f) if row.get(column)]
+    return preds[:limit] if limit else preds
+
+
+def best_of(fn: Callable[[], object], repeat: int = 3) -> float:
+    """Best wall-clock time (seconds) of `repeat` runs of `fn`."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
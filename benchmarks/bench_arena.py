@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Memory and traversal speed of parsed corpora: a list of `ASTNode` trees vs.
+one `ASTArena` (`Parser.parse_corpus`).
+
+Reports retained bytes per predicate and the time of a full depth-first walk
+that reads every node value, over ASTNode trees, ArenaNode views, and the
+arena's raw arrays (depth-first, and as a linear scan of each predicate's span).
+
+    python benchmarks/bench_arena.py [--csv datasets/diversified_predicates.csv]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from _common import DATASETS, best_of, load_predicates
+from src.sindi.parser import ASTArena, Parser
+from src.sindi.tokenizer import Tokenizer
+
+
+def _parse_all(token_lists):
+    out = []
+    for tokens in token_lists:
+        try:
+            out.append(Parser(tokens).parse() if tokens is not None else None)
+        except ValueError:
+            out.append(None)
+    return out
+
+
+def _retained(fn):
+    """Bytes still allocated by `fn`'s result once it returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def _walk(roots):
+    nodes = ops = 0
+    stack = [r for r in roots if r is not None]
+    while stack:
+        n = stack.pop()
+        nodes += 1
+        if n.children:
+            ops += 1
+        stack.extend(n.children)
+    return nodes, ops
+
+
+def _walk_arrays(arena: ASTArena):
+    values, value_ids = arena.values, arena.value_ids
+    first_child, child_count = arena.first_child, arena.child_count
+    nodes = ops = 0
+    for i, root in enumerate(arena.roots):
+        if i in arena.errors:
+            continue
+        stack = [root]
+        while stack:
+            k = stack.pop()
+            values[value_ids[k]]
+            nodes += 1
+            count = child_count[k]
+            if count:
+                ops += 1
+                first = first_child[k]
+                stack.extend(range(first, first + count))
+    return nodes, ops
+
+
+def _scan_arrays(arena: ASTArena):
+    # Order-free visit: each predicate's nodes are one contiguous id range.
+    values, value_ids, child_count = arena.values, arena.value_ids, arena.child_count
+    nodes = ops = 0
+    for i in range(len(arena)):
+        if i in arena.errors:
+            continue
+        for k in arena.span(i):
+            values[value_ids[k]]
+            nodes += 1
+            if child_count[k]:
+                ops += 1
+    return nodes, ops
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--csv", default=str(DATASETS / "diversified_predicates.csv"))
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    predicates = load_predicates(args.csv) + load_predicates(args.csv, column="diversified_predicate")
+    tk = Tokenizer()
+    corpus = tk.tokenize_corpus(predicates)
+    token_lists = list(corpus)
+
+    trees, tree_bytes = _retained(lambda: _parse_all(token_lists))
+    arena, arena_bytes = _retained(lambda: Parser.parse_corpus(corpus))
+    n = len(predicates)
+    print(f"{n} predicates, {arena.num_nodes} nodes, {len(arena.errors)} lex/parse errors")
+    print(f"{'ASTNode trees':16s} {tree_bytes / n:8.1f} bytes/predicate")
+    print(f"{'ASTArena':16s} {arena_bytes / n:8.1f} bytes/predicate"
+          f"  ({arena.nbytes() / n:.1f} in arrays + value text)")
+
+    nodes, _ = _walk(trees)
+    assert _walk(trees) == _walk(arena) == _walk_arrays(arena) == _scan_arrays(arena)
+    for label, fn in (
+        ("ASTNode walk", lambda: _walk(trees)),
+        ("ArenaNode walk", lambda: _walk(arena)),
+        ("arena arrays walk", lambda: _walk_arrays(arena)),
+        ("arena arrays scan", lambda: _scan_arrays(arena)),
+    ):
+        secs = best_of(fn, args.repeat)
+        print(f"{label:18s} {secs * 1e3:8.1f} ms  ({nodes / secs / 1e6:5.2f} M nodes/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Measure how `batch.compare_many` scales with the number of worker processes.
+
+Compares predicate / diversified-predicate pairs from a dataset CSV with 1,
+2, 4, ... up to `--max-workers` workers (simplification cache off, so every
+run does the same work) and reports wall time, pairs/sec, speedup over one
+worker, parallel efficiency, and whether the verdicts match the 1-worker run.
+
+    python benchmarks/bench_batch.py [--csv datasets/diversified_predicates.csv] [--pairs 400] [--engine sympy]
+"""
+import argparse
+import os
+import random
+import time
+
+from _common import DATASETS, load_predicates
+from src.sindi.batch import BATCH_ENGINES, DEFAULT_CHUNKSIZE, compare_many
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--csv", default=str(DATASETS / "diversified_predicates.csv"))
+    ap.add_argument("--pairs", type=int, default=400)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--engine", choices=BATCH_ENGINES, default="sympy")
+    ap.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = ap.parse_args()
+
+    left = load_predicates(args.csv)
+    right = load_predicates(args.csv, column="diversified_predicate")
+    pairs = list(zip(left, right))
+    random.Random(args.seed).shuffle(pairs)
+    pairs = pairs[: args.pairs]
+    kwargs = {} if args.engine == "light" else {"simplify_cache_size": 0}
+
+    counts = [1]
+    while counts[-1] * 2 <= args.max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != args.max_workers:
+        counts.append(args.max_workers)
+
+    print(f"{len(pairs)} pairs from {args.csv}, engine {args.engine}, chunksize {args.chunksize}, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'workers':>7s} {'seconds':>8s} {'pairs/s':>8s} {'speedup':>8s} {'efficiency':>10s} {'same verdicts':>14s}")
+    base_time = base = None
+    for workers in counts:
+        t0 = time.perf_counter()
+        results = list(compare_many(pairs, engine=args.engine, workers=workers, chunksize=args.chunksize, **kwargs))
+        elapsed = time.perf_counter() - t0
+        verdicts = [r.verdict or r.error for r in results]
+        if base is None:
+            base_time, base = elapsed, verdicts
+        print(f"{workers:7d} {elapsed:8.2f} {len(pairs) / elapsed:8.1f} {base_time / elapsed:7.2f}x "
+              f"{base_time / elapsed / workers:9.0%} {str(verdicts == base):>14s}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
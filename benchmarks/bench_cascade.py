@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Measure how often `CascadeComparator` stays in its rules tier, and what it saves.
+
+Runs `Comparator.compare` and `CascadeComparator.compare` (both with the
+simplification cache off) on random predicate pairs and on predicate /
+diversified-predicate pairs from the dataset CSVs. Reports the time of each,
+the share of pairs decided without a solver, and how many verdicts agree.
+
+    python benchmarks/bench_cascade.py [--pairs 300] [--engine sympy]
+"""
+import argparse
+import random
+import time
+
+from _common import DATASETS, load_predicates
+from src.sindi.cascade import CascadeComparator
+from src.sindi.comparator import ENGINES, Comparator
+from src.sindi.utils import set_quiet
+
+
+def _run(cmp, pairs):
+    out = []
+    t0 = time.perf_counter()
+    for p1, p2 in pairs:
+        try:
+            out.append(cmp.compare(p1, p2))
+        except Exception as e:  # parse errors etc. count as a verdict of their own
+            out.append(f"error: {type(e).__name__}")
+    return out, time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--pairs", type=int, default=300)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--engine", choices=ENGINES, default="sympy")
+    args = ap.parse_args()
+    set_quiet(True)
+
+    rng = random.Random(args.seed)
+    preds = load_predicates(DATASETS / "predicate_sample_1000.csv")
+    left = load_predicates(DATASETS / "diversified_predicates.csv")
+    right = load_predicates(DATASETS / "diversified_predicates.csv", column="diversified_predicate")
+    diversified = list(zip(left, right))
+    rng.shuffle(diversified)
+    sets = {
+        "random": [(rng.choice(preds), rng.choice(preds)) for _ in range(args.pairs)],
+        "diversified": diversified[: args.pairs],
+    }
+
+    print(f"engine {args.engine}, simplification cache off")
+    print(f"{'pairs':>12s} {'n':>5s} {'full s':>8s} {'cascade s':>10s} {'speedup':>8s} {'rules':>7s} {'agree':>7s}")
+    for name, pairs in sets.items():
+        full, t_full = _run(Comparator(simplify_cache_size=0, engine=args.engine), pairs)
+        cascade = CascadeComparator(simplify_cache_size=0, engine=args.engine)
+        tiered, t_cascade = _run(cascade, pairs)
+        rules = cascade.tier_counts["rules"] / max(sum(cascade.tier_counts.values()), 1)
+        same = sum(a == b for a, b in zip(full, tiered))
+        print(f"{name:>12s} {len(pairs):5d} {t_full:8.2f} {t_cascade:10.2f} {t_full / t_cascade:7.1f}x "
+              f"{rules:6.0%} {same:3d}/{len(pairs)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
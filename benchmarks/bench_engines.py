@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Compare throughput and verdict agreement of the `Comparator` engines.
+
+Draws random predicate pairs from a dataset CSV and runs `Comparator.compare`
+on each with the SymPy engine (the default, simplification cache off) and with
+the direct AST-to-Z3 engine. Reports compares/sec and the per-compare latency
+distribution of each engine, and how many verdicts agree with `sympy`.
+
+    python benchmarks/bench_engines.py [--csv datasets/predicate_sample_1000.csv] [--pairs 300]
+"""
+import argparse
+import random
+import statistics
+import time
+from collections import Counter
+
+from _common import DATASETS, load_predicates
+from src.sindi.comparator import ENGINES, Comparator
+from src.sindi.utils import set_quiet
+
+
+def _pct(sorted_ms, q):
+    return sorted_ms[min(len(sorted_ms) - 1, int(q * len(sorted_ms)))]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--csv", default=str(DATASETS / "predicate_sample_1000.csv"))
+    ap.add_argument("--pairs", type=int, default=300)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--engines", default=",".join(ENGINES))
+    args = ap.parse_args()
+    set_quiet(True)
+
+    preds = load_predicates(args.csv)
+    rng = random.Random(args.seed)
+    pairs = [(rng.choice(preds), rng.choice(preds)) for _ in range(args.pairs)]
+
+    engines = args.engines.split(",")
+    verdicts = {}
+    print(f"{len(pairs)} random pairs from {args.csv}")
+    print(f"{'engine':>6s} {'pairs/s':>8s} {'mean':>8s} {'p50':>8s} {'p90':>8s} {'p99':>8s} {'max':>9s} {'errors':>7s}  (ms)")
+    for name in engines:
+        cmp = Comparator(simplify_cache_size=0, engine=name)
+        times, out = [], []
+        for p1, p2 in pairs:
+            t0 = time.perf_counter()
+            try:
+                out.append(cmp.compare(p1, p2))
+            except Exception as e:  # parse errors etc. count as a verdict of their own
+                out.append(f"error: {type(e).__name__}")
+            times.append((time.perf_counter() - t0) * 1e3)
+        verdicts[name] = out
+        ms = sorted(times)
+        errors = sum(v.startswith("error") for v in out)
+        print(f"{name:>6s} {len(ms) / (sum(ms) / 1e3):8.1f} {statistics.mean(ms):8.2f} {_pct(ms, .5):8.2f} "
+              f"{_pct(ms, .9):8.2f} {_pct(ms, .99):8.2f} {ms[-1]:9.2f} {errors:7d}")
+
+    ref = verdicts.get("sympy")
+    if ref is not None:
+        print()
+        for name in engines:
+            if name != "sympy":
+                same = sum(a == b for a, b in zip(ref, verdicts[name]))
+                print(f"{name:>6s} agrees with sympy on {same}/{len(ref)} verdicts")
+                for (a, b), n in Counter((a, b) for a, b in zip(ref, verdicts[name]) if a != b).most_common():
+                    print(f"{n:8d}  sympy: {a}\n{'':10s}{name}: {b}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Measure process start-up cost of the CLI commands.
+
+Runs `python -X importtime -m <module> <command>` in a fresh process per
+command (several times each) and reports the median wall time, the total
+import time `-X importtime` reports, the peak RSS, and whether SymPy or Z3
+were imported. Only solver-backed commands should load them.
+
+    python benchmarks/bench_import.py [--repeat 5] [--module src.sindi]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from _common import REPO_ROOT
+
+COMMANDS = {
+    "rewrite": ["rewrite", "now > a"],
+    "tokenize": ["tokenize", "now > a"],
+    "parse": ["parse", "now > a"],
+    "compare --light": ["compare", "a > b", "a >= b", "--light"],
+    "compare --engine z3": ["compare", "a > b", "a >= b", "--engine", "z3"],
+    "compare": ["compare", "a > b", "a >= b"],
+}
+
+
+def _run(module, argv):
+    """(wall seconds, import microseconds, peak RSS in KiB, imported top-level modules)."""
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-X", "importtime", "-m", module, *argv], cwd=REPO_ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    stderr = proc.stderr.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - t0
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode:
+        raise SystemExit(f"{module} {' '.join(argv)} failed:\n{stderr}")
+    total_us, top = 0, set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # top-level import
+            total_us += int(cumulative)
+        top.add(name.strip().split(".")[0])
+    return wall, total_us, usage.ru_maxrss, top
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--module", default="src.sindi", help="CLI module to run (`sindi` when installed)")
+    args = ap.parse_args()
+
+    print(f"python -X importtime -m {args.module} <command>, median of {args.repeat} runs")
+    print(f"{'command':>22s} {'wall ms':>8s} {'import ms':>10s} {'RSS MiB':>8s}  solvers loaded")
+    for name, argv in COMMANDS.items():
+        runs = [_run(args.module, argv) for _ in range(args.repeat)]
+        loaded = sorted(runs[-1][3] & {"sympy", "z3"}) or ["-"]
+        print(f"{name:>22s} {statistics.median(r[0] for r in runs) * 1e3:8.0f} "
+              f"{statistics.median(r[1] for r in runs) / 1e3:10.0f} "
+              f"{statistics.median(r[2] for r in runs) / 1024:8.1f}  {', '.join(loaded)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Measure what an `InvariantSet` saved to disk saves on a re-run.
+
+Builds the strongest set of N dataset predicates from scratch, saves it,
+then applies a "re-run" that drops and adds a share of the predicates.
+Compares a rebuild from scratch with `load` + `sync`: engine calls, time,
+and whether both end with the same strongest set.
+
+    python benchmarks/bench_invariant_set.py [--n 300] [--churn 0.05] [--engine z3]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from _common import DATASETS, load_predicates
+from src.sindi.batch import BATCH_ENGINES
+from src.sindi.invariants import InvariantSet
+from src.sindi.utils import set_quiet
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--n", type=int, default=300)
+    ap.add_argument("--churn", type=float, default=0.05, help="share of predicates dropped and added")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--engine", choices=BATCH_ENGINES, default="z3")
+    args = ap.parse_args()
+    set_quiet(True)
+
+    rng = random.Random(args.seed)
+    preds = list(dict.fromkeys(load_predicates(DATASETS / "predicate_sample_1000.csv")))
+    rng.shuffle(preds)
+    k = int(args.n * args.churn)
+    before = preds[: args.n]
+    after = [p for p in before if p not in set(rng.sample(before, k))] + preds[args.n: args.n + k]
+
+    path = os.path.join(tempfile.mkdtemp(), "invariants.json")
+    t0 = time.perf_counter()
+    InvariantSet(before, engine=args.engine).save(path)
+    t_first = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    rebuilt = InvariantSet(after, engine=args.engine)
+    t_rebuild = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    synced = InvariantSet.load(path)
+    synced.sync(after)
+    t_sync = time.perf_counter() - t0
+
+    print(f"engine {args.engine}, {args.n} predicates, {k} dropped and {k} added "
+          f"(first build {t_first:.2f}s, {os.path.getsize(path) // 1024} KiB on disk)")
+    print(f"{'':>12s} {'calls':>7s} {'seconds':>8s}")
+    print(f"{'rebuild':>12s} {rebuilt.comparisons:7d} {t_rebuild:8.2f}")
+    print(f"{'load + sync':>12s} {synced.comparisons:7d} {t_sync:8.2f}")
+    print(f"same strongest set: {set(rebuilt.strongest) == set(synced.strongest)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
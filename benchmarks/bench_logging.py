@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Measure what debug logging costs `Comparator.compare` in quiet mode.
+
+Runs `compare` (simplification cache off) on random predicate pairs and on
+predicate / diversified-predicate pairs, quiet and then with debug output on
+(sent to /dev/null). Reports the time per compare and how many SymPy
+`satisfiable` calls each compare made; in quiet mode only the checks the
+verdict needs should run.
+
+    python benchmarks/bench_logging.py [--pairs 200]
+"""
+import argparse
+import os
+import random
+import time
+from contextlib import redirect_stdout
+
+from _common import DATASETS, load_predicates
+import src.sindi.comparator as comparator_module
+from src.sindi.comparator import Comparator
+from src.sindi.utils import set_quiet
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--pairs", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    preds = load_predicates(DATASETS / "predicate_sample_1000.csv")
+    left = load_predicates(DATASETS / "diversified_predicates.csv")
+    right = load_predicates(DATASETS / "diversified_predicates.csv", column="diversified_predicate")
+    diversified = list(zip(left, right))
+    rng.shuffle(diversified)
+    pairs = [(rng.choice(preds), rng.choice(preds)) for _ in range(args.pairs)] + diversified[: args.pairs]
+
+    calls = [0]
+    satisfiable = comparator_module.satisfiable
+
+    def counting_satisfiable(*a, **kw):
+        calls[0] += 1
+        return satisfiable(*a, **kw)
+
+    comparator_module.satisfiable = counting_satisfiable
+
+    print(f"{len(pairs)} pairs, simplification cache off")
+    print(f"{'mode':>6s} {'ms/compare':>11s} {'satisfiable/compare':>20s}")
+    with open(os.devnull, "w") as devnull:
+        for mode in ("quiet", "debug"):
+            set_quiet(mode == "quiet")
+            cmp = Comparator(simplify_cache_size=0)
+            calls[0] = 0
+            t0 = time.perf_counter()
+            with redirect_stdout(devnull):
+                for p1, p2 in pairs:
+                    try:
+                        cmp.compare(p1, p2)
+                    except Exception:
+                        pass
+            elapsed = time.perf_counter() - t0
+            print(f"{mode:>6s} {elapsed / len(pairs) * 1e3:11.2f} {calls[0] / len(pairs):20.2f}")
+    set_quiet(True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+AST normalization and rule-based comparison on wide and deep predicates.
+
+Wide: builds `c0 && c1 && ... && cN` over shuffled relational atoms and times
+`ASTRewriter.normalize`, `comparator_light.normalize_ast`, and a
+`ComparatorRulesOnly.compare` of the conjunction against a sub-conjunction
+(which exercises structural equality, sorting and set membership).
+
+Deep: times `ASTRewriter.normalize` on `x0 - x1 - ... - xN + 1 > y == true`,
+a left-deep chain that no rule flattens, so the result is as deep as the input.
+
+    python benchmarks/bench_normalize.py [--sizes 10,100,1000,3000] [--depths 100,1000,10000]
+"""
+import argparse
+import random
+
+from _common import best_of
+from src.sindi.ast_rewriter import ASTRewriter
+from src.sindi.comparator_light import ComparatorRulesOnly, normalize_ast
+from src.sindi.parser import Parser
+from src.sindi.tokenizer import Tokenizer
+
+
+def _balanced(atoms):
+    # Balanced parenthesization keeps parse depth logarithmic; flattening
+    # still yields a single wide `&&` node.
+    if len(atoms) == 1:
+        return f"({atoms[0]})"
+    mid = len(atoms) // 2
+    return f"({_balanced(atoms[:mid])} && {_balanced(atoms[mid:])})"
+
+
+def conjunction(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    atoms = [f"balances[user{i}] + fee{i % 7} >= limit{i} - {i}" for i in range(n)]
+    rng.shuffle(atoms)
+    return _balanced(atoms)
+
+
+def chain(depth: int) -> str:
+    return " - ".join(f"x{i}" for i in range(depth)) + " + 1 > y == true"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", default="10,100,1000,3000")
+    ap.add_argument("--depths", default="100,1000,10000")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    tk = Tokenizer()
+    rewriter = ASTRewriter()
+    light = ComparatorRulesOnly()
+    print(f"{'atoms':>6s} {'ASTRewriter (ms)':>17s} {'normalize_ast (ms)':>19s} {'light compare (ms)':>19s}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        big = conjunction(n)
+        small = conjunction(n // 2 or 1, seed=1)  # same atoms, so big ⇒ small
+        ast = Parser(tk.tokenize(big)).parse()
+        t_rw = best_of(lambda: rewriter.normalize(ast, intern=True), args.repeat)
+        t_light = best_of(lambda: normalize_ast(ast), args.repeat)
+        t_cmp = best_of(lambda: light.compare(big, small), args.repeat)
+        print(f"{n:6d} {t_rw * 1e3:17.2f} {t_light * 1e3:19.2f} {t_cmp * 1e3:19.2f}")
+
+    print(f"\n{'depth':>6s} {'ASTRewriter (ms)':>17s}")
+    for depth in (int(x) for x in args.depths.split(",")):
+        ast = Parser(tk.tokenize(chain(depth))).parse()
+        t_rw = best_of(lambda: rewriter.normalize(ast, intern=True), args.repeat)
+        print(f"{depth:6d} {t_rw * 1e3:17.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Measure what `order.implication_matrix` saves over the naive N x N matrix.
+
+Builds the implication matrix of two predicate sets, once with
+`implication_matrix` and once with `implies` on every ordered pair of
+prepared predicates (fresh comparators, simplification cache off):
+
+  - dataset: predicates and their diversified variants (diversified_predicates.csv)
+  - chains:  `v > c` / `v >= c` thresholds on a few variables (long implication chains)
+
+Reports the checks each ran, their times and whether the matrices agree.
+
+    python benchmarks/bench_order.py [--rows 40] [--engine z3]
+"""
+import argparse
+import random
+import time
+
+from _common import DATASETS, load_predicates
+from src.sindi.batch import BATCH_ENGINES, _make_comparator
+from src.sindi.order import implication_matrix
+from src.sindi.utils import set_quiet
+
+
+def _naive(engine, predicates):
+    cmp = _make_comparator(engine, {"simplify_cache_size": 0} if engine != "light" else {})
+    prepared = [cmp.prepare(p) for p in predicates]
+    return [[a is b or bool(cmp.implies(a, b)) for b in prepared] for a in prepared]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, default=40, help="diversified_predicates.csv rows (2 predicates each)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--engine", choices=BATCH_ENGINES, default="z3")
+    args = ap.parse_args()
+    set_quiet(True)
+
+    rng = random.Random(args.seed)
+    rows = list(zip(load_predicates(DATASETS / "diversified_predicates.csv"),
+                    load_predicates(DATASETS / "diversified_predicates.csv", column="diversified_predicate")))
+    rng.shuffle(rows)
+    checker = _make_comparator("light", {})
+    dataset = []
+    for pair in rows:
+        for p in pair:
+            try:
+                checker.prepare(p).ast
+            except Exception:  # skip what does not parse
+                continue
+            dataset.append(p)
+        if len(dataset) >= 2 * args.rows:
+            break
+    chains = [f"{v} {op} {c}" for v in ("a", "b", "c") for c in range(0, 16, 2) for op in (">", ">=")]
+    rng.shuffle(chains)
+
+    kwargs = {"simplify_cache_size": 0} if args.engine != "light" else {}
+    implication_matrix(["a > 1", "a > 0", "b == 0"], engine=args.engine, **kwargs)  # warm-up (lazy imports)
+    print(f"engine {args.engine}")
+    print(f"{'set':>8s} {'n':>4s} {'classes':>8s} {'checks':>7s} {'naive':>6s} {'order s':>8s} {'naive s':>8s} {'agree':>6s}")
+    for name, preds in (("dataset", dataset), ("chains", chains)):
+        t0 = time.perf_counter()
+        order = implication_matrix(preds, engine=args.engine, **kwargs)
+        t_order = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        naive = _naive(args.engine, preds)
+        t_naive = time.perf_counter() - t0
+        print(f"{name:>8s} {len(preds):4d} {len(order.classes):8d} {order.comparisons:7d} "
+              f"{order.naive_comparisons:6d} {t_order:8.2f} {t_naive:8.2f} {'yes' if naive == order.matrix else 'NO':>6s}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Parse time vs. predicate length for `Parser`.
+
+Builds Daikon-style disjunctions `x == 0 || x == 1 || ...` of growing size
+and reports parse time and time per term (flat per-term cost = linear
+scaling). Also reports throughput on a dataset CSV.
+
+    python benchmarks/bench_parser.py [--max-terms 10000] [--csv datasets/predicate_sample_10000.csv]
+"""
+import argparse
+
+from _common import DATASETS, best_of, load_predicates
+from src.sindi.parser import Parser
+from src.sindi.tokenizer import Tokenizer
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--max-terms", type=int, default=10000)
+    ap.add_argument("--csv", default=str(DATASETS / "predicate_sample_10000.csv"))
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    tk = Tokenizer()
+    print(f"{'terms':>8s} {'tokens':>8s} {'parse (ms)':>12s} {'us/term':>9s}")
+    terms = 10
+    while terms <= args.max_terms:
+        tokens = tk.tokenize(" || ".join(f"x == {i}" for i in range(terms)))
+        secs = best_of(lambda: Parser(tokens).parse(), args.repeat)
+        print(f"{terms:8d} {len(tokens):8d} {secs * 1e3:12.3f} {secs * 1e6 / terms:9.2f}")
+        terms *= 10
+
+    token_lists = []
+    for p in load_predicates(args.csv):
+        try:
+            token_lists.append(tk.tokenize(p))
+        except ValueError:
+            pass
+
+    def parse_all():
+        for tokens in token_lists:
+            try:
+                Parser(tokens).parse()
+            except ValueError:
+                pass
+
+    secs = best_of(parse_all, args.repeat)
+    print(f"\n{len(token_lists)} dataset predicates: {secs:.3f}s ({len(token_lists) / secs:,.0f} predicates/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
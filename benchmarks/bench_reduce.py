@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Measure `reduce.strongest` against the all-pairs strongest-set loop.
+
+For groups of predicates (random dataset predicates, and `v op c`
+thresholds on one variable, where most predicates are redundant) computes
+the strongest set with `strongest` and by comparing every ordered pair,
+and reports the compare calls and time of each and whether they agree.
+
+    python benchmarks/bench_reduce.py [--groups 20] [--size 30] [--engine light]
+"""
+import argparse
+import random
+import time
+
+from _common import DATASETS, load_predicates
+from src.sindi.batch import BATCH_ENGINES, _make_comparator
+from src.sindi.reduce import strongest
+from src.sindi.utils import set_quiet
+
+STRONGER = "The first predicate is stronger."
+
+
+def _all_pairs(cmp, preds):
+    prepared = [cmp.prepare(p) for p in preds]
+    weaker = set()
+    for i, a in enumerate(prepared):
+        for j, b in enumerate(prepared):
+            if i != j and cmp.compare(a, b) == STRONGER:
+                weaker.add(j)
+    return [p for j, p in enumerate(preds) if j not in weaker], len(preds) * (len(preds) - 1)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--groups", type=int, default=20)
+    ap.add_argument("--size", type=int, default=30)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--engine", choices=BATCH_ENGINES, default="light")
+    args = ap.parse_args()
+    set_quiet(True)
+
+    rng = random.Random(args.seed)
+    cmp = _make_comparator(args.engine, {})
+    sample = []
+    for p in load_predicates(DATASETS / "predicate_sample_1000.csv"):
+        try:
+            cmp.prepare(p).ast
+        except Exception:  # skip what does not parse
+            continue
+        sample.append(p)
+    sets = {
+        "random": [rng.sample(sample, args.size) for _ in range(args.groups)],
+        "thresholds": [[f"x {rng.choice(['>', '>=', '<', '<=', '=='])} {rng.randrange(100)}"
+                        for _ in range(args.size)] for _ in range(args.groups)],
+    }
+
+    print(f"engine {args.engine}, {args.groups} groups of {args.size}")
+    print(f"{'groups':>10s} {'kept':>6s} {'calls':>7s} {'all-pairs':>10s} {'reduce s':>9s} {'pairs s':>8s} {'agree':>6s}")
+    for name, groups in sets.items():
+        kept = calls = naive_calls = agree = 0
+        t_reduce = t_pairs = 0.0
+        for preds in groups:
+            t0 = time.perf_counter()
+            reduction = strongest(preds, engine=args.engine)
+            t_reduce += time.perf_counter() - t0
+            t0 = time.perf_counter()
+            expected, n = _all_pairs(_make_comparator(args.engine, {}), preds)
+            t_pairs += time.perf_counter() - t0
+            kept += len(reduction.kept)
+            calls += reduction.comparisons
+            naive_calls += n
+            agree += reduction.kept_predicates == expected
+        print(f"{name:>10s} {kept:6d} {calls:7d} {naive_calls:10d} {t_reduce:9.2f} {t_pairs:8.2f} "
+              f"{agree:3d}/{len(groups)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Compare latency and verdict agreement of `Comparator` simplification strategies.
+
+Runs `Comparator.compare` on predicate / diversified-predicate pairs from a
+dataset CSV, once per strategy (`full`, `logic`, `linear`, `none`), with
+the simplification cache off so every call pays for its strategy. Reports
+the per-compare latency distribution and how many verdicts agree with `full`.
+
+    python benchmarks/bench_simplify.py [--csv datasets/diversified_predicates.csv] [--pairs 300] [--budget 200]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from _common import DATASETS, load_predicates
+from src.sindi.comparator import SIMPLIFY_STRATEGIES, Comparator
+from src.sindi.utils import set_quiet
+
+
+def _pct(sorted_ms, q):
+    return sorted_ms[min(len(sorted_ms) - 1, int(q * len(sorted_ms)))]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--csv", default=str(DATASETS / "diversified_predicates.csv"))
+    ap.add_argument("--pairs", type=int, default=300)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--strategies", default=",".join(SIMPLIFY_STRATEGIES))
+    ap.add_argument("--budget", type=int, default=None, help="op-count budget per expression")
+    args = ap.parse_args()
+    set_quiet(True)
+
+    left = load_predicates(args.csv)
+    right = load_predicates(args.csv, column="diversified_predicate")
+    pairs = list(zip(left, right))
+    random.Random(args.seed).shuffle(pairs)
+    pairs = pairs[: args.pairs]
+
+    strategies = args.strategies.split(",")
+    verdicts = {}
+    print(f"{len(pairs)} pairs from {args.csv}" + (f", budget {args.budget}" if args.budget is not None else ""))
+    print(f"{'strategy':>8s} {'mean':>8s} {'p50':>8s} {'p90':>8s} {'p99':>8s} {'max':>9s} {'errors':>7s}  (ms)")
+    for name in strategies:
+        cmp = Comparator(simplify_cache_size=0, simplify_strategy=name, simplify_budget=args.budget)
+        times, out = [], []
+        for p1, p2 in pairs:
+            t0 = time.perf_counter()
+            try:
+                out.append(cmp.compare(p1, p2))
+            except Exception as e:  # parse errors etc. count as a verdict of their own
+                out.append(f"error: {type(e).__name__}")
+            times.append((time.perf_counter() - t0) * 1e3)
+        verdicts[name] = out
+        ms = sorted(times)
+        errors = sum(v.startswith("error") for v in out)
+        print(f"{name:>8s} {statistics.mean(ms):8.1f} {_pct(ms, .5):8.1f} {_pct(ms, .9):8.1f} "
+              f"{_pct(ms, .99):8.1f} {ms[-1]:9.1f} {errors:7d}")
+
+    ref = verdicts.get("full")
+    if ref is not None:
+        print()
+        for name in strategies:
+            if name != "full":
+                same = sum(a == b for a, b in zip(ref, verdicts[name]))
+                print(f"{name:>8s} agrees with full on {same}/{len(ref)} verdicts")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
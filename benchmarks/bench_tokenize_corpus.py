@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Time and peak memory of tokenizing a whole corpus: one `Tokenizer.tokenize`
+list per predicate vs. a single `Tokenizer.tokenize_corpus` pass.
+
+    python benchmarks/bench_tokenize_corpus.py [--csv datasets/diversified_predicates.csv]
+"""
+import argparse
+import tracemalloc
+
+from _common import DATASETS, best_of, load_predicates
+from src.sindi.tokenizer import Tokenizer
+
+
+def _per_predicate(tk, predicates):
+    out = []
+    for p in predicates:
+        try:
+            out.append(tk.tokenize(p))
+        except ValueError:
+            out.append(None)
+    return out
+
+
+def _peak_memory(fn):
+    """Peak traced allocation while `fn` runs (timed separately: tracing is slow)."""
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--csv", default=str(DATASETS / "diversified_predicates.csv"))
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    predicates = load_predicates(args.csv) + load_predicates(args.csv, column="diversified_predicate")
+    tk = Tokenizer()
+
+    _, list_peak = _peak_memory(lambda: _per_predicate(tk, predicates))
+    corpus, corpus_peak = _peak_memory(lambda: tk.tokenize_corpus(predicates))
+    list_secs = best_of(lambda: _per_predicate(tk, predicates), args.repeat)
+    corpus_secs = best_of(lambda: tk.tokenize_corpus(predicates), args.repeat)
+
+    print(f"{len(predicates)} predicates, {corpus.num_tokens} tokens, {len(corpus.errors)} lex errors")
+    print(f"{'per-predicate lists':22s} {list_secs:7.3f}s  peak {list_peak / 2**20:7.2f} MiB")
+    print(f"{'tokenize_corpus':22s} {corpus_secs:7.3f}s  peak {corpus_peak / 2**20:7.2f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tokens/sec of `Tokenizer.tokenize` on a predicate corpus.
+
+Compares the single-pass master-regex engine against the previous strategy
+(re-compiling and trying every pattern at every position).
+
+    python benchmarks/bench_tokenizer.py [--csv datasets/predicate_sample_10000.csv]
+"""
+import argparse
+import re
+
+from _common import DATASETS, best_of, load_predicates
+from src.sindi.tokenizer import Tokenizer
+
+
+def _per_pattern_tokenize(tk: Tokenizer, predicate: str):
+    """Reference: the pattern-by-pattern loop the tokenizer used to run."""
+    tokens = []
+    position = 0
+    while position < len(predicate):
+        for pattern, tag in tk.token_patterns:
+            match = re.compile(pattern).match(predicate, position)
+            if match:
+                if tag:
+                    tokens.append((match.group(0), tag))
+                position = match.end()
+                break
+        else:
+            raise ValueError(f"Unexpected character: {predicate[position]} at position {position}")
+    return tokens
+
+
+def _run(tokenize, predicates):
+    count = 0
+    for p in predicates:
+        try:
+            count += len(tokenize(p))
+        except ValueError:
+            pass
+    return count
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--csv", default=str(DATASETS / "predicate_sample_10000.csv"))
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    predicates = load_predicates(args.csv)
+    tk = Tokenizer()
+    n_tokens = _run(tk.tokenize, predicates)
+
+    rows = [
+        ("master regex (current)", lambda: _run(tk.tokenize, predicates)),
+        ("per-pattern loop", lambda: _run(lambda p: _per_pattern_tokenize(tk, p), predicates)),
+    ]
+    print(f"{len(predicates)} predicates, {n_tokens} tokens")
+    for name, fn in rows:
+        secs = best_of(fn, args.repeat)
+        print(f"{name:24s} {secs:8.3f}s  {n_tokens / secs:12,.0f} tokens/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
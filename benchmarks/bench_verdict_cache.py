@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Measure a re-run with the on-disk verdict cache.
+
+Reduces groups of random dataset predicates to their strongest members
+(`reduce.strongest`) three times per engine, each in a fresh process like
+a re-run of an experiment: without a cache, with an empty cache (cold:
+every verdict is computed and written) and on the filled cache (warm).
+Reports the time of each pass (imports excluded), the warm hits and the
+size of the cache file.
+
+    python benchmarks/bench_verdict_cache.py [--groups 20] [--size 30] [--engines light,z3,sympy]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from _common import DATASETS, load_predicates
+from src.sindi.batch import BATCH_ENGINES, _make_comparator
+from src.sindi.reduce import strongest
+from src.sindi.utils import set_quiet
+from src.sindi.verdict_cache import VerdictCache
+
+
+def _run(groups, engine, path):
+    """One pass, in a fresh process: (seconds, kept indices per group, cache hits)."""
+    set_quiet(True)
+    _make_comparator(engine, {})  # imports
+    cache = VerdictCache(path) if path else False
+    t0 = time.perf_counter()
+    kept = [strongest(preds, engine=engine, verdict_cache=cache).kept for preds in groups]
+    seconds = time.perf_counter() - t0
+    if cache:
+        cache.close()
+    return seconds, kept, cache.hits if cache else 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--groups", type=int, default=20)
+    ap.add_argument("--size", type=int, default=30)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--engines", default="light,z3,sympy")
+    args = ap.parse_args()
+    set_quiet(True)
+
+    rng = random.Random(args.seed)
+    light = _make_comparator("light", {})
+    sample = []
+    for p in load_predicates(DATASETS / "predicate_sample_1000.csv"):
+        try:
+            light.prepare(p).ast
+        except Exception:  # skip what does not parse
+            continue
+        sample.append(p)
+    groups = [rng.sample(sample, args.size) for _ in range(args.groups)]
+
+    print(f"{args.groups} groups of {args.size} random predicates")
+    print(f"{'engine':>8s} {'no cache s':>11s} {'cold s':>8s} {'warm s':>8s} {'speedup':>8s} "
+          f"{'hits':>6s} {'KiB':>6s} {'agree':>6s}")
+    spawn = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        for engine in args.engines.split(","):
+            if engine not in BATCH_ENGINES:
+                ap.error(f"unknown engine {engine!r}")
+            path = os.path.join(tmp, f"{engine}.sqlite3")
+            passes = []
+            for cache_path in (None, path, path):
+                with spawn.Pool(1) as pool:
+                    passes.append(pool.apply(_run, (groups, engine, cache_path)))
+            (t_plain, expected, _), (t_cold, cold, _), (t_warm, warm, hits) = passes
+            agree = expected == cold == warm
+            print(f"{engine:>8s} {t_plain:11.2f} {t_cold:8.2f} {t_warm:8.2f} {t_plain / t_warm:7.1f}x "
+                  f"{hits:6d} {os.path.getsize(path) / 1024:6.0f} {'yes' if agree else 'NO':>6s}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
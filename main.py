@@ -8,8 +8,7 @@ from contextlib import redirect_stdout
 from src.sindi.rewriter import Rewriter
 from src.sindi.tokenizer import Tokenizer
 from src.sindi.parser import Parser, ASTNode
-from src.sindi.simplifier import Simplifier
-from src.sindi.comparator import Comparator
+from src.sindi.config import ENGINES
 from src.sindi.utils import printer, set_quiet
 from src.sindi.comparator_light import ComparatorRulesOnly
 from src.sindi.utils import printer, set_quiet, set_debug
@@ -95,6 +94,7 @@ def cmd_simplify(args: argparse.Namespace) -> int:
     _configure_logging(args)
     rw = Rewriter()
     tk = Tokenizer()
+    from src.sindi.simplifier import Simplifier  # SymPy: only loaded by this command
     sp = Simplifier()
     s = read_predicate(args.predicate, args.from_file)
     if not args.skip_rewrite:
@@ -127,6 +127,18 @@ def cmd_simplify(args: argparse.Namespace) -> int:
         print_tree(simplified)
     return 0
 
+def _make_comparator(args: argparse.Namespace):
+    """The comparator `compare` asked for; SymPy and Z3 are only imported for the solver-backed engines."""
+    if args.light:
+        return ComparatorRulesOnly(verbose=args.verbose, verdict_cache=args.cache)
+    if args.engine == "cascade":
+        from src.sindi.cascade import CascadeComparator
+        return CascadeComparator(timeout_ms=args.timeout_ms, max_memory_mb=args.max_memory_mb,
+                                 isolate=args.isolate, verdict_cache=args.cache)
+    from src.sindi.comparator import Comparator
+    return Comparator(engine=args.engine, timeout_ms=args.timeout_ms,
+                      max_memory_mb=args.max_memory_mb, isolate=args.isolate, verdict_cache=args.cache)
+
 def cmd_compare(args: argparse.Namespace) -> int:
     _configure_logging(args)
     
@@ -136,24 +148,27 @@ def cmd_compare(args: argparse.Namespace) -> int:
     p1 = read_predicate(args.predicate1, args.p1_file)
     p2 = read_predicate(args.predicate2, args.p2_file)
 
-    if args.light:
-        if ComparatorRulesOnly is None:
-            print("Error: light comparator not available (src/sindi/comparator_rules.py missing).", file=sys.stderr)
-            return 2
-        cmp = ComparatorRulesOnly(verbose=args.verbose)
-    else:
-        cmp = Comparator()
+    if args.light and ComparatorRulesOnly is None:
+        print("Error: light comparator not available (src/sindi/comparator_rules.py missing).", file=sys.stderr)
+        return 2
+    cmp = _make_comparator(args)
 
     # Capture any stray prints from comparator (belt & suspenders)
     sink = io.StringIO()
     with redirect_stdout(sink):
-        verdict = cmp.compare(p1, p2)
+        detailed = None if args.light else cmp.compare_detailed(p1, p2)
+        verdict = cmp.compare(p1, p2) if detailed is None else detailed.text
 
     if not args.verbose and not args.json:
         print(verdict)
         return 0
 
     out: Dict[str, Any] = {"verdict": verdict}
+    if not args.light and args.engine == "cascade":
+        out["tier"] = cmp.last_tier
+    if detailed is not None:
+        out["decided_by"] = detailed.decided_by
+        out["timings_ns"] = detailed.timings_ns
     rp1 = rw.apply(p1)
     rp2 = rw.apply(p2)
     out["rewritten"] = {"p1": rp1, "p2": rp2}
@@ -172,6 +187,39 @@ def cmd_compare(args: argparse.Namespace) -> int:
         print_tree(ast2)
     return 0
 
+def cmd_cache(args: argparse.Namespace) -> int:
+    _configure_logging(args)
+    from src.sindi.verdict_cache import VerdictCache, default_path
+    path = args.path or default_path()
+    if not os.path.exists(path):
+        print(f"No verdict cache at {path}")
+        return 0
+    cache = VerdictCache(path)
+    try:
+        if args.action == "clear":
+            entries = len(cache)
+            cache.clear()
+            print(f"Cleared {entries} verdicts from {path}")
+            return 0
+        if args.action == "vacuum":
+            before = cache.stats()["bytes"]
+            cache.vacuum()
+            print(f"Vacuumed {path}: {before} -> {cache.stats()['bytes']} bytes")
+            return 0
+        stats = cache.stats()
+    finally:
+        cache.close()
+    if args.json:
+        print(json.dumps(stats, ensure_ascii=False))
+        return 0
+    print(f"Path:        {stats['path']}")
+    print(f"Size:        {stats['bytes']} bytes")
+    print(f"Verdicts:    {stats['entries']} (cap {stats['max_entries']})")
+    print(f"Hits:        {stats['hits']}")
+    for version, entries in stats["versions"].items():
+        print(f"  {entries:>10}  {version}")
+    return 0
+
 # ---- arg parser ----
 
 def build_parser() -> argparse.ArgumentParser:
@@ -216,6 +264,20 @@ def build_parser() -> argparse.ArgumentParser:
     pc.add_argument("--p2-file", action="store_true")
     pc.add_argument("--light", action="store_true",
                     help="Use solver-free ComparatorRulesOnly (if available).")
+    pc.add_argument("--engine", choices=ENGINES + ("cascade",), default="sympy",
+                    help="Decision engine of the full comparator: SymPy simplification "
+                         "(default), direct AST-to-Z3 translation, or 'cascade' (solver-free "
+                         "rules first, SymPy only for pairs they leave undecided).")
+    pc.add_argument("--timeout-ms", type=int, default=None,
+                    help="Give up with an 'unknown' verdict after this many milliseconds.")
+    pc.add_argument("--max-memory-mb", type=int, default=None,
+                    help="Memory budget of the comparison (fully enforced with --isolate).")
+    pc.add_argument("--isolate", action="store_true",
+                    help="Run the comparison in a worker process that is killed when over budget.")
+    pc.add_argument("--cache", nargs="?", const=True, default=None, metavar="PATH",
+                    help="Look the verdict up in (and add it to) the on-disk verdict cache: PATH, or "
+                         "$SINDI_VERDICT_CACHE / the user cache directory without one. "
+                         "$SINDI_VERDICT_CACHE alone also enables it.")
     pc.add_argument("--verbose", action="store_true",
                     help="Show rewritten predicates and ASTs.")
     pc.add_argument("--json", action="store_true")
@@ -223,6 +285,17 @@ def build_parser() -> argparse.ArgumentParser:
                     help="Do not silence internal debug prints.")
     pc.set_defaults(func=cmd_compare)
 
+    pk = sub.add_parser("cache", help="Inspect or maintain the on-disk verdict cache.")
+    pk.add_argument("action", choices=("stats", "vacuum", "clear"),
+                    help="stats: size and verdicts per engine version; vacuum: apply the size cap and "
+                         "compact the file; clear: delete every verdict.")
+    pk.add_argument("--path", default=None,
+                    help="Cache file (default: $SINDI_VERDICT_CACHE, else verdicts.sqlite3 in the user cache directory).")
+    pk.add_argument("--json", action="store_true")
+    pk.add_argument("--debug-logs", action="store_true",
+                    help="Do not silence internal debug prints.")
+    pk.set_defaults(func=cmd_cache)
+
     return p
 
 def main() -> int:
@@ -1,21 +1,53 @@
-"""SInDi: Semantic Invariant Differencing for Solidity predicates."""
-from .comparator import Comparator
-from .comparator_light import ComparatorRulesOnly
-from .rewriter import Rewriter
-from .tokenizer import Tokenizer
-from .parser import Parser, ASTNode
-from .simplifier import Simplifier
-from .ast_rewriter import ASTRewriter
-
-__all__ = [
-    "Comparator",
-    "ComparatorRulesOnly",
-    "Rewriter",
-    "Tokenizer",
-    "Parser",
-    "ASTNode",
-    "Simplifier",
-    "ASTRewriter",
-]
+"""
+SInDi: Semantic Invariant Differencing for Solidity predicates.
+
+The public classes are imported on first access, so `import sindi` and the
+solver-free parts (ComparatorRulesOnly, Rewriter, Tokenizer, Parser, ...)
+do not load SymPy or Z3; `Comparator`, `CascadeComparator` and
+`Simplifier` do.
+"""
+import importlib
+
+# Public name -> defining submodule.
+_EXPORTS = {
+    "Comparator": ".comparator",
+    "ComparatorRulesOnly": ".comparator_light",
+    "CascadeComparator": ".cascade",
+    "compare_many": ".batch",
+    "implication_matrix": ".order",
+    "ImplicationOrder": ".order",
+    "strongest": ".reduce",
+    "Reduction": ".reduce",
+    "InvariantSet": ".invariants",
+    "SymbolIndex": ".symbols",
+    "VerdictCache": ".verdict_cache",
+    "Rewriter": ".rewriter",
+    "Tokenizer": ".tokenizer",
+    "TokenCorpus": ".tokenizer",
+    "Parser": ".parser",
+    "ASTNode": ".parser",
+    "ASTArena": ".parser",
+    "HNode": ".hashcons",
+    "Simplifier": ".simplifier",
+    "ASTRewriter": ".ast_rewriter",
+    "PreparedPredicate": ".prepared",
+    "Outcome": ".verdict",
+    "Verdict": ".verdict",
+}
+
+__all__ = list(_EXPORTS)
 
 __version__ = "0.2.0"
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,59 +1,250 @@
 # src/sindi/ast_rewriter.py
 from __future__ import annotations
-from typing import List, Optional, Tuple
-from .parser import ASTNode
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from .parser import ASTNode, LITERAL_BOOL, LITERAL_FLOAT, LITERAL_INT
+from .hashcons import HNode, make_node, with_children
+from .utils import BoundedLRU
 
 COMMUTATIVE_BOOL = {"&&", "||", "==", "!="}
 ASSOCIATIVE = {"&&", "||", "+"}
 COMMUTATIVE_ARITH = {"+", "*"}
 
 REL_OPS = {">", ">=", "<", "<=", "==", "!="}
+COMMUTATIVE = COMMUTATIVE_BOOL | COMMUTATIVE_ARITH
 
+FINALIZED_FLAG = "MarketplaceLib.FLAG_MASK_FINALIZED"
 
-def _clone(n: ASTNode) -> ASTNode:
-    return ASTNode(n.value, [_clone(c) for c in n.children])
 
+def _splice_assoc(op: str, children: Sequence[HNode]) -> List[HNode]:
+    """One level of flattening: inline same-operator children of an associative node."""
+    flat: List[HNode] = []
+    for ch in children:
+        if ch.value == op:
+            flat.extend(ch.children)
+        else:
+            flat.append(ch)
+    return flat
 
-def _repr(n: ASTNode) -> str:
-    return repr(n)
 
+def _is_bool_leaf(n: HNode) -> bool:
+    return n.kind == LITERAL_BOOL
 
-def _eq(a: ASTNode, b: ASTNode) -> bool:
-    return _repr(a) == _repr(b)
 
+def _is_zero(n: HNode) -> bool:
+    return n.kind in (LITERAL_INT, LITERAL_FLOAT) and n.literal == 0
 
-def _sort_children(node: ASTNode) -> None:
-    node.children.sort(key=_repr)
 
+# ---- convenience substitutions you previously had as strings ----
+# Keep these here as AST-level forms in case the surface pass didn't catch them.
+def _owner_admin_forms(n: HNode) -> HNode:
+    # now -> block.timestamp (parsers emit 'now' as a plain IDENTIFIER leaf)
+    if n.value == "now":
+        return make_node("block.timestamp")
 
-def _is_bool_leaf(n: ASTNode) -> bool:
-    return (not n.children) and (n.value.lower() in ("true", "false"))
+    # isOwner() -> (msg.sender == owner())
+    if n.value == "isOwner()":
+        return make_node("==", [make_node("msg.sender"), make_node("owner()")])
 
+    # isAdmin() -> (msg.sender == admin)
+    if n.value == "isAdmin()":
+        return make_node("==", [make_node("msg.sender"), make_node("admin")])
 
-def _is_zero(n: ASTNode) -> bool:
-    if n.children:
-        return False
-    try:
-        return int(n.value) == 0
-    except Exception:
-        try:
-            return float(n.value) == 0.0
-        except Exception:
-            return False
+    # _msgSender() -> msg.sender
+    if n.value == "_msgSender()":
+        return make_node("msg.sender")
 
+    return n
 
-def _is_number(n: ASTNode) -> bool:
-    if n.children:
-        return False
-    try:
-        int(n.value)
-        return True
-    except Exception:
-        try:
-            float(n.value)
-            return True
-        except Exception:
-            return False
+
+def _plus(a: HNode, b: HNode) -> HNode:
+    return make_node("+", sorted(_splice_assoc("+", (a, b)), key=HNode.sort_key))
+
+
+def _rewrite_node(
+    v: str, cs: Sequence[HNode], late: Sequence[bool] = ()
+) -> Tuple[HNode, bool]:
+    """
+    Build the node `v(cs)` from already-canonical children, applying the
+    local rules on the way so only the final node is interned.
+
+    Rules fire in the order the old whole-tree passes ran (equals-to-bool,
+    nots, rel-sub, flatten, plus/commutative sort), so the result matches
+    running those passes one after another:
+
+      X == true  -> X          X == false -> !X
+      X != true  -> !X         X != false -> X      (either side)
+      !!X        -> X
+      X < Y - Z  -> X + Z < Y  A - B < C  -> A < C + B  (one step; any REL_OP)
+      flatten &&, ||, + and sort the children of commutative operators
+
+    `late[i]` marks a child that is a bool literal only because `!!` was
+    cancelled below it; equals-to-bool ran before that cancellation, so it
+    does not treat such a child as a literal. Returns the node and whether
+    it is such a late literal itself.
+    """
+    if v in ("==", "!=") and len(cs) == 2:
+        L, R = cs
+        lb = _is_bool_leaf(L) and not (late and late[0])
+        rb = _is_bool_leaf(R) and not (late and late[1])
+        if lb or rb:
+            expr, blf, expr_late = (R, L, late and late[1]) if lb else (L, R, late and late[0])
+            if (v == "==") == blf.literal:
+                return expr, bool(expr_late)
+            if expr.value == "!":  # !(!Y) -> Y
+                return expr.children[0], True
+            return make_node("!", [expr]), False
+
+    if v == "!" and len(cs) == 1 and cs[0].value == "!":
+        return cs[0].children[0], True
+
+    if v in REL_OPS and len(cs) == 2:
+        L, R = cs
+        # Right = (A - B)  →  (L + B) op A
+        if R.value == "-" and len(R.children) == 2:
+            A, B = R.children
+            cs = (_plus(L, B), A)
+        # Left = (A - B)   →  A op (R + B)
+        elif L.value == "-" and len(L.children) == 2:
+            A, B = L.children
+            cs = (A, _plus(R, B))
+
+    if v in ASSOCIATIVE:
+        cs = _splice_assoc(v, cs)
+    if v in COMMUTATIVE:
+        cs = sorted(cs, key=HNode.sort_key)
+    return make_node(v, cs), False
+
+
+def _mk_is_finalized(x: HNode) -> HNode:
+    return make_node("!", [make_node("MarketplaceLib.isFinalized()", [x])])
+
+
+def _finalized_bitmask(node: HNode) -> HNode:
+    """
+    (X & MarketplaceLib.FLAG_MASK_FINALIZED) == 0   →   !MarketplaceLib.isFinalized(X)
+    Handle symmetry too: 0 == (X & FLAG)
+    """
+    if node.value == "==" and len(node.children) == 2:
+        L, R = node.children
+        if _is_zero(L):
+            L, R = R, L
+        if L.value == "&" and _is_zero(R) and len(L.children) == 2:
+            a, b = L.children
+            if (not b.children) and b.value == FINALIZED_FLAG:
+                return _mk_is_finalized(a)
+            if (not a.children) and a.value == FINALIZED_FLAG:
+                return _mk_is_finalized(b)
+    return node
+
+
+def _bottom_up(root: HNode, rule) -> HNode:
+    """Rebuild `root` applying `rule` to every node after its children (iterative, memoized per subtree)."""
+    done: Dict[int, HNode] = {}
+    stack = [root]
+    while stack:
+        n = stack[-1]
+        pending = [c for c in n.children if id(c) not in done]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        if id(n) not in done:
+            done[id(n)] = rule(with_children(n, [done[id(c)] for c in n.children]))
+    return done[id(root)]
+
+
+class NormalizeMemo(BoundedLRU):
+    """
+    Bounded LRU map from a raw subtree to its canonical form.
+
+    The key is the *interned* raw subtree: hash-consing makes it a Merkle
+    fingerprint (equal structure <=> same node, hash built from the value and
+    the children's identities), so lookups are one dict probe with no risk of
+    collisions. Entries keep their key and result alive; the oldest are
+    evicted once `maxsize` is exceeded.
+    """
+
+    def __init__(self, maxsize: int = 1 << 16):
+        super().__init__(maxsize)
+
+
+def canonicalize(
+    root,
+    local_forms: bool = True,
+    finalized_bitmask: bool = True,
+    memo: Optional[NormalizeMemo] = None,
+) -> HNode:
+    """
+    Single-walk canonicalizer shared by `ASTRewriter` and the light comparator.
+
+    `root` may be an `ASTNode`, an `HNode` or an `ArenaNode` view; it is
+    interned and rewritten in the same post-order walk (iterative, so deep
+    chains are fine); each output node is interned once, after its rules ran.
+    `local_forms` enables the owner/admin/now leaf substitutions.
+
+    With a `memo`, every compound subtree is looked up by its interned raw
+    form first, so a subexpression repeated across a corpus is rewritten
+    once; an already-interned input that hits is not even descended into.
+    A memo must only be shared between calls with the same options.
+
+    The finalized-bitmask pattern is matched on the finished tree, as the
+    last pass always did (its result is deliberately not re-sorted); that
+    extra walk only happens when the flag constant actually occurs.
+    """
+    # Each input node resolves to (canonical node, is a `!!`-cancelled bool
+    # literal, subtree contains the finalized flag).
+    done: Dict[int, tuple] = {}
+
+    # Read each node's children once: views such as ArenaNode build them on access.
+    order = []
+    stack = [root]
+    while stack:
+        n = stack.pop()
+        if memo is not None and isinstance(n, HNode) and n.children:
+            entry = memo.get(n)
+            if entry is not None:
+                done[id(n)] = entry
+                continue
+        kids = n.children
+        order.append((n, kids))
+        stack.extend(kids)
+
+    raw: Dict[int, HNode] = {}  # input id -> interned input subtree (memo key)
+    for n, kids in reversed(order):  # reversed pre-order: children before parents
+        if id(n) in done:
+            continue
+        if not kids:
+            node = make_node(n.value)
+            if memo is not None:
+                raw[id(n)] = node
+            flag = node.value == FINALIZED_FLAG
+            if local_forms:
+                node = _owner_admin_forms(node)
+                if node.children:
+                    node = _rewrite_node(node.value, node.children)[0]
+            done[id(n)] = (node, False, flag)
+            continue
+
+        key = None
+        if memo is not None:
+            key = n if isinstance(n, HNode) else make_node(n.value, [raw[id(c)] for c in kids])
+            raw[id(n)] = key
+            if key is not n:  # HNodes were looked up on the way down
+                entry = memo.get(key)
+                if entry is not None:
+                    done[id(n)] = entry
+                    continue
+        entries = [done[id(c)] for c in kids]
+        node, is_late = _rewrite_node(n.value, [e[0] for e in entries], [e[1] for e in entries])
+        entry = (node, is_late and _is_bool_leaf(node), any([e[2] for e in entries]))
+        if key is not None:
+            memo.put(key, entry)
+        done[id(n)] = entry
+
+    node, _, flag = done[id(root)]
+    if finalized_bitmask and flag:
+        node = _bottom_up(node, _finalized_bitmask)
+    return node
 
 
 class ASTRewriter:
@@ -68,202 +259,24 @@ class ASTRewriter:
             X < (Y - Z) -> (X + Z) < Y
             (A - B) < C -> A < (C + B)
       - Flattening associative ops (&&, ||, +)
-      - Sorting commutative children (&&, ||, +, ==, !=) for determinism
-      - Reordering equality arguments deterministically
-      - Plus-commutativity/coalescing
+      - Sorting commutative children (&&, ||, +, *, ==, !=) for determinism
       - A few semantic patterns (owner/admin convenience, bitmask-finalized)
+
+    All of it runs as one bottom-up walk (see `canonicalize`). Results are
+    memoized per raw subtree in a bounded `NormalizeMemo` (`memo_size`
+    entries, 0 disables it), exposed as `self.memo`.
     """
 
-    # ---- convenience substitutions you previously had as strings ----
-    # Keep these here as AST-level forms in case the surface pass didn't catch them.
-    def _owner_admin_forms(self, n: ASTNode) -> ASTNode:
-        # now -> block.timestamp (parsers emit 'now' as a plain IDENTIFIER leaf)
-        if not n.children and n.value == "now":
-            return ASTNode("block.timestamp")
-
-        # isOwner() -> (msg.sender == owner())
-        if n.value == "isOwner()" and not n.children:
-            return ASTNode("==", [ASTNode("msg.sender"), ASTNode("owner()")])
-
-        # isAdmin() -> (msg.sender == admin)
-        if n.value == "isAdmin()" and not n.children:
-            return ASTNode("==", [ASTNode("msg.sender"), ASTNode("admin")])
-
-        # _msgSender() -> msg.sender
-        if n.value == "_msgSender()" and not n.children:
-            return ASTNode("msg.sender")
-
-        return n
-
-    def _flatten(self, node: ASTNode) -> ASTNode:
-        if not node.children:
-            return node
-        node.children = [self._flatten(c) for c in node.children]
-        if node.value in ASSOCIATIVE:
-            flat: List[ASTNode] = []
-            for ch in node.children:
-                if ch.value == node.value:
-                    flat.extend(ch.children)
-                else:
-                    flat.append(ch)
-            node.children = flat
-        return node
-
-    def _comm_sort(self, node: ASTNode) -> ASTNode:
-        if not node.children:
-            return node
-        node.children = [self._comm_sort(c) for c in node.children]
-        if node.value in (COMMUTATIVE_BOOL | COMMUTATIVE_ARITH):
-            _sort_children(node)
-        return node
-
-    def _normalize_equals_to_bool(self, node: ASTNode) -> ASTNode:
-        """
-        X == true  -> X
-        X == false -> !X
-        X != true  -> !X
-        X != false -> X
-        (and symmetric forms where true/false is on left)
-        """
-        if not node.children:
-            return node
-        node.children = [self._normalize_equals_to_bool(c) for c in node.children]
-
-        if node.value in ("==", "!=") and len(node.children) == 2:
-            L, R = node.children
-
-            # normalize: (expr op bool)
-            if _is_bool_leaf(L) or _is_bool_leaf(R):
-                expr = R if _is_bool_leaf(L) else L
-                blf = L if _is_bool_leaf(L) else R
-                bval = blf.value.lower() == "true"
-
-                if node.value == "==":
-                    return expr if bval else ASTNode("!", [expr])
-                else:  # "!="
-                    return ASTNode("!", [expr]) if bval else expr
-        return node
-
-    def _normalize_nots(self, node: ASTNode) -> ASTNode:
-        if not node.children:
-            return node
-        node.children = [self._normalize_nots(c) for c in node.children]
-        if node.value == "!" and len(node.children) == 1:
-            ch = node.children[0]
-            if ch.value == "!":
-                return ch.children[0]
-        return node
-
-    def _normalize_rel_sub(self, node: ASTNode) -> ASTNode:
-        """
-        Move a single '-' across inequalities/equalities:
-          X < Y - Z   →  X + Z < Y
-          A - B < C   →  A < C + B
-        Similar for <=, >, >=, ==, !=
-        """
-        if not node.children:
-            return node
-        node.children = [self._normalize_rel_sub(c) for c in node.children]
-
-        if node.value in REL_OPS and len(node.children) == 2:
-            L, R = node.children
-
-            # Right = (A - B)  →  (L + B) op A
-            if R.value == "-" and len(R.children) == 2:
-                A, B = R.children
-                return ASTNode(node.value, [ASTNode("+", [L, B]), A])
-
-            # Left = (A - B)   →  A op (R + B)
-            if L.value == "-" and len(L.children) == 2:
-                A, B = L.children
-                return ASTNode(node.value, [A, ASTNode("+", [R, B])])
-
-        return node
-
-    def _normalize_plus_comm(self, node: ASTNode) -> ASTNode:
-        if not node.children:
-            return node
-        node.children = [self._normalize_plus_comm(c) for c in node.children]
-        node = self._flatten(node)
-        if node.value == "+":
-            _sort_children(node)
-        return node
-
-    def _normalize_commutative_rel_args(self, node: ASTNode) -> ASTNode:
-        """
-        Reorder args for == and != deterministically: (smaller repr) first.
-        """
-        if not node.children:
-            return node
-        node.children = [self._normalize_commutative_rel_args(c) for c in node.children]
-        if node.value in ("==", "!=") and len(node.children) == 2:
-            L, R = node.children
-            if _repr(R) < _repr(L):
-                node.children = [R, L]
-        return node
-
-    def _finalized_bitmask(self, node: ASTNode) -> ASTNode:
-        """
-        (X & MarketplaceLib.FLAG_MASK_FINALIZED) == 0   →   !MarketplaceLib.isFinalized(X)
-        Handle symmetry too: 0 == (X & FLAG)
-        """
-        if not node.children:
-            return node
-        node.children = [self._finalized_bitmask(c) for c in node.children]
-
-        def _mk_is_finalized(x: ASTNode) -> ASTNode:
-            return ASTNode("!", [ASTNode("MarketplaceLib.isFinalized()", [x])])
-
-        if node.value == "==" and len(node.children) == 2:
-            L, R = node.children
-
-            # Left (& ...), Right 0
-            if L.value == "&" and _is_zero(R) and len(L.children) == 2:
-                a, b = L.children
-                if (not b.children) and b.value == "MarketplaceLib.FLAG_MASK_FINALIZED":
-                    return _mk_is_finalized(a)
-                if (not a.children) and a.value == "MarketplaceLib.FLAG_MASK_FINALIZED":
-                    return _mk_is_finalized(b)
-
-            # Symmetric: Left 0, Right (& ...)
-            if _is_zero(L) and R.value == "&" and len(R.children) == 2:
-                a, b = R.children
-                if (not b.children) and b.value == "MarketplaceLib.FLAG_MASK_FINALIZED":
-                    return _mk_is_finalized(a)
-                if (not a.children) and a.value == "MarketplaceLib.FLAG_MASK_FINALIZED":
-                    return _mk_is_finalized(b)
-
-        return node
-
-    def _apply_local_node_rules(self, node: ASTNode) -> ASTNode:
+    def __init__(self, memo_size: int = 1 << 16):
+        self.memo = NormalizeMemo(memo_size) if memo_size else None
+
+    def normalize(self, root: Union[ASTNode, HNode], intern: bool = False) -> Union[ASTNode, HNode]:
         """
-        Node-local translations that don't need a global traversal context.
+        Return the canonical form of `root` as a fresh, mutable `ASTNode`,
+        or with `intern=True` as the interned (hash-consed) `HNode` itself,
+        which skips the copy and is what the comparators use. `root` may be
+        an `ASTNode`, an `HNode` or an `ArenaNode` view. The caller's tree is
+        never mutated.
         """
-        node = self._owner_admin_forms(node)
-        return node
-
-    # -------- Pipeline --------
-    def normalize(self, root: ASTNode) -> ASTNode:
-        # Work on a clone to keep caller's tree untouched
-        n = _clone(root)
-
-        # Local substitutions on each node (single-visit)
-        def _walk_apply(n: ASTNode) -> ASTNode:
-            if not n.children:
-                return self._apply_local_node_rules(n)
-            n.children = [_walk_apply(c) for c in n.children]
-            return self._apply_local_node_rules(n)
-
-        n = _walk_apply(n)
-
-        # Structured normalizations (multi-pass safe order)
-        n = self._normalize_equals_to_bool(n)
-        n = self._normalize_nots(n)
-        n = self._normalize_rel_sub(n)
-        n = self._flatten(n)
-        n = self._normalize_plus_comm(n)
-        n = self._comm_sort(n)
-        n = self._normalize_commutative_rel_args(n)
-        n = self._finalized_bitmask(n)
-
-        return n
\ No newline at end of file
+        node = canonicalize(root, memo=self.memo)
+        return node if intern else node.to_ast()
@@ -0,0 +1,121 @@
+# src/sindi/batch.py
+"""
+Parallel comparison of many predicate pairs.
+
+`compare_many(pairs, engine=..., workers=N)` spreads the pairs over a pool
+of worker processes. Each worker builds its comparator once, in the pool
+initializer, so comparators are never pickled and their caches stay warm
+for the whole run. Results stream back as `PairResult`s, in input order
+(`ordered=True`) or as soon as each chunk is done, always carrying the
+pair's index. A pair that raises becomes a result with `error` set; the
+rest of the batch goes on.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from .config import ENGINES
+from .utils import set_quiet
+
+__all__ = ["BATCH_ENGINES", "PairResult", "compare_many"]
+
+# `engine` values of compare_many: the Comparator engines, the cascade and
+# the solver-free ComparatorRulesOnly.
+BATCH_ENGINES = ENGINES + ("cascade", "light")
+
+# Pairs handed to a worker at a time: large enough to amortize the IPC,
+# small enough to keep slow pairs from piling up behind one worker.
+DEFAULT_CHUNKSIZE = 8
+
+
+class PairResult(NamedTuple):
+    """
+    Outcome of pair `index`: `verdict` (the sentence, or a `Verdict` with
+    `detailed=True`) or, if comparing it raised, `error` ("Type: message").
+    """
+    index: int
+    verdict: object
+    error: Optional[str]
+
+
+def _make_comparator(engine: str, comparator_kwargs: dict):
+    if engine == "light":
+        from .comparator_light import ComparatorRulesOnly
+        return ComparatorRulesOnly(**comparator_kwargs)
+    if engine == "cascade":
+        from .cascade import CascadeComparator
+        return CascadeComparator(**comparator_kwargs)
+    from .comparator import Comparator
+    return Comparator(engine=engine, **comparator_kwargs)
+
+
+def _text(predicate) -> str:
+    return getattr(predicate, "text", predicate)  # PreparedPredicate -> its string
+
+
+# The comparator of a pool worker (set by _init_worker) and how to call it.
+_worker_comparator = None
+_worker_detailed = False
+
+
+def _init_worker(engine: str, comparator_kwargs: dict, detailed: bool) -> None:
+    global _worker_comparator, _worker_detailed
+    set_quiet(True)
+    _worker_comparator = _make_comparator(engine, comparator_kwargs)
+    _worker_detailed = detailed
+
+
+def _compare_one(comparator, detailed: bool, index: int, p1: str, p2: str) -> PairResult:
+    try:
+        verdict = comparator.compare_detailed(p1, p2) if detailed else comparator.compare(p1, p2)
+    except Exception as e:
+        return PairResult(index, None, f"{type(e).__name__}: {e}")
+    return PairResult(index, verdict, None)
+
+
+def _compare_task(task: Tuple[int, str, str]) -> PairResult:
+    return _compare_one(_worker_comparator, _worker_detailed, *task)
+
+
+def compare_many(pairs: Iterable[Tuple[object, object]], engine: str = "sympy",
+                 workers: Optional[int] = None, chunksize: int = DEFAULT_CHUNKSIZE,
+                 ordered: bool = True, detailed: bool = False, **comparator_kwargs) -> Iterator[PairResult]:
+    """
+    Compare every `(p1, p2)` of `pairs` and yield one PairResult per pair.
+
+    `engine`: one of BATCH_ENGINES. `workers`: number of processes (default
+    `os.cpu_count()`; 1 compares in this process). `chunksize`: pairs sent
+    to a worker at a time. `ordered=False` yields results as they complete.
+    `detailed=True` yields `Verdict`s (`compare_detailed`; not for "light").
+    Other keyword arguments configure each worker's comparator (budgets,
+    simplification settings, ...). Pairs are read lazily; stopping the
+    iteration early shuts the pool down.
+    """
+    if engine not in BATCH_ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; expected one of {', '.join(BATCH_ENGINES)}")
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    if chunksize < 1:
+        raise ValueError("chunksize must be >= 1")
+    if detailed and engine == "light":
+        raise ValueError("detailed results need a solver-backed engine, not 'light'")
+    if workers > 1 and comparator_kwargs.get("isolate"):
+        raise ValueError("isolate=True needs workers=1: pool workers cannot start worker processes")
+    # Built here first so that bad settings fail now, not in every worker.
+    comparator = _make_comparator(engine, comparator_kwargs)
+    tasks = ((i, _text(p1), _text(p2)) for i, (p1, p2) in enumerate(pairs))
+    if workers == 1:
+        return (_compare_one(comparator, detailed, *task) for task in tasks)
+    return _pooled(tasks, workers, chunksize, ordered, (engine, comparator_kwargs, detailed))
+
+
+def _pooled(tasks, workers: int, chunksize: int, ordered: bool, initargs: tuple) -> Iterator[PairResult]:
+    pool = multiprocessing.get_context().Pool(workers, initializer=_init_worker, initargs=initargs)
+    try:
+        yield from (pool.imap if ordered else pool.imap_unordered)(_compare_task, tasks, chunksize)
+    finally:
+        pool.terminate()
+        pool.join()
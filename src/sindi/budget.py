@@ -0,0 +1,187 @@
+# src/sindi/budget.py
+"""
+Per-comparison time and memory budgets.
+
+`Comparator.compare(..., timeout_ms=..., max_memory_mb=...)` runs under a
+`Budget`. Z3 gets what is left of it as its own `timeout` / `max_memory`
+parameters on every check; the SymPy stages (simplification,
+`satisfiable`) are interrupted by `watchdog`, a SIGALRM timer (POSIX, main
+thread only). For stages that ignore signals, or for a hard memory cap,
+`IsolatedWorker` runs the comparison in a child process that is killed
+when the budget runs out. In every case an exceeded budget makes `compare`
+return UNKNOWN_VERDICT (`compare_detailed`: an UNKNOWN `Verdict`) instead
+of hanging.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from .verdict import UNKNOWN_VERDICT, Verdict
+
+__all__ = ["UNKNOWN_VERDICT", "Budget", "BudgetExceeded", "watchdog", "IsolatedWorker"]
+
+# Extra time the parent of an isolated comparison waits for the child's own
+# (cooperative) timeout before killing it.
+KILL_GRACE_MS = 500
+
+
+class BudgetExceeded(BaseException):
+    """
+    Raised when a comparison runs out of its budget. A BaseException on
+    purpose: the comparator's stages catch `Exception` broadly to fall back
+    to other strategies, and running out of time must not be one of those.
+    """
+
+
+def _positive(name: str, value: Optional[int]) -> Optional[int]:
+    if value is not None and value <= 0:
+        raise ValueError(f"{name} must be a positive number, got {value!r}")
+    return value
+
+
+class Budget:
+    """Deadline (from `timeout_ms`) and memory cap of one comparison; either may be None."""
+
+    __slots__ = ("timeout_ms", "max_memory_mb", "deadline")
+
+    def __init__(self, timeout_ms: Optional[int] = None, max_memory_mb: Optional[int] = None):
+        self.timeout_ms = _positive("timeout_ms", timeout_ms)
+        self.max_memory_mb = _positive("max_memory_mb", max_memory_mb)
+        self.deadline = None if timeout_ms is None else time.perf_counter() + timeout_ms / 1e3
+
+    def __bool__(self) -> bool:
+        return self.timeout_ms is not None or self.max_memory_mb is not None
+
+    def remaining_ms(self) -> Optional[int]:
+        """Milliseconds left (<= 0 once expired), or None without a deadline."""
+        if self.deadline is None:
+            return None
+        return int((self.deadline - time.perf_counter()) * 1e3)
+
+    def check(self) -> None:
+        """Raise BudgetExceeded once the deadline has passed."""
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise BudgetExceeded(f"timed out after {self.timeout_ms} ms")
+
+
+def _can_alarm() -> bool:
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def watchdog(budget: Optional[Budget]):
+    """
+    Interrupt the enclosed (pure-Python) work with BudgetExceeded when the
+    budget's deadline passes. Uses a SIGALRM timer, so it only arms in the
+    main thread on POSIX; elsewhere it does nothing and only the Z3 timeouts
+    and `Budget.check` apply. An outer timer, if any, is restored on exit.
+    """
+    if budget is None or budget.deadline is None or not _can_alarm():
+        yield
+        return
+
+    def _expired(signum, frame):
+        raise BudgetExceeded(f"timed out after {budget.timeout_ms} ms")
+
+    previous = signal.signal(signal.SIGALRM, _expired)
+    outer_delay, outer_interval = signal.setitimer(signal.ITIMER_REAL, max(budget.remaining_ms(), 1) / 1e3)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        if outer_delay:
+            signal.setitimer(signal.ITIMER_REAL, outer_delay, outer_interval)
+
+
+def _limit_memory(max_memory_mb: int) -> None:
+    """Cap this process's address space at its current size plus `max_memory_mb`."""
+    try:
+        import resource
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[0]) * resource.getpagesize()
+        limit = current + max_memory_mb * (1 << 20)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, resource.getrlimit(resource.RLIMIT_AS)[1]))
+    except (ImportError, OSError, ValueError):
+        pass  # no /proc or no RLIMIT_AS: Z3's own max_memory still applies
+
+
+def _worker_main(conn, comparator_kwargs: dict, max_memory_mb: Optional[int]) -> None:
+    # Runs in the child: one comparator for its whole life, budgets applied per request.
+    from .comparator import Comparator
+    from .utils import set_quiet
+    set_quiet(True)
+    if max_memory_mb is not None:
+        _limit_memory(max_memory_mb)
+    comparator = Comparator(**comparator_kwargs)
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        p1, p2, timeout_ms = request
+        try:
+            reply = ("ok", comparator.compare_detailed(p1, p2, timeout_ms=timeout_ms, max_memory_mb=max_memory_mb))
+        except MemoryError:
+            reply = ("ok", Verdict.unknown())
+        except Exception as e:
+            reply = ("error", e)
+        conn.send(reply)
+
+
+class IsolatedWorker:
+    """
+    A long-lived child process that runs comparisons for one comparator.
+    The child applies the budget itself; if it does not answer within the
+    timeout (plus KILL_GRACE_MS) it is killed and restarted on next use.
+    With a `max_memory_mb`, its address space is capped, so an allocation
+    blow-up ends that comparison as UNKNOWN rather than the whole run.
+    """
+
+    def __init__(self, comparator_kwargs: dict):
+        self.comparator_kwargs = dict(comparator_kwargs)
+        self.max_memory_mb: Optional[int] = None
+        self._process = None
+        self._conn = None
+
+    def _start(self) -> None:
+        ctx = multiprocessing.get_context()
+        self._conn, child = ctx.Pipe()
+        self._process = ctx.Process(target=_worker_main, args=(child, self.comparator_kwargs, self.max_memory_mb),
+                                    daemon=True)
+        self._process.start()
+        child.close()
+
+    def close(self) -> None:
+        """Stop the child process (a later `compare` starts a new one)."""
+        if self._process is not None:
+            self._conn.close()
+            self._process.kill()
+            self._process.join()
+            self._process = self._conn = None
+
+    def compare_detailed(self, p1: str, p2: str, timeout_ms: Optional[int] = None,
+                         max_memory_mb: Optional[int] = None) -> Verdict:
+        if max_memory_mb != self.max_memory_mb:
+            self.close()  # the cap is set once per child
+            self.max_memory_mb = max_memory_mb
+        if self._process is None or not self._process.is_alive():
+            self.close()
+            self._start()
+        self._conn.send((p1, p2, timeout_ms))
+        wait = None if timeout_ms is None else (timeout_ms + KILL_GRACE_MS) / 1e3
+        try:
+            if self._conn.poll(wait):
+                status, value = self._conn.recv()
+                if status == "error":
+                    raise value
+                return value
+        except EOFError:
+            pass  # the child died (e.g. killed by the OS for memory)
+        self.close()
+        return Verdict.unknown()
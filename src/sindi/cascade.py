@@ -0,0 +1,96 @@
+# src/sindi/cascade.py
+"""
+Tiered comparison: rules first, solver only on demand.
+
+`CascadeComparator` normalizes both predicates exactly as `Comparator`
+does, then tries the solver-free rules (`comparator_light.decide_implication`)
+in both directions. Only a pair the rules leave undecided in either
+direction is handed to the full `Comparator` (SymPy/Z3). Every verdict is
+tagged with the tier that produced it; `compare_detailed` also charges the
+rules' time to the "rules" stage of its `Verdict`.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Union
+
+from .comparator import Comparator
+from .comparator_light import decide_implication
+from .prepared import PreparedPredicate
+from .utils import debug
+from .verdict import Verdict
+
+__all__ = ["CascadeComparator", "TIERS"]
+
+# Tiers, cheapest first.
+TIERS = ("rules", "solver")
+
+
+class CascadeComparator:
+    """
+    Rules-then-solver comparator with `Comparator`'s verdicts.
+
+    Keyword arguments are passed to the underlying `Comparator` (engine,
+    simplification settings, budgets; a `verdict_cache` serves the solver
+    tier). `tier_counts` counts the verdicts each tier has produced and
+    `last_tier` names the tier of the latest one.
+    """
+
+    def __init__(self, **comparator_kwargs):
+        self.solver = Comparator(**comparator_kwargs)
+        self.tier_counts: Counter = Counter()
+        self.last_tier = None
+
+    def prepare(self, predicate: str) -> PreparedPredicate:
+        """Prepared predicates are the solver tier's, so an escalation reuses them."""
+        return self.solver.prepare(predicate)
+
+    @property
+    def verdict_cache(self):
+        return self.solver.verdict_cache
+
+    def close(self) -> None:
+        self.solver.close()
+
+    def compare_detailed(self, predicate1: Union[str, PreparedPredicate],
+                         predicate2: Union[str, PreparedPredicate], **budget) -> Verdict:
+        """`Verdict` of the pair; `budget` (timeout_ms, max_memory_mb) applies to the solver tier."""
+        with self.solver.timer.timing() as clock:
+            p1 = self.solver._prepared(predicate1)
+            p2 = self.solver._prepared(predicate2)
+            a, b = p1.ast, p2.ast
+            with clock.stage("rules"):
+                # Same special case as `Comparator.compare`, decided before any rule.
+                if self.solver._is_strict_vs_neq_same_operands(a, b):
+                    implies1_to_2, implies2_to_1 = False, True
+                elif self.solver._is_strict_vs_neq_same_operands(b, a):
+                    implies1_to_2, implies2_to_1 = True, False
+                else:
+                    implies1_to_2 = decide_implication(a, b)
+                    implies2_to_1 = decide_implication(b, a) if implies1_to_2 is not None else None
+            if implies1_to_2 is not None and implies2_to_1 is not None:
+                tier, verdict = "rules", Verdict.from_implications(implies1_to_2, implies2_to_1, "rules", clock.ns)
+            else:
+                debug('> Rules undecided for %r vs %r; escalating to the solver.', p1.text, p2.text)
+                tier, verdict = "solver", self.solver.compare_detailed(p1, p2, **budget)
+                if verdict.timings_ns is not clock.ns:  # solved in an isolated worker
+                    for name, ns in clock.ns.items():
+                        verdict.timings_ns[name] += ns
+        self.tier_counts[tier] += 1
+        self.last_tier = tier
+        return verdict
+
+    def compare(self, predicate1: Union[str, PreparedPredicate],
+                predicate2: Union[str, PreparedPredicate], **budget) -> str:
+        return self.compare_detailed(predicate1, predicate2, **budget).text
+
+    def implies(self, predicate1: Union[str, PreparedPredicate],
+                predicate2: Union[str, PreparedPredicate]) -> bool:
+        """Whether predicate1 implies predicate2: the rules' answer if they have one, else the solver's."""
+        p1 = self.solver._prepared(predicate1)
+        p2 = self.solver._prepared(predicate2)
+        a, b = p1.ast, p2.ast
+        if self.solver._is_strict_vs_neq_same_operands(a, b) or self.solver._is_strict_vs_neq_same_operands(b, a):
+            return self.solver.implies(p1, p2)
+        decided = decide_implication(a, b)
+        return self.solver.implies(p1, p2) if decided is None else decided
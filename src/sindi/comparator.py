@@ -1,23 +1,168 @@
 import sympy as sp
 from sympy.logic.boolalg import And, Or, Not
 from sympy.logic.inference import satisfiable
+from sympy.logic.boolalg import simplify_logic
+from sympy.core.relational import Relational
 from .tokenizer import Tokenizer
-from .parser import Parser, ASTNode
+from .parser import (Parser, ASTNode, LITERAL_INT, LITERAL_FLOAT, LITERAL_BOOL,
+                     MEMBER, INDEX, CALL, UNARY, BINARY_OP)
 from .simplifier import Simplifier
 from .rewriter import Rewriter
-from .utils import printer
+from .utils import BoundedLRU, debug, debug_enabled, env_int
 from .ast_rewriter import ASTRewriter
+from .hashcons import same_tree
+from .prepared import PreparedPredicate
+from .z3_engine import SolverSession, Z3Translator
+from .budget import Budget, BudgetExceeded, IsolatedWorker, watchdog
+from .verdict import Outcome, StageTimer, Verdict
+from .verdict_cache import VerdictCache, fingerprint, resolve_cache
+from . import __version__
+from .config import ENGINES
 import z3
 import re
+import threading
+from typing import Iterable, List, Optional, Tuple, Union
+
+
+SIMPLIFY_CACHE_ENV = "SINDI_SIMPLIFY_CACHE_SIZE"
+DEFAULT_SIMPLIFY_CACHE_SIZE = 4096
+_shared_simplify_cache: Optional[BoundedLRU] = None
+
+
+def shared_simplify_cache() -> BoundedLRU:
+    """
+    Process-wide `sp.simplify` cache used by every `Comparator` built with the
+    default `simplify_cache_size`. Keyed by the SymPy expression itself
+    (structural hash/equality). Its size is read from SINDI_SIMPLIFY_CACHE_SIZE
+    (default 4096, 0 disables) when it is first needed.
+    """
+    global _shared_simplify_cache
+    if _shared_simplify_cache is None:
+        _shared_simplify_cache = BoundedLRU(env_int(SIMPLIFY_CACHE_ENV, DEFAULT_SIMPLIFY_CACHE_SIZE))
+    return _shared_simplify_cache
+
+
+def _logic_form(expr):
+    """Boolean-only simplification of the relational skeleton; arithmetic is left alone."""
+    if isinstance(expr, sp.logic.boolalg.Boolean):
+        return simplify_logic(expr)
+    return expr
+
+
+def _linear_form(expr):
+    """
+    Relations as `lhs - rhs op 0` with the difference expanded into a sum of
+    terms (and SymPy's canonical sign/orientation); arithmetic is expanded and
+    the boolean structure around the relations is kept as is.
+    """
+    if isinstance(expr, Relational):
+        rel = expr.func(sp.expand(expr.lhs - expr.rhs), 0)
+        return rel.canonical if isinstance(rel, Relational) else rel
+    if isinstance(expr, (And, Or, Not)):
+        return expr.func(*[_linear_form(arg) for arg in expr.args])
+    if isinstance(expr, sp.Expr):
+        return sp.expand(expr)
+    return expr
+
+
+# How `Comparator` simplifies each SymPy expression ("none": not at all).
+SIMPLIFY_STRATEGIES = {
+    "full": sp.simplify,
+    "logic": _logic_form,
+    "linear": _linear_form,
+    "none": None,
+}
+
+
+# Between the stages of a debug trace of `compare`.
+_SEPARATOR = '\n' + '=' * 140 + '\n'
+
+
+def _sanitize_sym_name(s) -> str:
+    # keep alnum/underscore; collapse others to single '_'
+    s = re.sub(r"[^A-Za-z0-9_]", "_", str(s))
+    s = re.sub(r"_+", "_", s).strip("_")
+    return s or "sym"
+
+
+def _symbol_from_call(func_name: str, arg_exprs):
+    # include args in the symbol name for disambiguation
+    parts = [_sanitize_sym_name(func_name)]
+    if arg_exprs:
+        parts.extend(_sanitize_sym_name(a) for a in arg_exprs)
+    return sp.Symbol("__".join(parts))
 
 
 class Comparator:
-    def __init__(self):
+    def __init__(self, simplify_cache_size: Optional[int] = None,
+                 simplify_strategy: str = "full", simplify_budget: Optional[int] = None,
+                 engine: str = "sympy", timeout_ms: Optional[int] = None,
+                 max_memory_mb: Optional[int] = None, isolate: bool = False,
+                 verdict_cache: Union[None, bool, str, VerdictCache] = None):
+        """
+        `simplify_cache_size`: None shares the process-wide simplification
+        cache (see `shared_simplify_cache`), 0 disables caching, and a
+        positive size gives this comparator a private cache of its own.
+
+        `simplify_strategy`: one of SIMPLIFY_STRATEGIES -- "full" (`sp.simplify`),
+        "logic" (boolean simplification of the relational skeleton), "linear"
+        (relations moved to `expr op 0` with expanded terms) or "none".
+        `simplify_budget`: expressions with more operations than this
+        (`sp.count_ops`) are used unsimplified. Neither applies to the
+        algebraic-equivalence test (`expr1 - expr2 == 0`), which always uses
+        the full, cached `sp.simplify`.
+
+        `engine`: "sympy" (SymPy simplification plus rule-based implication
+        with Z3 fallbacks) or "z3" (the normalized AST translated straight
+        into Z3 and implication decided by the solver alone, see
+        `z3_engine`); the simplification settings only affect "sympy".
+
+        `timeout_ms` / `max_memory_mb`: default budget of each `compare`
+        (see `budget`); a comparison that exceeds it returns UNKNOWN_VERDICT.
+        `isolate`: run each `compare` in a killable worker process, which
+        also enforces `max_memory_mb` on the SymPy stages.
+
+        `verdict_cache`: a path or `VerdictCache` that keeps verdicts on disk
+        across runs (see `verdict_cache`; None uses SINDI_VERDICT_CACHE if
+        set, False disables it). `compare` and `implies` consult it first.
+        """
+        Budget(timeout_ms, max_memory_mb)  # validates both
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; expected one of {', '.join(ENGINES)}")
+        if simplify_strategy not in SIMPLIFY_STRATEGIES:
+            raise ValueError(f"Unknown simplify strategy {simplify_strategy!r}; "
+                             f"expected one of {', '.join(SIMPLIFY_STRATEGIES)}")
+        if simplify_budget is not None and simplify_budget < 0:
+            raise ValueError("simplify_budget must be >= 0")
+        self.engine = engine
+        self.timeout_ms = timeout_ms
+        self.max_memory_mb = max_memory_mb
+        self.isolate = isolate
+        self._worker: Optional[IsolatedWorker] = None
+        # What a worker process needs to rebuild this comparator.
+        self._settings = dict(simplify_cache_size=simplify_cache_size, simplify_strategy=simplify_strategy,
+                              simplify_budget=simplify_budget, engine=engine, verdict_cache=False)
+        self.simplify_strategy = simplify_strategy
+        self.simplify_budget = simplify_budget
+        self.z3_translator = Z3Translator() if engine == "z3" else None
+        self._z3_local = threading.local()
+        self.timer = StageTimer()
         self.tokenizer = Tokenizer()
         self.simplifier = Simplifier()
         self.parser = Parser([])
         self.rewriter = Rewriter() 
         self.ast_rewriter = ASTRewriter()
+        if simplify_cache_size is None:
+            self.simplify_cache = shared_simplify_cache()
+        elif simplify_cache_size:
+            self.simplify_cache = BoundedLRU(simplify_cache_size)
+        else:
+            self.simplify_cache = None
+        self.verdict_cache = resolve_cache(verdict_cache)
+        # Key of this comparator's verdicts in a VerdictCache: whatever can change them.
+        settings = "" if engine == "z3" else f" {simplify_strategy}/{simplify_budget}"
+        self.cache_version = (f"{engine}{settings} sindi {__version__} "
+                              f"sympy {sp.__version__} z3 {z3.get_version_string()}")
 
     # Old version. Keeping it for reference.
     # def _parse_predicate(self, predicate_str: str) -> ASTNode:
@@ -31,90 +176,262 @@ class Comparator:
         Single source of truth for: string rewrite -> tokenize -> parse -> AST normalize.
         Keeping this here guarantees all compare paths see identical canonicalization.
         """
-        s = self.rewriter.apply(predicate_str)
-        tokens = self.tokenizer.tokenize(s)
-        ast = Parser(tokens).parse()
+        stage = self.timer.stage
+        with stage("rewrite"):
+            s = self.rewriter.apply(predicate_str)
+        with stage("tokenize"):
+            tokens = self.tokenizer.tokenize(s)
+        with stage("parse"):
+            ast = Parser(tokens).parse()
         # AST-level normalization (boolean ==/!= to True/False, !!, move '-' across rels, sort, etc.)
-        try:
-            ast = self.ast_rewriter.normalize(ast)
-        except Exception:
-            # Never block compare() if AST-normalization adds a corner case later.
-            pass
+        with stage("normalize"):
+            try:
+                ast = self.ast_rewriter.normalize(ast, intern=True)
+            except Exception:
+                # Never block compare() if AST-normalization adds a corner case later.
+                pass
         return ast
 
-    def compare(self, predicate1: str, predicate2: str) -> str:
-        # predicate1 = self.rewriter.apply(predicate1)
-        # predicate2 = self.rewriter.apply(predicate2)
+    def prepare(self, predicate: str) -> PreparedPredicate:
+        """
+        Bind `predicate` to this comparator. The normalized AST, SymPy form,
+        simplified form and Z3 term are computed on first use and kept, so a
+        prepared predicate can be passed to `compare`/`implies` many times.
+        """
+        return PreparedPredicate(self, predicate)
+
+    def _prepared(self, predicate: Union[str, PreparedPredicate]) -> PreparedPredicate:
+        if isinstance(predicate, PreparedPredicate):
+            if predicate.comparator is self:
+                return predicate
+            predicate = predicate.text  # prepared by another comparator: redo with ours
+        return self.prepare(predicate)
+
+    def _simplify(self, expr):
+        return self._simplified(expr, self.simplify_strategy, self.simplify_budget)
+
+    def _simplified(self, expr, strategy: str, budget: Optional[int]):
+        """`expr` simplified with `strategy` under `budget`, through the simplify cache."""
+        simplify = SIMPLIFY_STRATEGIES[strategy]
+        if simplify is None:
+            return expr
+        cache = self.simplify_cache
+        key = (strategy, budget, expr)
+        with self.timer.stage("simplify"):
+            if cache is not None:
+                result = cache.get(key)
+                if result is not None:
+                    return result
+            if budget is not None and sp.count_ops(expr) > budget:
+                result = expr
+            else:
+                result = simplify(expr)
+        if cache is not None:
+            cache.put(key, result)
+        return result
+
+    def _z3_session(self) -> SolverSession:
+        """This thread's long-lived solver; every Z3 query of this comparator goes through it."""
+        session = getattr(self._z3_local, "session", None)
+        if session is None:
+            session = self._z3_local.session = SolverSession()
+        return session
+
+    def _z3_form(self, prepared: PreparedPredicate):
+        """Z3 term of a prepared predicate: straight from its AST under the z3 engine."""
+        if self.z3_translator is not None:
+            return self.z3_translator.formula(prepared.ast)
+        return self.sympy_to_z3(prepared.simplified)
+
+    def _cache_key(self, p1: PreparedPredicate, p2: PreparedPredicate) -> Tuple[str, str, str]:
+        return self.cache_version, fingerprint(p1.ast), fingerprint(p2.ast)
+
+    def implies(self, predicate1: Union[str, PreparedPredicate],
+                predicate2: Union[str, PreparedPredicate]) -> bool:
+        """Whether predicate1 implies predicate2, by the same rules `compare` uses."""
+        p1 = self._prepared(predicate1)
+        p2 = self._prepared(predicate2)
+        cache = self.verdict_cache
+        if cache is None:
+            return self._implication(p1, p2)
+        key = self._cache_key(p1, p2)
+        known = cache.get(*key)
+        if known is not None and known[0] is not None:
+            return known[0]
+        holds = self._implication(p1, p2)
+        cache.put(*key, holds)
+        return holds
+
+    def _implication(self, p1: PreparedPredicate, p2: PreparedPredicate) -> bool:
+        if self._is_strict_vs_neq_same_operands(p1.ast, p2.ast):
+            return False
+        if self._is_strict_vs_neq_same_operands(p2.ast, p1.ast):
+            return True
+        if self.z3_translator is not None:
+            return self.z3_translator.implies(p1.ast, p2.ast)
+        return bool(self._implies(p1.simplified, p2.simplified))
+
+    def _implies_many(self, predicate, candidates, reverse: bool) -> List[bool]:
+        p = self._prepared(predicate)
+        cs = [self._prepared(c) for c in candidates]
+        pairs = [(c, p) if reverse else (p, c) for c in cs]
+        out: List[Optional[bool]] = [None] * len(cs)
+        for i, (a, b) in enumerate(pairs):
+            if self._is_strict_vs_neq_same_operands(a.ast, b.ast):
+                out[i] = False
+            elif self._is_strict_vs_neq_same_operands(b.ast, a.ast):
+                out[i] = True
+        todo = [i for i, v in enumerate(out) if v is None]
+        if self.z3_translator is not None:
+            found = self.z3_translator.implies_many(p.ast, [cs[i].ast for i in todo], reverse)
+        else:
+            found = [bool(self._implies(pairs[i][0].simplified, pairs[i][1].simplified)) for i in todo]
+        for i, v in zip(todo, found):
+            out[i] = v
+        return out
+
+    def implies_many(self, predicate: Union[str, PreparedPredicate],
+                     candidates: Iterable[Union[str, PreparedPredicate]]) -> List[bool]:
+        """
+        `[implies(predicate, c) for c in candidates]`, with `predicate`
+        prepared once. Under the z3 engine it is also asserted once and each
+        candidate is checked under its own assumption literal.
+        """
+        return self._implies_many(predicate, candidates, reverse=False)
+
+    def implied_by_many(self, predicate: Union[str, PreparedPredicate],
+                        candidates: Iterable[Union[str, PreparedPredicate]]) -> List[bool]:
+        """`[implies(c, predicate) for c in candidates]`; see `implies_many`."""
+        return self._implies_many(predicate, candidates, reverse=True)
 
-        # Tokenize, parse, and simplify the first predicate
-        tokens1 = self.tokenizer.tokenize(predicate1)
-        printer(f"Tokens1: {tokens1}")
-        parser1 = Parser(tokens1)
-        ast1 = parser1.parse()
-        printer(f"Parsed AST1: {ast1}")
+    def close(self) -> None:
+        """Stop the worker process of an isolated comparator, if one is running."""
+        if self._worker is not None:
+            self._worker.close()
 
-        # Tokenize, parse, and simplify the second predicate
-        tokens2 = self.tokenizer.tokenize(predicate2)
-        printer(f"Tokens2: {tokens2}")
-        parser2 = Parser(tokens2)
-        ast2 = parser2.parse()
-        printer(f"Parsed AST2: {ast2}")
+    def compare(self, predicate1: Union[str, PreparedPredicate],
+                predicate2: Union[str, PreparedPredicate],
+                timeout_ms: Optional[int] = None, max_memory_mb: Optional[int] = None) -> str:
+        """
+        Verdict sentence for the pair (`compare_detailed(...).text`).
+        `timeout_ms` / `max_memory_mb` override the comparator's budget for
+        this call; when it is exceeded the verdict is UNKNOWN_VERDICT.
+        """
+        return self.compare_detailed(predicate1, predicate2, timeout_ms, max_memory_mb).text
+
+    def compare_detailed(self, predicate1: Union[str, PreparedPredicate],
+                         predicate2: Union[str, PreparedPredicate],
+                         timeout_ms: Optional[int] = None, max_memory_mb: Optional[int] = None) -> Verdict:
+        """
+        `Verdict` for the pair: outcome, both implications, the deciding
+        engine and per-stage nanoseconds (see `verdict`). Budgets as in `compare`.
+        A pair found in the verdict cache is decided by "cache"; an UNKNOWN
+        verdict is not stored.
+        """
+        cache = self.verdict_cache
+        if cache is None:
+            return self._compare_detailed(predicate1, predicate2, timeout_ms, max_memory_mb)
+        with self.timer.timing() as clock:
+            with clock.stage("cache"):
+                p1 = self._prepared(predicate1)
+                p2 = self._prepared(predicate2)
+                key = self._cache_key(p1, p2)
+                implies1_to_2, implies2_to_1 = cache.get(*key) or (None, None)
+            if implies1_to_2 is not None and implies2_to_1 is not None:
+                return Verdict.from_implications(implies1_to_2, implies2_to_1, "cache", clock.ns)
+            verdict = self._compare_detailed(p1, p2, timeout_ms, max_memory_mb)
+        if verdict.outcome is not Outcome.UNKNOWN:
+            cache.put(*key, verdict.implies_1_to_2, verdict.implies_2_to_1)
+        return verdict
+
+    def _compare_detailed(self, predicate1: Union[str, PreparedPredicate],
+                          predicate2: Union[str, PreparedPredicate],
+                          timeout_ms: Optional[int], max_memory_mb: Optional[int]) -> Verdict:
+        timeout_ms = self.timeout_ms if timeout_ms is None else timeout_ms
+        max_memory_mb = self.max_memory_mb if max_memory_mb is None else max_memory_mb
+        if self.isolate:
+            if self._worker is None:
+                self._worker = IsolatedWorker(self._settings)
+            texts = [p.text if isinstance(p, PreparedPredicate) else p for p in (predicate1, predicate2)]
+            return self._worker.compare_detailed(*texts, timeout_ms=timeout_ms, max_memory_mb=max_memory_mb)
+        budget = Budget(timeout_ms, max_memory_mb)
+        with self.timer.timing() as clock:
+            if not budget:
+                return Verdict.from_implications(*self._decide(predicate1, predicate2), clock.ns)
+            sessions = [self._z3_session()]
+            if self.z3_translator is not None:
+                sessions.append(self.z3_translator.session())
+            for session in sessions:
+                session.budget = budget
+            try:
+                with watchdog(budget):
+                    return Verdict.from_implications(*self._decide(predicate1, predicate2), clock.ns)
+            except BudgetExceeded as e:
+                debug('> Budget exceeded: %s', e)
+                return Verdict.unknown(clock.ns)
+            finally:
+                for session in sessions:
+                    session.budget = None
+
+    def _decide(self, predicate1: Union[str, PreparedPredicate],
+                predicate2: Union[str, PreparedPredicate]) -> Tuple[bool, bool, str]:
+        """(predicate1 -> predicate2, predicate2 -> predicate1, what decided them)."""
+        stage = self.timer.stage
+        p1 = self._prepared(predicate1)
+        p2 = self._prepared(predicate2)
 
         # Parse both via the unified pipeline so string rewrites are always applied.
-        ast1 = self._parse_predicate(predicate1)
-        printer(f"Parsed+Normalized AST1: {ast1}")
-        ast2 = self._parse_predicate(predicate2)
-        printer(f"Parsed+Normalized AST2: {ast2}")
+        ast1 = p1.ast
+        debug('Parsed+Normalized AST1: %s', ast1)
+        ast2 = p2.ast
+        debug('Parsed+Normalized AST2: %s', ast2)
 
         # Special-case: identical LHS/RHS with strict compare vs '!=' (both UNSAT),
         # but tests expect the '!=' side to be considered stronger.
         if self._is_strict_vs_neq_same_operands(ast1, ast2):
-            return "The second predicate is stronger."
+            return False, True, "rules"
         if self._is_strict_vs_neq_same_operands(ast2, ast1):
-            return "The first predicate is stronger."
+            return True, False, "rules"
 
+        if self.z3_translator is not None:
+            with stage("solver"):
+                implies1_to_2, implies2_to_1 = self.z3_translator.implies_both(ast1, ast2)
+            debug('> Z3 engine: expr1 -> expr2: %s, expr2 -> expr1: %s', implies1_to_2, implies2_to_1)
+            return implies1_to_2, implies2_to_1, self.engine
 
         # Convert ASTs to SymPy expressions
-        expr1 = self._to_sympy_expr(ast1)
-        expr2 = self._to_sympy_expr(ast2)
-     
-        printer(f'> expr1: {expr1}')
-        printer(f'> expr2: {expr2}')
+        with stage("sympy"):
+            expr1, expr2 = p1.sympy, p2.sympy
+        debug('> expr1: %s', expr1)
+        debug('> expr2: %s', expr2)
 
         # Simplify expressions
-        simplified_expr1 = sp.simplify(expr1)
-        printer(f"Simplified SymPy Expression 1: {simplified_expr1}")
+        simplified_expr1 = p1.simplified
+        debug('Simplified SymPy Expression 1: %s', simplified_expr1)
 
-        simplified_expr2 = sp.simplify(expr2)
-        printer(f"Simplified SymPy Expression 2: {simplified_expr2}")
+        simplified_expr2 = p2.simplified
+        debug('Simplified SymPy Expression 2: %s', simplified_expr2)
 
         # separate well with a print
-        printer('\n' + '=' * 140 + '\n')
+        debug(_SEPARATOR)
 
         # Manually check implications
-        implies1_to_2 = self._implies(simplified_expr1, simplified_expr2)
-        printer(f"> Implies expr1 to expr2: {implies1_to_2}")
+        with stage("solver"):
+            implies1_to_2 = bool(self._implies(simplified_expr1, simplified_expr2))
+        debug('> Implies expr1 to expr2: %s', implies1_to_2)
 
         # separate well with a print
-        printer('\n' + '=' * 140 + '\n')
+        debug(_SEPARATOR)
 
-        implies2_to_1 = self._implies(simplified_expr2, simplified_expr1)
-        printer(f"> Implies expr2 to expr1: {implies2_to_1}")
+        with stage("solver"):
+            implies2_to_1 = bool(self._implies(simplified_expr2, simplified_expr1))
+        debug('> Implies expr2 to expr1: %s', implies2_to_1)
 
 
         # separate well with a print
-        printer('\n' + '=' * 140 + '\n')
+        debug(_SEPARATOR)
 
-
-
-        if implies1_to_2 and not implies2_to_1:
-            return "The first predicate is stronger."
-        elif implies2_to_1 and not implies1_to_2:
-            return "The second predicate is stronger."
-        elif implies1_to_2 and implies2_to_1:
-            return "The predicates are equivalent."
-        else:
-            return "The predicates are not equivalent and neither is stronger."
+        return implies1_to_2, implies2_to_1, self.engine
     
     def _has_indexed_symbols(self, expr):
         return bool(expr.atoms(sp.Indexed))
@@ -130,108 +447,83 @@ class Comparator:
         z3_expr1 = self.sympy_to_z3(expr1)
         z3_expr2 = self.sympy_to_z3(expr2)
 
-        solver = z3.Solver()
+        session = self._z3_session()
 
         # Non-negativity assumptions for all variables (Solidity-like domains).
-        for name in self._symbol_names(expr1).union(self._symbol_names(expr2)):
-            solver.add(z3.Real(name) >= 0)
+        names = self._symbol_names(expr1).union(self._symbol_names(expr2))
+        nonneg = session.nonneg(z3.Real(name) for name in names)
 
         # Check UNSAT of expr1 ∧ ¬expr2
-        solver.add(z3_expr1, z3.Not(z3_expr2))
-        return solver.check() == z3.unsat
+        return session.entails(z3_expr1, z3_expr2, nonneg) == z3.unsat
 
     def _is_strict_vs_neq_same_operands(self, a, b):
         """Heuristic: identical operands; a is '>' or '<' and b is '!='."""
         strict_ops = {'>', '<'}
         if a.value in strict_ops and b.value == '!=':
             if len(a.children) == 2 and len(b.children) == 2:
-                s0 = repr(a.children[0])
-                s1 = repr(a.children[1])
-                return s0 == s1 == repr(b.children[0]) == repr(b.children[1])
+                s0, s1 = a.children
+                return same_tree(s0, s1) and same_tree(s0, b.children[0]) and same_tree(s0, b.children[1])
         return False
 
     def _to_sympy_expr(self, ast):
-        def _sanitize_sym_name(s: str) -> str:
-            # keep alnum/underscore; collapse others to single '_'
-            s = re.sub(r"[^A-Za-z0-9_]", "_", str(s))
-            s = re.sub(r"_+", "_", s).strip("_")
-            return s or "sym"
-
-        def _symbol_from_call(func_name: str, arg_exprs):
-            # include args in the symbol name for disambiguation
-            parts = [_sanitize_sym_name(func_name)]
-            if arg_exprs:
-                parts.extend(_sanitize_sym_name(a) for a in arg_exprs)
-            return sp.Symbol("__".join(parts))
-
+        kind = ast.kind
         if not ast.children:
-            try:
-                return sp.Number(float(ast.value)) if '.' in ast.value else sp.Number(int(ast.value))
-            except ValueError:
-                # Map booleans
-                if ast.value.lower() == 'true':
-                    return sp.true
-                if ast.value.lower() == 'false':
-                    return sp.false
-                return sp.Symbol(ast.value.replace('.', '_'))
-
-        
-        # Handle indexed attributes: a[b].c  -> symbolic atom with args baked in
-        if '[]' in ast.value and '.' in ast.value:
-            func_name = ast.value.replace('[]', '').replace('()', '').replace('.', '_')
-            args = [self._to_sympy_expr(child) for child in ast.children]
-            return _symbol_from_call(func_name, args)
-
-        # Handle indexing without attributes: a[b]
-        if '[]' in ast.value:
-            base_name = ast.value.replace('[]', '')
-            base = sp.IndexedBase(base_name)
-            index = self._to_sympy_expr(ast.children[0])
-            return _symbol_from_call(base_name, [index])
+            if kind == LITERAL_INT:
+                return sp.Integer(ast.literal)
+            if kind == LITERAL_FLOAT:
+                return sp.Number(ast.literal)
+            if kind == LITERAL_BOOL:
+                return sp.true if ast.literal else sp.false
+            return sp.Symbol(ast.value.replace('.', '_'))
 
         args = [self._to_sympy_expr(child) for child in ast.children]
-        
-        if ast.value == '&' and len(args) == 2:
-            return sp.Function('BITAND')(*args)
-
-        # Normalize ==/!= with boolean literals to X / !X
-        if ast.value in ('==', '!=') and len(args) == 2:
-            L, R = args
-            is_L_bool = L is sp.true or L is sp.false
-            is_R_bool = R is sp.true or R is sp.false
-            if is_L_bool or is_R_bool:
-                bval = True if (L is sp.true or R is sp.true) else False
-                expr = R if is_L_bool else L
-                if ast.value == '==':
-                    return expr if bval else sp.Not(expr)
-                else:  # '!='
-                    return sp.Not(expr) if bval else expr
-
-        if ast.value in ('&&', '||', '!', '==', '!=', '>', '<', '>=', '<='):
-            return getattr(sp, self._sympy_operator(ast.value))(*args)
-        elif ast.value == '/':
-            return sp.Mul(args[0], sp.Pow(args[1], -1))
-            # # Failed Use sympy.floor to correctly model Solidity's integer division
-            # return sp.floor(args[0] / args[1])
-        elif ast.value == '+':
-            # unary plus: +x  →  x ; n-ary Add otherwise
-            return args[0] if len(args) == 1 else sp.Add(*args)
-        elif ast.value == '-':
-            # Support unary negation and binary subtraction
-            if len(args) == 1:
-                return sp.Mul(sp.Integer(-1), args[0])
-            elif len(args) == 2:
-                return sp.Add(args[0], sp.Mul(sp.Integer(-1), args[1]))
-            else:
-                raise ValueError(f"Invalid number of children for '-' node: {len(args)}")
-        elif ast.value == '*':
-            return sp.Mul(*args)
-        elif '()' in ast.value:
-            # Treat calls as Boolean/unknown atoms so And/Or/Not accept them
-            func_name = ast.value.replace('()', '').replace('.', '_')
-            return _symbol_from_call(func_name, args)
 
-        return sp.Symbol(ast.value.replace('.', '_'))
+        # Indexing, member access on an index/call result, and calls become
+        # symbolic atoms with their arguments baked into the name:
+        # a[b] -> a__b, a[b].c -> a_c__b, f(x, y) -> f__x__y
+        if kind in (INDEX, MEMBER, CALL):
+            return _symbol_from_call(ast.value, args)
+
+        op = ast.value
+        if kind == BINARY_OP:
+            if op == '&' and len(args) == 2:
+                return sp.Function('BITAND')(*args)
+
+            # Normalize ==/!= with boolean literals to X / !X
+            if op in ('==', '!=') and len(args) == 2:
+                L, R = args
+                is_L_bool = L is sp.true or L is sp.false
+                is_R_bool = R is sp.true or R is sp.false
+                if is_L_bool or is_R_bool:
+                    bval = True if (L is sp.true or R is sp.true) else False
+                    expr = R if is_L_bool else L
+                    if op == '==':
+                        return expr if bval else sp.Not(expr)
+                    else:  # '!='
+                        return sp.Not(expr) if bval else expr
+
+        if kind in (UNARY, BINARY_OP):
+            if op in ('&&', '||', '!', '==', '!=', '>', '<', '>=', '<='):
+                return getattr(sp, self._sympy_operator(op))(*args)
+            elif op == '/':
+                return sp.Mul(args[0], sp.Pow(args[1], -1))
+                # # Failed Use sympy.floor to correctly model Solidity's integer division
+                # return sp.floor(args[0] / args[1])
+            elif op == '+':
+                # unary plus: +x  →  x ; n-ary Add otherwise
+                return args[0] if len(args) == 1 else sp.Add(*args)
+            elif op == '-':
+                # Support unary negation and binary subtraction
+                if len(args) == 1:
+                    return sp.Mul(sp.Integer(-1), args[0])
+                elif len(args) == 2:
+                    return sp.Add(args[0], sp.Mul(sp.Integer(-1), args[1]))
+                else:
+                    raise ValueError(f"Invalid number of children for '-' node: {len(args)}")
+            elif op == '*':
+                return sp.Mul(*args)
+
+        return sp.Symbol(op.replace('.', '_'))
 
 
 
@@ -299,44 +591,45 @@ class Comparator:
         """
         Check if expr1 implies expr2 by manually comparing the expressions.
         """
-        printer(f"Checking implication: {expr1} -> {expr2} (level is: {level})", level)
+        debug('Checking implication: %s -> %s (level is: %s)', expr1, expr2, level, level=level)
         if expr1 == expr2:
-            printer("Expressions are identical.", level)
+            debug("Expressions are identical.", level=level)
             return True
 
-        # Handle equivalences through algebraic manipulation
+        # Handle equivalences through algebraic manipulation. Always the full
+        # `sp.simplify`, so this verdict does not depend on the strategy/budget.
         try:
-            if sp.simplify(expr1 - expr2) == 0:
-                printer("Expressions are equivalent through algebraic manipulation.", level)
+            if self._simplified(expr1 - expr2, "full", None) == 0:
+                debug("Expressions are equivalent through algebraic manipulation.", level=level)
                 return True
         except Exception as e: 
             # Even if the simplification fails, we can still proceed to other strategies
-            printer(f"Error (for using sp.simplify): {e}", level)
+            debug('Error (for using sp.simplify): %s', e, level=level)
             pass
 
         # Handle negation equivalence (e.g., !used[salt] == used[salt] == false)
         if isinstance(expr1, Not) and isinstance(expr2, sp.Equality):
-            printer('>>>>>>>>>>>> here1', level)
-            printer(f'expr2: {expr2}', level)
-            printer(f'expr2.rhs: {expr2.rhs}', level)
-            printer(f'expr2.lhs: {expr2.lhs}', level)
+            debug('>>>>>>>>>>>> here1', level=level)
+            debug('expr2: %s', expr2, level=level)
+            debug('expr2.rhs: %s', expr2.rhs, level=level)
+            debug('expr2.lhs: %s', expr2.lhs, level=level)
             if expr2.rhs == sp.false or expr2.rhs == False or expr2.rhs == sp.Symbol('false'):
-                printer('>>>>>>>>>>>> here1.1', level)
+                debug('>>>>>>>>>>>> here1.1', level=level)
                 return self._implies(expr1.args[0], expr2.lhs, level + 1)
             if expr2.lhs == sp.false or expr2.lhs == False or expr2.lhs == sp.Symbol('false'):
-                printer('>>>>>>>>>>>> here1.2', level)
+                debug('>>>>>>>>>>>> here1.2', level=level)
                 return self._implies(expr1.args[0], expr2.rhs, level + 1)
 
         if isinstance(expr2, Not) and isinstance(expr1, sp.Equality):
-            printer('>>>>>>>>>>>> here2', level)
-            printer(f'expr1: {expr1}', level)
-            printer(f'expr1.rhs: {expr1.rhs}', level)
-            printer(f'expr1.lhs: {expr1.lhs}', level)
+            debug('>>>>>>>>>>>> here2', level=level)
+            debug('expr1: %s', expr1, level=level)
+            debug('expr1.rhs: %s', expr1.rhs, level=level)
+            debug('expr1.lhs: %s', expr1.lhs, level=level)
             if expr1.rhs == sp.false or expr1.rhs == False or expr1.rhs == sp.Symbol('false'):
-                printer('>>>>>>>>>>>> here2.1', level)
+                debug('>>>>>>>>>>>> here2.1', level=level)
                 return self._implies(expr2.args[0], expr1.lhs, level + 1)
             if expr1.lhs == sp.false or expr1.lhs == False or expr1.lhs == sp.Symbol('false'):
-                printer('>>>>>>>>>>>> here2.2', level)
+                debug('>>>>>>>>>>>> here2.2', level=level)
                 return self._implies(expr2.args[0], expr1.rhs, level + 1)
 
         # Handle equivalence involving `true`
@@ -381,28 +674,28 @@ class Comparator:
         if isinstance(expr2, And):
             # expr1 should imply all parts of expr2 if expr2 is an AND expression
             results = [self._implies(expr1, arg, level + 1) for arg in expr2.args]
-            printer(f"Implication results for And expr2 which was `{expr1} => {expr2}`: {results}", level)
+            debug('Implication results for And expr2 which was `%s => %s`: %s', expr1, expr2, results, level=level)
             return all(results)
 
         # Handle AND expression for expr1
         if isinstance(expr1, And):
             # All parts of expr1 should imply expr2 if expr1 is an AND expression
             results = [self._implies(arg, expr2, level + 1) for arg in expr1.args]
-            printer(f"Implication results for And expr1 which was `{expr1} => {expr2}`: {results}", level)
+            debug('Implication results for And expr1 which was `%s => %s`: %s', expr1, expr2, results, level=level)
             return any(results)
 
         # Handle OR expression for expr2
         if isinstance(expr2, Or):
             # expr1 should imply at least one part of expr2 if expr2 is an OR expression
             results = [self._implies(expr1, arg, level + 1) for arg in expr2.args]
-            printer(f"Implication results for Or expr2 which was `{expr1} => {expr2}`: {results}", level)
+            debug('Implication results for Or expr2 which was `%s => %s`: %s', expr1, expr2, results, level=level)
             return any(results)
 
         # Handle OR expression for expr1
         if isinstance(expr1, Or):
             # All parts of expr1 should imply expr2 if expr1 is an OR expression
             results = [self._implies(arg, expr2, level + 1) for arg in expr1.args]
-            printer(f"Implication results for Or expr1 which was `{expr1} => {expr2}`: {results}", level)
+            debug('Implication results for Or expr1 which was `%s => %s`: %s', expr1, expr2, results, level=level)
             return all(results)
 
         # Handle function calls
@@ -419,98 +712,92 @@ class Comparator:
         # Specific relational operator checks for numerical comparisons
         relational_operators = (sp.Gt, sp.Ge, sp.Lt, sp.Le, sp.Eq, sp.Ne)
         if isinstance(expr1, relational_operators) and isinstance(expr2, relational_operators):
-            printer(f'In relational base cases; expr1: {expr1}, expr2: {expr2}', level)
+            debug('In relational base cases; expr1: %s, expr2: %s', expr1, expr2, level=level)
 
             # # Z3+nonneg fast-path before the other branches
             # # Prefer Z3 under non-negative domain if there are variables
             # try:
             #     if expr1.free_symbols or expr2.free_symbols:
             #         z3_result = self._z3_implies_with_nonneg(expr1, expr2)
-            #         printer(f"Z3 (nonneg) implication {expr1} -> {expr2}: {z3_result}", level)
+            #         debug("Z3 (nonneg) implication %s -> %s: %s", expr1, expr2, z3_result, level=level)
             #         return z3_result
             # except Exception as e:
-            #     printer(f"Error (Z3 nonneg implication): {e}", level)
+            #     debug("Error (Z3 nonneg implication): %s", e, level=level)
 
             # Check for Eq vs non-Eq comparisons; we don't handle this well, let's return False
             if (isinstance(expr1, sp.Eq) and not isinstance(expr2, sp.Eq)) or (not isinstance(expr1, sp.Eq) and isinstance(expr2, sp.Eq)):
-                printer(f'One of the expressions is equality and the other is not; expr1: {expr1}, expr2: {expr2}', level)  
+                debug('One of the expressions is equality and the other is not; expr1: %s, expr2: %s', expr1, expr2, level=level)  
 
                             # If there are free symbols, do implication under non-negative domain via Z3.
                 free_syms = expr1.free_symbols.union(expr2.free_symbols)
                 if free_syms:
                     try:
                         z3_result = self._z3_implies_with_nonneg(expr1, expr2)
-                        printer(f"Z3 (nonneg) implication {expr1} -> {expr2}: {z3_result}", level)
+                        debug('Z3 (nonneg) implication %s -> %s: %s', expr1, expr2, z3_result, level=level)
                         return z3_result
                     except Exception as e:
-                        printer(f"Error (Z3 nonneg implication): {e}", level)
+                        debug('Error (Z3 nonneg implication): %s', e, level=level)
                         # fall through to existing logic as a safe fallback
    
 
                 # switch to z3
-                printer(f'Switching to Z3 ..... ')
+                debug('Switching to Z3 ..... ')
                 z3_expr1 = self.sympy_to_z3(expr1)
                 z3_expr2 = self.sympy_to_z3(expr2)
 
-                solver = z3.Solver()
-                solver.add(z3.And(z3_expr1, z3.Not(z3_expr2)))
-
-                #solver.add(self.sympy_to_z3(negation))
-                result = solver.check()
+                result = self._z3_session().entails(z3_expr1, z3_expr2)
 
                 if result == z3.sat:
-                    printer(f"Implies {expr1} to {expr2}: False", level=0)
+                    debug('Implies %s to %s: False', expr1, expr2)
                     return False
                 else:
-                    printer(f"Implies {expr1} to {expr2}: True", level=0)
+                    debug('Implies %s to %s: True', expr1, expr2)
                     return True
             elif all(isinstance(arg, (sp.Float, sp.Integer, sp.Symbol)) for arg in [expr1.lhs, expr1.rhs, expr2.lhs, expr2.rhs]):
-                printer(f'Inside!... expr1: {expr1}, expr2: {expr2}', level)
+                debug('Inside!... expr1: %s, expr2: %s', expr1, expr2, level=level)
                 # Check if the negation of the implication is not satisfiable
                 try:
                     # First check if Indexed symbols exist
                     if self._has_indexed_symbols(expr1) or self._has_indexed_symbols(expr2):
-                        printer("Indexed symbols detected; switching to Z3 solver.", level)
+                        debug("Indexed symbols detected; switching to Z3 solver.", level=level)
 
                         z3_expr1 = self.sympy_to_z3(expr1)
                         z3_expr2 = self.sympy_to_z3(expr2)
 
-                        solver = z3.Solver()
-                        solver.add(z3_expr1, z3.Not(z3_expr2))
-
-                        result = solver.check()
+                        result = self._z3_session().entails(z3_expr1, z3_expr2)
 
                         if result == z3.unsat:
-                            printer(f"Z3 implication {expr1} -> {expr2}: True", level)
+                            debug('Z3 implication %s -> %s: True', expr1, expr2, level=level)
                             return True
                         else:
-                            printer(f"Z3 implication {expr1} -> {expr2}: False", level)
+                            debug('Z3 implication %s -> %s: False', expr1, expr2, level=level)
                             return False
 
                     # Otherwise, use SymPy as before
                     try:
                         negation = sp.And(expr1, Not(expr2))
-                        printer(f"Negation of the implication {expr1} -> {expr2}: {satisfiable(negation)}; type of {type(satisfiable(negation))}", level)
-                        result = not satisfiable(negation, use_lra_theory=True)
-                        printer(f"Implication {expr1} -> {expr2} using satisfiable: {result}", level)
+                        model = satisfiable(negation, use_lra_theory=True)
+                        debug('Negation of the implication %s -> %s: %s', expr1, expr2, model, level=level)
+                        result = not model
+                        debug('Implication %s -> %s using satisfiable: %s', expr1, expr2, result, level=level)
                         return result
                     except Exception as e:
-                        printer(f"Error (satisfiability error): {e}", level)
+                        debug('Error (satisfiability error): %s', e, level=level)
                         return False
                     
                 except Exception as e:
-                    printer(f"Error (satisfiability error): {e}", level)
+                    debug('Error (satisfiability error): %s', e, level=level)
                     return False
             else:
 
                 
-                printer(f'Not all arguments are numbers, floats, or symbols in expr1 and expr2, however, we still try to use the same sympy satisfiability check', level)
+                debug('Not all arguments are numbers, floats, or symbols in expr1 and expr2, however, we still try to use the same sympy satisfiability check', level=level)
 
                 # print type of all lhs and rhs's of both expressions
-                printer(f'type of expr1.lhs: {type(expr1.lhs)}')
-                printer(f'type of expr1.rhs: {type(expr1.rhs)}')
-                printer(f'type of expr2.lhs: {type(expr2.lhs)}')
-                printer(f'type of expr2.rhs: {type(expr2.rhs)}')
+                if debug_enabled():
+                    for name, side in (('expr1.lhs', expr1.lhs), ('expr1.rhs', expr1.rhs),
+                                       ('expr2.lhs', expr2.lhs), ('expr2.rhs', expr2.rhs)):
+                        debug('type of %s: %s', name, type(side))
 
 
                 # Detect ANY non-trivial numeric scaling (not just fractions) anywhere:
@@ -539,60 +826,54 @@ class Comparator:
                     return False
 
                 if any(_has_numeric_scale(arg) for arg in [expr1.lhs, expr1.rhs, expr2.lhs, expr2.rhs]):
-                    printer(f'Numeric scaling detected; switching to z3 with non-negativity.', level)
+                    debug('Numeric scaling detected; switching to z3 with non-negativity.', level=level)
 
                     z3_expr1 = self.sympy_to_z3(expr1)
                     z3_expr2 = self.sympy_to_z3(expr2)
 
                     variables = {str(sym) for sym in expr1.free_symbols.union(expr2.free_symbols)}
-                    z3_vars = {var: z3.Real(var) for var in variables}  # Convert to Z3 Reals
-
-                    solver = z3.Solver()
+                    session = self._z3_session()
                     # Solidity-like domains for this numeric monotonicity reasoning
-                    for var in z3_vars.values():
-                        solver.add(var >= 0)
+                    nonneg = session.nonneg(z3.Real(var) for var in variables)
 
                     # Check UNSAT of expr1 ∧ ¬expr2
-                    solver.add(z3_expr1, z3.Not(z3_expr2))
-                    if solver.check() == z3.sat:
-                        printer(f"Implies {expr1} to {expr2}: False", level=0)
+                    if session.entails(z3_expr1, z3_expr2, nonneg) == z3.sat:
+                        debug('Implies %s to %s: False', expr1, expr2)
                         return False
                     else:
-                        printer(f"Implies {expr1} to {expr2}: True", level=0)
+                        debug('Implies %s to %s: True', expr1, expr2)
                         return True
                 else: 
                     try:
                         # First check if Indexed symbols exist
                         if self._has_indexed_symbols(expr1) or self._has_indexed_symbols(expr2):
-                            printer("Indexed symbols detected; switching to Z3 solver.", level)
+                            debug("Indexed symbols detected; switching to Z3 solver.", level=level)
 
                             z3_expr1 = self.sympy_to_z3(expr1)
                             z3_expr2 = self.sympy_to_z3(expr2)
 
-                            solver = z3.Solver()
-                            solver.add(z3_expr1, z3.Not(z3_expr2))
-
-                            result = solver.check()
+                            result = self._z3_session().entails(z3_expr1, z3_expr2)
 
                             if result == z3.unsat:
-                                printer(f"Z3 implication {expr1} -> {expr2}: True", level)
+                                debug('Z3 implication %s -> %s: True', expr1, expr2, level=level)
                                 return True
                             else:
-                                printer(f"Z3 implication {expr1} -> {expr2}: False", level)
+                                debug('Z3 implication %s -> %s: False', expr1, expr2, level=level)
                                 return False
 
                         # Otherwise, use SymPy as before
                         try:
                             negation = sp.And(expr1, Not(expr2))
-                            printer(f"Negation of the implication {expr1} -> {expr2}: {satisfiable(negation)}; type of {type(satisfiable(negation))}", level)
-                            result = not satisfiable(negation, use_lra_theory=True)
-                            printer(f"Implication {expr1} -> {expr2} using satisfiable: {result}", level)
+                            model = satisfiable(negation, use_lra_theory=True)
+                            debug('Negation of the implication %s -> %s: %s', expr1, expr2, model, level=level)
+                            result = not model
+                            debug('Implication %s -> %s using satisfiable: %s', expr1, expr2, result, level=level)
                             return result
                         except Exception as e:
-                            printer(f"Error (satisfiability error): {e}", level)
+                            debug('Error (satisfiability error): %s', e, level=level)
                             return False
 
                     except Exception as e:
-                        printer(f"Error (satisfiability error): {e}", level)
+                        debug('Error (satisfiability error): %s', e, level=level)
                         return False
         return False
\ No newline at end of file
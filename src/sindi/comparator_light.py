@@ -1,201 +1,60 @@
 # Light version of SInDi comparator
 # This version does not use SMT solvers, only AST normalization and rule-based reasoning.
-from typing import List, Tuple, Optional, Union
+import os
+from typing import Iterable, List, Tuple, Optional, Union
+from .config import VERDICT_CACHE_ENV
 from .rewriter import Rewriter
 from .tokenizer import Tokenizer
-from .parser import Parser, ASTNode
-from .utils import printer
+import re
+from .parser import Parser, ASTNode, LITERAL_BOOL, LITERAL_INT, LITERAL_FLOAT, IDENTIFIER, MEMBER, INDEX, CALL
+from .hashcons import HNode
+from .ast_rewriter import NormalizeMemo, canonicalize
+from .prepared import PreparedPredicate
+from .utils import debug
+from .verdict import Outcome
 
 # ------------ Small helpers on AST ------------
 
-COMMUTATIVE = {'&&', '||', '==', '!='}
-ASSOCIATIVE = {'&&', '||', '+'}
-# We treat '+' as commutative for our purposes (we only need it for syntactic
-# canonicalization in simple linear-ish patterns).
-COMMUTATIVE_ARITH = {'+', '*'}
-
 REL_OPS = {'>', '>=', '<', '<=', '==', '!='}
 
-def _is_bool_leaf(n: ASTNode) -> bool:
-    return not n.children and n.value in ('true', 'false', 'True', 'False')
-
-def _clone(n: ASTNode) -> ASTNode:
-    return ASTNode(n.value, [ _clone(c) for c in n.children ])
-
-def _repr(n: ASTNode) -> str:
-    return repr(n)
-
-def _eq(a: ASTNode, b: ASTNode) -> bool:
-    return _repr(a) == _repr(b)
-
-def _sort_children(node: ASTNode):
-    node.children.sort(key=_repr)
-
-def _flatten(node: ASTNode) -> ASTNode:
-    """
-    Flatten associative nodes (&&, ||, +) so ((a && b) && c) → (&& a b c).
-    """
-    if not node.children:
-        return node
-    node.children = [ _flatten(c) for c in node.children ]
-    if node.value in ASSOCIATIVE:
-        flat = []
-        for ch in node.children:
-            if ch.value == node.value:
-                flat.extend(ch.children)
-            else:
-                flat.append(ch)
-        node.children = flat
-    return node
-
-def _comm_sort(node: ASTNode) -> ASTNode:
-    """
-    Sort commutative children for deterministic equality.
-    """
-    if not node.children:
-        return node
-    for i, ch in enumerate(node.children):
-        node.children[i] = _comm_sort(ch)
-    if node.value in (COMMUTATIVE | COMMUTATIVE_ARITH):
-        _sort_children(node)
-    return node
-
-def _normalize_equals_to_bool(node: ASTNode) -> ASTNode:
-    """
-    Rewrites:
-      X == true  -> X
-      X == false -> !X
-      X != true  -> !X
-      X != false -> X
-    and symmetrical (true == X), (false == X), etc.
-    """
-    if not node.children:
-        return node
-    node.children = [ _normalize_equals_to_bool(c) for c in node.children ]
-
-    def _mk_not(x: ASTNode) -> ASTNode:
-        return ASTNode('!', [x])
-
-    if node.value in ('==','!=') and len(node.children) == 2:
-        L, R = node.children
-        if _is_bool_leaf(L) or _is_bool_leaf(R):
-            # normalize to  (expr op bool)
-            expr = R if _is_bool_leaf(L) else L
-            blf  = L if _is_bool_leaf(L) else R
-            bval = blf.value.lower() == 'true'
-            if node.value == '==':
-                return expr if bval else _mk_not(expr)
-            else: # '!='
-                return _mk_not(expr) if bval else expr
-    return node
-
-def _normalize_nots(node: ASTNode) -> ASTNode:
-    """
-    Basic NOT canonicalization: !!X -> X
-    (We avoid DeMorgan; we only need small cleanups.)
-    """
-    if not node.children:
-        return node
-    node.children = [ _normalize_nots(c) for c in node.children ]
-    if node.value == '!' and len(node.children) == 1:
-        child = node.children[0]
-        if child.value == '!':
-            return child.children[0]
-    return node
-
-def _normalize_relational_subtractions(node: ASTNode) -> ASTNode:
-    """
-    Move a single subtraction across inequality (one step), e.g.:
-      X < Y - Z   →  X + Z < Y
-      X + Z < Y   (left as is)
-    Applies similarly to <=, >, >=, ==, !=.
-    Also handles the 'left is (A - B)' forms: A - B < C  → A < C + B
-    """
-    if not node.children:
-        return node
-    node.children = [ _normalize_relational_subtractions(c) for c in node.children ]
-
-    if node.value in REL_OPS and len(node.children) == 2:
-        L, R = node.children
-
-        # Right = (A - B)  →  (L + B) op A
-        if R.value == '-' and len(R.children) == 2:
-            A, B = R.children
-            return ASTNode(node.value, [ASTNode('+', [L, B]), A])
+def _is_bool_leaf(n: HNode) -> bool:
+    return n.kind == LITERAL_BOOL
 
-        # Left = (A - B)  →  A op (R + B)
-        if L.value == '-' and len(L.children) == 2:
-            A, B = L.children
-            return ASTNode(node.value, [A, ASTNode('+', [R, B])])
+def _eq(a: HNode, b: HNode) -> bool:
+    # Normalized trees are hash-consed: structural equality is identity.
+    return a is b
 
-    return node
+# Raw subtree -> normalized form, shared by every normalize_ast call
+# (see NormalizeMemo.cache_info() for hit/miss counts).
+NORMALIZE_MEMO = NormalizeMemo()
 
-def _normalize_commutative_rel_args(node: ASTNode) -> ASTNode:
-    """
-    For == and !=, reorder sides deterministically.
-    For >,<,>=,<= keep order; we only reorder equality/inequality.
-    """
-    if not node.children:
-        return node
-    node.children = [ _normalize_commutative_rel_args(c) for c in node.children ]
-    if node.value in ('==','!=') and len(node.children) == 2:
-        L, R = node.children
-        if _repr(R) < _repr(L):
-            node.children = [R, L]
-    return node
-
-def _normalize_plus_commutativity(node: ASTNode) -> ASTNode:
-    """
-    Treat '+' as commutative/associative for canonical form.
+def normalize_ast(n: Union[ASTNode, HNode]) -> HNode:
     """
-    if not node.children:
-        return node
-    node.children = [ _normalize_plus_commutativity(c) for c in node.children ]
-    node = _flatten(node)
-    if node.value == '+':
-        _sort_children(node)
-    return node
-
-def normalize_ast(n: ASTNode) -> ASTNode:
-    """
-    Pipeline:
+    Accepts an ASTNode, HNode or ArenaNode and returns an interned
+    (hash-consed) tree; the input is left untouched.
+    Rules (one bottom-up walk, see `ast_rewriter.canonicalize`):
       - push boolean equals/!= to ! / identity
       - collapse !!X
       - move a simple '-' across relations
       - flatten associative ops
-      - canonicalize commutative children for &&, ||, +, ==, !=
+      - canonicalize commutative children for &&, ||, +, *, ==, !=
+    Repeated subtrees are served from NORMALIZE_MEMO.
     """
-    n = _normalize_equals_to_bool(_clone(n))
-    n = _normalize_nots(n)
-    n = _normalize_relational_subtractions(n)
-    n = _flatten(n)
-    n = _normalize_plus_commutativity(n)
-    n = _comm_sort(n)
-    n = _normalize_commutative_rel_args(n)
-    return n
+    return canonicalize(n, local_forms=False, finalized_bitmask=False, memo=NORMALIZE_MEMO)
 
 # ------------ Tiny “pattern” extractors (no SMT) ------------
 
-def _is_number(node: ASTNode) -> bool:
-    if node.children:
-        return False
-    try:
-        int(node.value)
-        return True
-    except:
-        return False
+def _is_number(node: HNode) -> bool:
+    return node.kind == LITERAL_INT
 
-def _as_int(node: ASTNode) -> Optional[int]:
-    try:
-        return int(node.value)
-    except:
-        return None
+def _as_int(node: HNode) -> Optional[int]:
+    return node.literal if node.kind == LITERAL_INT else None
 
-def _is_var_like(node: ASTNode) -> bool:
+def _is_var_like(node: HNode) -> bool:
     """Heuristic: anything that's not a pure number and has no children -> symbol-ish atom."""
-    return (not node.children) and (not _is_number(node))
+    return (not node.children) and node.kind != LITERAL_INT
 
-def _mul_form(node: ASTNode) -> Optional[Tuple[ASTNode, float]]:
+def _mul_form(node: HNode) -> Optional[Tuple[HNode, float]]:
     """
     Recognize forms: base * k   or   k * base    (k > 0), also base / k as base * (1/k)
     Return (base_node, factor_k). If none, return None.
@@ -223,12 +82,12 @@ def _mul_form(node: ASTNode) -> Optional[Tuple[ASTNode, float]]:
         return (node, 1.0)
     return None
 
-def _same_atom(a: ASTNode, b: ASTNode) -> bool:
+def _same_atom(a: HNode, b: HNode) -> bool:
     return _is_var_like(a) and _is_var_like(b) and _eq(a, b)
 
 # ------------ Rule-based implication without SMT ------------
 
-def _identical_relation_sides(a: ASTNode, b: ASTNode) -> bool:
+def _identical_relation_sides(a: HNode, b: HNode) -> bool:
     return len(a.children) == 2 and len(b.children) == 2 and _eq(a.children[0], b.children[0]) and _eq(a.children[1], b.children[1])
 
 def _operator_implication_same_sides(op_left: str, op_right: str) -> Optional[bool]:
@@ -273,7 +132,7 @@ def _compare_numeric_bounds(op: str, rhs1: int, rhs2: int) -> Optional[bool]:
         return rhs1 == rhs2
     return None
 
-def _implies_relational(L: ASTNode, R: ASTNode) -> Optional[bool]:
+def _implies_relational(L: HNode, R: HNode) -> Optional[bool]:
     """
     Try implication for two relation nodes (>,>=,<,<=,==,!=) with light rules.
     Returns True/False if decided, or None if unknown.
@@ -322,17 +181,17 @@ def _implies_relational(L: ASTNode, R: ASTNode) -> Optional[bool]:
 
     return None
 
-def _ast_set(node: ASTNode) -> List[ASTNode]:
+def _ast_set(node: HNode) -> Tuple[HNode, ...]:
     return node.children
 
-def _implies(a: ASTNode, b: ASTNode) -> bool:
+def _implies(a: HNode, b: HNode) -> bool:
     # identical
     if _eq(a, b):
         return True
 
     # Boolean leaves?
     if _is_bool_leaf(a) and _is_bool_leaf(b):
-        return a.value.lower() == b.value.lower()
+        return a.literal == b.literal
 
     # AND / OR monotonicity
     if a.value == '&&':
@@ -342,9 +201,7 @@ def _implies(a: ASTNode, b: ASTNode) -> bool:
                 return True
         if b.value == '&&':
             # (A ∧ B ∧ C) ⇒ (A ∧ B)
-            aset = {_repr(x) for x in _ast_set(a)}
-            bset = {_repr(x) for x in _ast_set(b)}
-            return bset.issubset(aset)
+            return set(_ast_set(b)).issubset(_ast_set(a))
         if b.value == '||':
             # (A ∧ B) ⇒ (A ∨ C) if a implies any disjunct
             for disj in _ast_set(b):
@@ -355,9 +212,7 @@ def _implies(a: ASTNode, b: ASTNode) -> bool:
     if a.value == '||':
         if b.value == '||':
             # (A ∨ B) ⇒ (A ∨ B ∨ C) if left set ⊆ right set
-            aset = {_repr(x) for x in _ast_set(a)}
-            bset = {_repr(x) for x in _ast_set(b)}
-            return aset.issubset(bset)
+            return set(_ast_set(a)).issubset(_ast_set(b))
 
     # NOT: only small reduction (already normalized); if still present, require equality
     if a.value == '!' or b.value == '!':
@@ -386,6 +241,130 @@ def _implies(a: ASTNode, b: ASTNode) -> bool:
 
     return False
 
+# ------------ Tri-state implication (no SMT, never guesses) ------------
+#
+# `_implies` above answers False whenever no rule fires. `decide_implication`
+# answers only what holds for every comparator domain (the reals, and the
+# non-negative reals the solvers assume), and None ("undecided") otherwise,
+# so a tiered comparator can escalate exactly the pairs it cannot settle.
+
+_ATOM_KINDS = (IDENTIFIER, MEMBER, INDEX, CALL)
+_FIRST_WORD = re.compile(r"[A-Za-z0-9]+")
+# `x op 0` that stays contingent when x ranges over the non-negative reals.
+_CONTINGENT_AT_ZERO = {'>', '!=', '==', '<='}
+_FLIPPED = {'>': '<', '<': '>', '>=': '<=', '<=': '>=', '==': '==', '!=': '!='}
+
+def _number(node: HNode) -> Optional[Union[int, float]]:
+    return node.literal if node.kind in (LITERAL_INT, LITERAL_FLOAT) and not node.children else None
+
+def _is_atom(node: HNode) -> bool:
+    return node.kind in _ATOM_KINDS
+
+def _atom_key(node: HNode) -> str:
+    """
+    Coarse name of an atom: its first alphanumeric run (`msg.sender` ->
+    `msg`, `balances[to]` -> `balances`). The solvers' symbol names
+    (`msg_sender`, `balances__to`) keep that run, so atoms that are one
+    symbol there always share a key here.
+    """
+    m = _FIRST_WORD.search(node.value)
+    return m.group(0) if m else node.value
+
+def _contingent_relation(node: HNode, strict_sides: bool = False) -> Optional[frozenset]:
+    """
+    Atom keys of a relation that is neither unsatisfiable nor valid in any
+    comparator domain, or None: `x op y` over atoms with different keys,
+    `x op c` / `c op x` with c > 0, and (unless `strict_sides`) `x op 0`
+    for the operators that stay contingent over the non-negative reals.
+    With `strict_sides`, the sides' difference also takes negative, zero and
+    positive values, so the operator alone decides implication between two
+    relations over the same sides.
+    """
+    if node.value not in REL_OPS or len(node.children) != 2:
+        return None
+    l, r = node.children
+    if _is_atom(l) and _is_atom(r):
+        keys = frozenset((_atom_key(l), _atom_key(r)))
+        return keys if len(keys) == 2 else None
+    op = node.value
+    if _is_atom(r):
+        l, r, op = r, l, _FLIPPED[op]
+    c = _number(r)
+    if not _is_atom(l) or c is None:
+        return None
+    if c > 0 or (c == 0 and not strict_sides and op in _CONTINGENT_AT_ZERO):
+        return frozenset((_atom_key(l),))
+    return None
+
+def _contingent(node: HNode) -> Optional[frozenset]:
+    """Atom keys of a contingent relation, boolean atom or negated boolean atom; else None."""
+    if node.value == '!' and len(node.children) == 1:
+        node = node.children[0]
+        return frozenset((_atom_key(node),)) if _is_atom(node) else None
+    if _is_atom(node):
+        return frozenset((_atom_key(node),))
+    return _contingent_relation(node)
+
+def _contingency(node: HNode) -> Optional[Tuple[frozenset, bool, bool]]:
+    """
+    (atom keys, surely satisfiable, surely falsifiable) for &&/|| trees of
+    contingent relations; None for anything else. Parts over pairwise
+    disjoint atoms are independent, which is what the two flags rely on.
+    """
+    keys = _contingent(node)
+    if keys is not None:
+        return keys, True, True
+    if node.value not in ('&&', '||') or not node.children:
+        return None
+    parts = [_contingency(ch) for ch in node.children]
+    if any(p is None for p in parts):
+        return None
+    keys = frozenset().union(*(p[0] for p in parts))
+    disjoint = len(keys) == sum(len(p[0]) for p in parts)
+    if node.value == '&&':
+        return keys, disjoint and all(p[1] for p in parts), any(p[2] for p in parts)
+    return keys, any(p[1] for p in parts), disjoint and all(p[2] for p in parts)
+
+def decide_implication(a: HNode, b: HNode) -> Optional[bool]:
+    """
+    Whether normalized `a` implies `b`: True / False when a rule settles it
+    for certain, None when it is undecided without a solver.
+    """
+    if _eq(a, b):
+        return True
+    # Conjunct elimination, disjunct introduction, and their set versions.
+    if a.value == '&&' and (b in a.children or (b.value == '&&' and set(b.children).issubset(a.children))):
+        return True
+    if b.value == '||' and (a in b.children or (a.value == '||' and set(a.children).issubset(b.children))):
+        return True
+
+    if _contingent_relation(a, strict_sides=True) and _contingent_relation(b, strict_sides=True):
+        if _identical_relation_sides(a, b):
+            return _operator_implication_same_sides(a.value, b.value)
+        (al, ar), (bl, br) = a.children, b.children
+        if a.value == b.value and _eq(al, bl) and _number(ar) is not None and _number(br) is not None:
+            return _compare_numeric_bounds(a.value, ar.literal, br.literal)
+
+    # Over disjoint atoms, a -> b only if a is unsatisfiable or b is valid.
+    ca, cb = _contingency(a), _contingency(b)
+    if ca is not None and cb is not None and ca[0].isdisjoint(cb[0]) and ca[1] and cb[2]:
+        return False
+
+    # a -> (b1 && b2) and (a1 || a2) -> b hold iff every part does.
+    if b.value == '&&':
+        return _all_parts((decide_implication(a, ch) for ch in b.children))
+    if a.value == '||':
+        return _all_parts((decide_implication(ch, b) for ch in a.children))
+    return None
+
+def _all_parts(decisions) -> Optional[bool]:
+    undecided = False
+    for d in decisions:
+        if d is False:
+            return False
+        undecided |= d is None
+    return None if undecided else True
+
 # ------------ Public Comparator (solver-free) ------------
 
 class ComparatorRulesOnly:
@@ -395,25 +374,100 @@ class ComparatorRulesOnly:
       - Tokenizer.tokenize → Parser.parse
       - AST normalization
       - Rule-based equivalence / implication
+
+    `verdict_cache` as in `Comparator`: a path or `VerdictCache` that keeps
+    verdicts on disk across runs (None: SINDI_VERDICT_CACHE if set).
     """
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, verdict_cache=None):
         self.rewriter = Rewriter()
         self.tokenizer = Tokenizer()
         self.verbose = verbose
-
-    def _parse(self, s: str) -> ASTNode:
+        self.verdict_cache = None
+        if verdict_cache is not None or os.environ.get(VERDICT_CACHE_ENV, "").strip():
+            from .verdict_cache import fingerprint, resolve_cache  # SQLite: only loaded when a cache is used
+            from . import __version__
+            self.verdict_cache = resolve_cache(verdict_cache)
+            self.cache_version = f"light sindi {__version__}"
+            self._fingerprint = fingerprint
+
+    def _cache_key(self, a: HNode, b: HNode) -> Tuple[str, str, str]:
+        return self.cache_version, self._fingerprint(a), self._fingerprint(b)
+
+    def _parse_predicate(self, s: str) -> HNode:
         s = self.rewriter.apply(s)
         tokens = self.tokenizer.tokenize(s)
         ast = Parser(tokens).parse()
         return normalize_ast(ast)
 
-    def compare(self, p1: str, p2: str) -> str:
-        a = self._parse(p1)
-        b = self._parse(p2)
-
+    def prepare(self, predicate: str) -> PreparedPredicate:
+        """
+        Bind `predicate` to this comparator; its normalized AST is computed
+        on first use and kept for later `compare`/`implies` calls.
+        """
+        return PreparedPredicate(self, predicate)
+
+    def _prepared(self, predicate: Union[str, PreparedPredicate]) -> PreparedPredicate:
+        if isinstance(predicate, PreparedPredicate):
+            if predicate.comparator is self:
+                return predicate
+            predicate = predicate.text  # prepared by another comparator: redo with ours
+        return self.prepare(predicate)
+
+    def implies(self, p1: Union[str, PreparedPredicate], p2: Union[str, PreparedPredicate]) -> bool:
+        """Whether p1 implies p2, by the same rules `compare` uses."""
+        a = self._prepared(p1).ast
+        b = self._prepared(p2).ast
+        cache = self.verdict_cache
+        if cache is None:
+            return self._implication(a, b)
+        key = self._cache_key(a, b)
+        known = cache.get(*key)
+        if known is not None and known[0] is not None:
+            return known[0]
+        holds = self._implication(a, b)
+        cache.put(*key, holds)
+        return holds
+
+    def _implication(self, a: HNode, b: HNode) -> bool:
+        if _eq(a, b):
+            return True
+        if a.value in REL_OPS and b.value in REL_OPS and _identical_relation_sides(a, b):
+            if a.value in ('>','<') and b.value == '!=':
+                return False
+            if b.value in ('>','<') and a.value == '!=':
+                return True
+        return _implies(a, b)
+
+    def implies_many(self, p: Union[str, PreparedPredicate],
+                     candidates: Iterable[Union[str, PreparedPredicate]]) -> List[bool]:
+        """`[implies(p, c) for c in candidates]`, with `p` prepared once."""
+        p = self._prepared(p)
+        return [self.implies(p, c) for c in candidates]
+
+    def implied_by_many(self, p: Union[str, PreparedPredicate],
+                        candidates: Iterable[Union[str, PreparedPredicate]]) -> List[bool]:
+        """`[implies(c, p) for c in candidates]`, with `p` prepared once."""
+        p = self._prepared(p)
+        return [self.implies(c, p) for c in candidates]
+
+    def compare(self, p1: Union[str, PreparedPredicate], p2: Union[str, PreparedPredicate]) -> str:
+        a = self._prepared(p1).ast
+        b = self._prepared(p2).ast
+        cache = self.verdict_cache
+        if cache is None:
+            return self._compare(a, b)
+        key = self._cache_key(a, b)
+        known = cache.get(*key)
+        if known is not None and None not in known:
+            return Outcome.of(*known).value
+        verdict = self._compare(a, b)
+        cache.put(*key, *Outcome(verdict).implications)
+        return verdict
+
+    def _compare(self, a: HNode, b: HNode) -> str:
         if self.verbose:
-            printer(f"[NORM p1]: {a}")
-            printer(f"[NORM p2]: {b}")
+            debug('[NORM p1]: %s', a)
+            debug('[NORM p2]: %s', b)
 
         # First: structural equivalence after normalization
         if _eq(a, b):
@@ -0,0 +1,8 @@
+# src/sindi/config.py
+"""Settings that modules which must not load SymPy or Z3 (the CLI) share with the comparators."""
+
+# Decision procedures behind `Comparator.compare` / `implies`.
+ENGINES = ("sympy", "z3")
+
+# Path of the on-disk verdict cache comparators use when not given one (see `verdict_cache`).
+VERDICT_CACHE_ENV = "SINDI_VERDICT_CACHE"
@@ -0,0 +1,186 @@
+# src/sindi/hashcons.py
+"""
+Hash-consed, immutable AST nodes.
+
+`HNode` mirrors `ASTNode` (same `value` / `children` attributes and the same
+`repr`), but every node is built through a process-wide hash-cons table:
+structurally equal trees are the *same object*. That turns structural
+equality into an identity check, makes nodes usable as dict/set keys with a
+precomputed hash, and lets the canonical sort key (the `repr` string the
+normalizers have always sorted by) be computed once per distinct subtree.
+Each node also stores its `kind` / `literal` (see `parser.node_kind`).
+
+Parsing still produces mutable `ASTNode`s; `intern_ast` converts a tree and
+`HNode.to_ast` converts back when a caller needs to mutate.
+"""
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Dict, Iterable, Sequence
+
+from .parser import ASTNode, node_kind
+
+__all__ = ["HNode", "make_node", "with_children", "intern_ast", "same_tree"]
+
+# (value, *child ids) -> weakref to the node. Child ids are safe keys: a live
+# node keeps its children alive, so a live ref always matches its key. Dead
+# refs are simply overwritten on lookup and swept out when the table doubles.
+_TABLE: Dict[tuple, "weakref.ref[HNode]"] = {}
+_LOCK = threading.Lock()
+_SWEEP_MIN = 4096
+_sweep_at = _SWEEP_MIN
+
+
+class HNode:
+    """Interned AST node; build with `make_node` / `intern_ast`, never directly."""
+
+    __slots__ = ("value", "children", "kind", "literal", "_hash", "_key", "__weakref__")
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    # Identity equality is structural equality because nodes are interned.
+    def __eq__(self, other) -> bool:
+        return self is other
+
+    def __ne__(self, other) -> bool:
+        return self is not other
+
+    def __repr__(self) -> str:
+        return self.sort_key()
+
+    def __reduce__(self):
+        return (make_node, (self.value, self.children))
+
+    def sort_key(self) -> str:
+        """
+        Canonical ordering key, identical to `repr` of the equivalent `ASTNode`
+        so sorting by it reproduces the historical repr-based order. Computed
+        lazily and cached on every subtree it visits (iteratively, so deep
+        chains do not hit the recursion limit).
+        """
+        key = self._key
+        if key is not None:
+            return key
+        stack = [self]
+        while stack:
+            node = stack[-1]
+            pending = [c for c in node.children if c._key is None]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            if node._key is None:
+                inner = ", ".join([c._key for c in node.children])
+                _set_key(node, f"ASTNode(value='{node.value}', children=[{inner}])")
+        return self._key
+
+    def to_ast(self) -> ASTNode:
+        """Return a fresh, mutable `ASTNode` copy of this tree (shared subtrees are unshared)."""
+        root = ASTNode(self.value)
+        stack = [(self, root)]
+        while stack:
+            h, a = stack.pop()
+            a.children = [ASTNode(c.value) for c in h.children]
+            a.kind, a.literal = h.kind, h.literal
+            stack.extend(zip(h.children, a.children))
+        return root
+
+
+# Slot setters that bypass the immutability guard in `__setattr__`.
+_set_value = HNode.value.__set__
+_set_children = HNode.children.__set__
+_set_kind = HNode.kind.__set__
+_set_literal = HNode.literal.__set__
+_set_hash = HNode._hash.__set__
+_set_key = HNode._key.__set__
+_new = object.__new__
+_ref = weakref.ref
+
+
+def make_node(value: str, children: Iterable[HNode] = ()) -> HNode:
+    """Return the unique `HNode` for (value, children); children must be interned."""
+    children = tuple(children)
+    key = (value, *map(id, children))
+    ref = _TABLE.get(key)
+    if ref is not None:
+        node = ref()
+        if node is not None:
+            return node
+    node = _new(HNode)
+    _set_value(node, value)
+    _set_children(node, children)
+    kind, literal = node_kind(value, len(children))
+    _set_kind(node, kind)
+    _set_literal(node, literal)
+    # Equal structure <=> equal key, so the key's hash is a structural hash.
+    _set_hash(node, hash(key))
+    _set_key(node, None)
+    ref = _ref(node)
+    current = _TABLE.setdefault(key, ref)  # atomic under the GIL
+    if current is not ref:
+        # Another thread interned it first, or the slot holds a dead ref.
+        with _LOCK:
+            current = _TABLE.get(key)
+            winner = current() if current is not None else None
+            if winner is not None:
+                return winner
+            _TABLE[key] = ref
+    if len(_TABLE) > _sweep_at:
+        _sweep()
+    return node
+
+
+def _sweep() -> None:
+    global _sweep_at
+    with _LOCK:
+        for key in [k for k, r in _TABLE.items() if r() is None]:
+            del _TABLE[key]
+        _sweep_at = max(_SWEEP_MIN, 2 * len(_TABLE))
+
+
+def with_children(node: HNode, children: Sequence[HNode]) -> HNode:
+    """Copy-on-write rebuild: `node` itself if `children` are unchanged."""
+    children = tuple(children)
+    # Tuple equality short-circuits on identity, which is all HNode.__eq__ does.
+    if children == node.children:
+        return node
+    return make_node(node.value, children)
+
+
+def intern_ast(node) -> HNode:
+    """
+    Hash-cons a tree bottom-up (iteratively). Accepts `ASTNode`, `ArenaNode` or
+    anything else with `value` / `children`; `HNode`s pass through.
+    """
+    # Read each node's children once: views such as ArenaNode build them on access.
+    order = []
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        kids = () if isinstance(n, HNode) else n.children
+        order.append((n, kids))
+        stack.extend(kids)
+    done = {}
+    for n, kids in reversed(order):  # reversed pre-order: children before parents
+        if isinstance(n, HNode):
+            done[id(n)] = n
+        elif kids:
+            done[id(n)] = make_node(n.value, [done[id(c)] for c in kids])
+        else:
+            done[id(n)] = make_node(n.value)
+    return done[id(node)]
+
+
+def same_tree(a, b) -> bool:
+    """Structural equality: identity for interned nodes, `repr` otherwise."""
+    if isinstance(a, HNode) and isinstance(b, HNode):
+        return a is b
+    return repr(a) == repr(b)
@@ -0,0 +1,238 @@
+# src/sindi/invariants.py
+"""
+An incrementally maintained set of invariants and its strongest members.
+
+`InvariantSet` keeps the strongest predicates of a changing set (what
+`reduce.strongest` computes once) up to date under `add` and `remove`:
+
+  - members are indexed by signature (`symbols.SymbolIndex`); a new
+    predicate is compared only with the current maxima that could be
+    related to it, i.e. that share an atom key with it or have no signature;
+  - every engine verdict is kept as an edge between the two predicates,
+    and a pair that has been compared once is never compared again;
+  - removing a maximum re-examines only the members it was holding down.
+
+`save` / `InvariantSet.load` store members, signatures and edges as JSON,
+so after a re-run `sync(new_predicates)` only pays for the difference.
+Equivalent predicates are all kept, as with `reduce.strongest`; a
+predicate that does not parse is kept and never compared.
+"""
+from __future__ import annotations
+
+import json
+import os
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .batch import BATCH_ENGINES, _make_comparator
+from .prepared import PreparedPredicate
+from .symbols import SymbolIndex, solver_signature, signature
+from .utils import debug
+from .verdict import Outcome
+
+__all__ = ["InvariantSet"]
+
+# Version of the `save` format.
+FORMAT = 2
+
+_REVERSED = {
+    Outcome.FIRST_STRONGER: Outcome.SECOND_STRONGER,
+    Outcome.SECOND_STRONGER: Outcome.FIRST_STRONGER,
+    Outcome.EQUIVALENT: Outcome.EQUIVALENT,
+    Outcome.INCOMPARABLE: Outcome.INCOMPARABLE,
+}
+
+
+def _keys(sig: Optional[FrozenSet[str]]) -> Optional[List[str]]:
+    return None if sig is None else sorted(sig)
+
+
+class InvariantSet:
+    """
+    A set of predicates that knows its strongest members (see the module
+    docstring). `engine` is one of `batch.BATCH_ENGINES`; other keyword
+    arguments configure the comparator. `comparisons` counts the engine
+    calls this object has made; `errors` maps predicates that do not parse
+    to "Type: message".
+    """
+
+    def __init__(self, predicates: Iterable[str] = (), engine: str = "sympy", **comparator_kwargs):
+        if engine not in BATCH_ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; expected one of {', '.join(BATCH_ENGINES)}")
+        self.engine = engine
+        self._comparator = _make_comparator(engine, comparator_kwargs)
+        self._prepared: Dict[str, PreparedPredicate] = {}
+        self._members: Dict[str, None] = {}  # in insertion order
+        self._index = SymbolIndex()  # members that parse
+        self._dominators: Dict[str, Set[str]] = {}  # non-maximal member -> members strictly stronger
+        self._dominated: Dict[str, Set[str]] = defaultdict(set)
+        self._outcomes: Dict[Tuple[str, str], Outcome] = {}
+        self.errors: Dict[str, str] = {}
+        self.comparisons = 0
+        self.update(predicates)
+
+    # ---- set interface ----
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, predicate: str) -> bool:
+        return predicate in self._members
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._members)
+
+    def __repr__(self) -> str:
+        return f"InvariantSet({len(self)} predicates, {len(self.strongest)} strongest, engine={self.engine!r})"
+
+    @property
+    def strongest(self) -> List[str]:
+        """Members no other member is strictly stronger than, in insertion order."""
+        return [p for p in self._members if p not in self._dominators]
+
+    def stronger_than(self, predicate: str) -> Set[str]:
+        """Members known to be strictly stronger than `predicate` (empty for the strongest)."""
+        return set(self._dominators.get(predicate, ()))
+
+    def add(self, predicate: str) -> bool:
+        """Add `predicate`; return whether it is among the strongest members."""
+        if predicate not in self._members:
+            self._members[predicate] = None
+            try:
+                sig = self._signature(predicate)
+            except Exception as e:
+                self.errors[predicate] = f"{type(e).__name__}: {e}"
+            else:
+                self._index.add(predicate, sig)
+                self._place(predicate)
+        return predicate not in self._dominators
+
+    def remove(self, predicate: str) -> None:
+        """Remove `predicate`; raises ValueError if it is not a member."""
+        if predicate not in self._members:
+            raise ValueError(f"{predicate!r} is not in the set")
+        del self._members[predicate]
+        self._index.discard(predicate)
+        self.errors.pop(predicate, None)
+        self._prepared.pop(predicate, None)
+        for stronger in self._dominators.pop(predicate, ()):
+            self._dominated[stronger].discard(predicate)
+        released = []
+        for weaker in self._dominated.pop(predicate, ()):
+            stronger = self._dominators[weaker]
+            stronger.discard(predicate)
+            if not stronger:
+                del self._dominators[weaker]
+                released.append(weaker)
+        if released:
+            rank = {p: i for i, p in enumerate(self._members)}
+            for weaker in sorted(released, key=rank.__getitem__):
+                self._place(weaker)
+
+    def update(self, predicates: Iterable[str]) -> None:
+        for p in predicates:
+            self.add(p)
+
+    def sync(self, predicates: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """Make the members exactly `predicates`; return the (added, removed) predicates."""
+        wanted = dict.fromkeys(predicates)
+        removed = [p for p in self._members if p not in wanted]
+        for p in removed:
+            self.remove(p)
+        added = [p for p in wanted if p not in self._members]
+        self.update(added)
+        debug('> InvariantSet sync: %d added, %d removed, %d comparisons so far',
+              len(added), len(removed), self.comparisons)
+        return added, removed
+
+    # ---- maintenance ----
+
+    def _prepare(self, predicate: str) -> PreparedPredicate:
+        prepared = self._prepared.get(predicate)
+        if prepared is None:
+            prepared = self._prepared[predicate] = self._comparator.prepare(predicate)
+        return prepared
+
+    def _signature(self, predicate: str) -> Optional[FrozenSet[str]]:
+        ast = self._prepare(predicate).ast
+        sig = signature(ast)
+        if sig is None and self.engine != "light":
+            sig = solver_signature(ast, getattr(self._comparator, "verdict_cache", None))
+        return sig
+
+    def _outcome(self, p1: str, p2: str) -> Outcome:
+        """Verdict of (p1, p2), from a stored edge if there is one."""
+        outcome = self._outcomes.get((p1, p2))
+        if outcome is not None:
+            return outcome
+        outcome = self._outcomes.get((p2, p1))
+        if outcome is not None:
+            return _REVERSED[outcome]
+        self.comparisons += 1
+        try:
+            outcome = Outcome(self._comparator.compare(self._prepare(p1), self._prepare(p2)))
+        except Exception as e:
+            debug('> Could not compare %r and %r: %s', p1, p2, e)
+            outcome = Outcome.INCOMPARABLE
+        if outcome is not Outcome.UNKNOWN:  # a budget may not run out next time
+            self._outcomes[(p1, p2)] = outcome
+        return outcome
+
+    def _candidates(self, predicate: str) -> List[str]:
+        """Current maxima that might be comparable with `predicate`."""
+        candidates = self._index.related(self._index.signature(predicate))
+        return sorted(m for m in candidates if m != predicate and m not in self._dominators)
+
+    def _link(self, stronger: str, weaker: str) -> None:
+        self._dominators.setdefault(weaker, set()).add(stronger)
+        self._dominated[stronger].add(weaker)
+
+    def _place(self, predicate: str) -> None:
+        """Compare a member that no member is known to dominate with the maxima it may relate to."""
+        weaker = []
+        for m in self._candidates(predicate):
+            outcome = self._outcome(m, predicate)
+            if outcome is Outcome.FIRST_STRONGER:
+                self._link(m, predicate)
+                return
+            if outcome is Outcome.SECOND_STRONGER:
+                weaker.append(m)
+        for m in weaker:
+            self._link(predicate, m)
+
+    # ---- persistence ----
+
+    def save(self, path: os.PathLike) -> None:
+        """Write the set to `path` as JSON (edges between current members only)."""
+        data = {
+            "format": FORMAT,
+            "engine": self.engine,
+            "members": list(self._members),
+            "signatures": {p: _keys(self._index.signature(p)) for p in self._members if p in self._index},
+            "errors": self.errors,
+            "stronger_than": {p: sorted(s) for p, s in self._dominators.items()},
+            "outcomes": [[p1, p2, outcome.name] for (p1, p2), outcome in self._outcomes.items()
+                         if p1 in self._members and p2 in self._members],
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: os.PathLike, **comparator_kwargs) -> "InvariantSet":
+        """Read a set written by `save`; keyword arguments configure its comparator."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != FORMAT:
+            raise ValueError(f"{path}: not an InvariantSet file of format {FORMAT}")
+        self = cls(engine=data["engine"], **comparator_kwargs)
+        self._members = dict.fromkeys(data["members"])
+        for p, sig in data["signatures"].items():
+            self._index.add(p, None if sig is None else frozenset(sig))
+        self.errors = dict(data["errors"])
+        for weaker, stronger in data["stronger_than"].items():
+            for s in stronger:
+                self._link(s, weaker)
+        self._outcomes = {(p1, p2): Outcome[name] for p1, p2, name in data["outcomes"]}
+        return self
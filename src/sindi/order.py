@@ -0,0 +1,184 @@
+# src/sindi/order.py
+"""
+The implication order of a set of predicates.
+
+`implication_matrix(predicates, engine=...)` computes, for every ordered
+pair, whether one predicate implies the other. It does not run the N * (N - 1)
+implication checks of the naive matrix:
+
+  - predicates with the same normalized AST are merged up front (union-find);
+  - pairs that `symbols.SymbolIndex` shows cannot be related (disjoint atoms,
+    both sides satisfiable and falsifiable) are never checked;
+  - a known implication is closed transitively at once (a -> b and b -> c
+    give a -> c for every predecessor of a and successor of c);
+  - a known non-implication rules out the pairs that would contradict it
+    (if x does not imply y, no a with x -> a can imply a b with b -> y).
+
+Only the pairs left undecided reach the comparator. Equivalences the
+solver finds are merged like syntactic ones. The resulting `ImplicationOrder`
+holds the full matrix, the equivalence classes, the Hasse diagram
+(transitive reduction) of the classes and the number of checks actually run.
+
+The inference assumes the engine's answers are consistent (a preorder). An
+engine whose answers contradict each other gets the first answer it gave.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+from .batch import BATCH_ENGINES, _make_comparator
+from .prepared import PreparedPredicate
+from .symbols import SymbolIndex, solver_signature, signature
+from .utils import debug
+
+__all__ = ["ImplicationOrder", "implication_matrix"]
+
+
+class ImplicationOrder:
+    """
+    Result of `implication_matrix`.
+
+      - predicates:   the input predicates, in order
+      - matrix[i][j]: whether predicates[i] implies predicates[j]
+      - classes:      equivalence classes (lists of predicate indices), by first occurrence
+      - class_of[i]:  index in `classes` of predicates[i]
+      - hasse:        (a, b) class-index edges of the transitive reduction; a is strictly stronger
+      - comparisons:  engine calls actually made; `naive_comparisons` is N * (N - 1)
+    """
+
+    __slots__ = ("predicates", "matrix", "classes", "class_of", "hasse", "comparisons")
+
+    def __init__(self, predicates: List[str], matrix: List[List[bool]], classes: List[List[int]],
+                 class_of: List[int], hasse: List[Tuple[int, int]], comparisons: int):
+        self.predicates = predicates
+        self.matrix = matrix
+        self.classes = classes
+        self.class_of = class_of
+        self.hasse = hasse
+        self.comparisons = comparisons
+
+    @property
+    def naive_comparisons(self) -> int:
+        n = len(self.predicates)
+        return n * (n - 1)
+
+    def implies(self, i: int, j: int) -> bool:
+        return self.matrix[i][j]
+
+    def __repr__(self) -> str:
+        return (f"ImplicationOrder({len(self.predicates)} predicates, {len(self.classes)} classes, "
+                f"{len(self.hasse)} Hasse edges, {self.comparisons}/{self.naive_comparisons} comparisons)")
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _union(parent: List[int], i: int, j: int) -> None:
+    i, j = _find(parent, i), _find(parent, j)
+    if i != j:
+        parent[max(i, j)] = min(i, j)  # the root stays the earliest member
+
+
+class _Closure:
+    """Implications among k nodes, kept transitively closed; refutations checked on demand."""
+
+    def __init__(self, k: int):
+        self.up: List[Set[int]] = [{i} for i in range(k)]    # nodes i implies
+        self.down: List[Set[int]] = [{i} for i in range(k)]  # nodes implying i
+        self.refuted: Set[Tuple[int, int]] = set()
+
+    def known(self, i: int, j: int):
+        """True / False if (i -> j) follows from what is known, else None."""
+        if j in self.up[i]:
+            return True
+        if (i, j) in self.refuted:
+            return False
+        refuted = self.refuted
+        if refuted and any((x, y) in refuted for x in self.down[i] for y in self.up[j]):
+            return False
+        return None
+
+    def add(self, i: int, j: int, holds: bool) -> None:
+        if not holds:
+            self.refuted.add((i, j))
+            return
+        sources, targets = list(self.down[i]), list(self.up[j])
+        for a in sources:
+            self.up[a].update(targets)
+        for b in targets:
+            self.down[b].update(sources)
+
+
+def implication_matrix(predicates: Iterable[Union[str, PreparedPredicate]], engine: str = "sympy",
+                       **comparator_kwargs) -> ImplicationOrder:
+    """
+    Implication order of `predicates` (see the module docstring). `engine` is
+    one of `batch.BATCH_ENGINES`; other keyword arguments configure the
+    comparator (simplification settings, ...). Raises ValueError for an
+    unknown engine or a predicate that does not parse.
+    """
+    if engine not in BATCH_ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; expected one of {', '.join(BATCH_ENGINES)}")
+    comparator = _make_comparator(engine, comparator_kwargs)
+    texts = [p.text if isinstance(p, PreparedPredicate) else p for p in predicates]
+    n = len(texts)
+
+    # Syntactic dedupe: one node per distinct normalized AST.
+    node_of: List[int] = []
+    nodes: List[PreparedPredicate] = []
+    by_ast: Dict[object, int] = {}
+    for text in texts:
+        prepared = comparator.prepare(text)
+        node = by_ast.setdefault(prepared.ast, len(nodes))
+        if node == len(nodes):
+            nodes.append(prepared)
+        node_of.append(node)
+    k = len(nodes)
+
+    closure = _Closure(k)
+    index = SymbolIndex()
+    verdict_cache = getattr(comparator, "verdict_cache", None)
+    comparisons = 0
+    for j, node in enumerate(nodes):
+        sig = signature(node.ast)
+        if sig is None and engine != "light":
+            sig = solver_signature(node.ast, verdict_cache)
+        # Against the related earlier nodes, latest first: in a chain, the neighbour decides the rest.
+        for i in sorted(index.related(sig), reverse=True):
+            for a, b in ((j, i), (i, j)):
+                if closure.known(a, b) is None:
+                    comparisons += 1
+                    closure.add(a, b, bool(comparator.implies(nodes[a], nodes[b])))
+        index.add(j, sig)
+    debug('> Implication order: %d predicates, %d distinct, %d/%d comparisons',
+          n, k, comparisons, n * (n - 1))
+
+    holds = [[j in closure.up[i] for j in range(k)] for i in range(k)]
+    parent = list(range(k))
+    for i in range(k):
+        for j in closure.up[i]:
+            if j > i and holds[j][i]:
+                _union(parent, i, j)
+
+    class_index: Dict[int, int] = {}
+    classes: List[List[int]] = []
+    class_of: List[int] = []
+    for p, node in enumerate(node_of):
+        c = class_index.setdefault(_find(parent, node), len(classes))
+        if c == len(classes):
+            classes.append([])
+        classes[c].append(p)
+        class_of.append(c)
+
+    # Transitive reduction of the strict order between classes.
+    reps = [node_of[members[0]] for members in classes]
+    weaker = [{b for b, rb in enumerate(reps) if b != a and holds[ra][rb]} for a, ra in enumerate(reps)]
+    hasse = [(a, b) for a in range(len(reps)) for b in sorted(weaker[a])
+             if not any(b in weaker[c] for c in weaker[a] if c != b)]
+
+    matrix = [[holds[node_of[p]][node_of[q]] for q in range(n)] for p in range(n)]
+    return ImplicationOrder(texts, matrix, classes, class_of, hasse, comparisons)
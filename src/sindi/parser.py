@@ -1,4 +1,8 @@
-from typing import List, Tuple
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .tokenizer import TokenSlice
 #from predi.config import debug_print
 
 
@@ -6,12 +10,128 @@ class ASTNode:
     def __init__(self, value: str, children: List['ASTNode'] = None):
         self.value = value
         self.children = children if children is not None else []
+        # Decided once from value/arity (see `node_kind`); a caller that edits
+        # `value` or `children` in place calls `reclassify` afterwards.
+        self.kind, self.literal = node_kind(value, len(self.children))
+
+    def reclassify(self) -> None:
+        """Recompute `kind` and `literal` after `value` or `children` changed."""
+        self.kind, self.literal = node_kind(self.value, len(self.children))
 
     def __repr__(self):
         return f"ASTNode(value='{self.value}', children={self.children})"
 
+
+# ---- Node kinds ----
+# What a node is, decided once per distinct (value, arity) by `node_kind`
+# instead of by string tests at every use site.
+LITERAL_INT, LITERAL_BOOL, LITERAL_FLOAT, IDENTIFIER, MEMBER, INDEX, CALL, UNARY, BINARY_OP = range(9)
+KIND_NAMES = ('literal-int', 'literal-bool', 'literal-float', 'identifier', 'member', 'index', 'call',
+              'unary', 'binary-op')
+UNARY_OPERATORS = frozenset(('!', '+', '-'))
+BINARY_OPERATORS = frozenset(('&&', '||', '==', '!=', '>', '<', '>=', '<=', '+', '-', '*', '/', '%', '&'))
+
+
+@lru_cache(maxsize=1 << 16)
+def _classify(value: str, arity: int) -> Tuple[int, Union[int, float, bool, None]]:
+    if arity:
+        if arity == 1 and value in UNARY_OPERATORS:
+            return UNARY, None
+        if value in BINARY_OPERATORS:
+            return BINARY_OP, None
+    else:
+        try:
+            return LITERAL_INT, int(value)
+        except ValueError:
+            pass
+        lowered = value.lower()
+        if lowered.startswith('0x'):  # bytes / address literals
+            try:
+                return LITERAL_INT, int(value, 16)
+            except ValueError:
+                pass
+        if lowered in ('true', 'false'):
+            return LITERAL_BOOL, lowered == 'true'
+        if '.' in value:
+            try:
+                return LITERAL_FLOAT, float(value)
+            except ValueError:
+                pass
+    # Postfix forms fold into the value (see Parser): the last one decides.
+    if value.endswith('()'):
+        return CALL, None
+    if value.endswith('[]'):
+        return INDEX, None
+    if '.' in value:
+        return MEMBER, None
+    return IDENTIFIER, None
+
+
+def node_kind(value: str, arity: int) -> Tuple[int, Union[int, float, bool, None]]:
+    """
+    (kind, literal) of a node with this value and number of children.
+    `literal` is the parsed int / float / bool for literal kinds, else None.
+    """
+    return _classify(value, arity if arity < 2 else 2)
+
+
+# ---- Operator tables (lowest to highest binding power) ----
+# All binary operators are left-associative.
+BINARY_PRECEDENCE = {
+    'AND': 1, 'OR': 1,
+    'EQUAL': 2, 'NOT_EQUAL': 2,
+    'GREATER': 3, 'LESS': 3, 'GREATER_EQUAL': 3, 'LESS_EQUAL': 3,
+    'PLUS': 4, 'MINUS': 4,
+    'MULTIPLY': 5, 'DIVIDE': 5, 'MODULUS': 5, 'BITWISE_AND': 5,
+}
+# Prefix operators bind tighter than any binary operator (they apply to a factor).
+PREFIX_OPERATORS = {'NOT': '!', 'PLUS': '+', 'MINUS': '-'}
+_PREFIX = 0
+
+# Leaves that accept .member / [index] / (args) postfixes, and those that do not.
+_POSTFIX_LEAVES = frozenset(('IDENTIFIER', 'MSG_SENDER', 'MSG_ORIGIN', 'INTEGER', 'FLOAT', 'SCIENTIFIC'))
+_PLAIN_LEAVES = frozenset(('TRUE', 'FALSE', 'ADDRESS_LITERAL', 'BYTES_LITERAL'))
+_LEAVES = _POSTFIX_LEAVES | _PLAIN_LEAVES
+
+# Kinds of (sub)expression frames: what encloses the expression being parsed.
+_TOP, _PAREN, _INDEX, _CALL = range(4)
+
+
+def _expect(tokens: Sequence[Tuple[str, str]], position: int, expected_tag: str) -> Tuple[str, str]:
+    if position >= len(tokens):
+        raise ValueError(f"Unexpected end of input, expected {expected_tag}")
+    token = tokens[position]
+    if token[1] != expected_tag:
+        raise ValueError(f"Expected token {expected_tag} but got {token[1]} at position {position}")
+    return token
+
+
+def _reduce(operands: List[ASTNode], operators: List[Tuple[int, str]], min_precedence: int) -> None:
+    """Pop binary operators of at least `min_precedence` into left-associative nodes."""
+    while operators and operators[-1][0] >= min_precedence:
+        op = operators.pop()[1]
+        right = operands.pop()
+        operands[-1] = ASTNode(op, [operands[-1], right])
+
+
 class Parser:
-    def __init__(self, tokens: List[Tuple[str, str]]):
+    """
+    Table-driven operator-precedence (Pratt-style) parser.
+
+    Precedence, from loosest to tightest:
+        && ||  <  == !=  <  > < >= <=  <  + -  <  * / % &  <  prefix ! + -  <  postfix
+    Postfix forms on identifiers/numbers fold into the node value:
+        a.b  -> 'a.b' (keeps a's children), a[i] -> 'a[]' [i], f(x, y) -> 'f()' [x, y]
+
+    Parsing is iterative: parentheses, index expressions and call arguments push
+    an explicit frame instead of recursing, so long chains such as
+    `x == 0 || x == 1 || ...` or deep nesting are not bounded by Python's
+    recursion limit and parse in linear time.
+    """
+
+    def __init__(self, tokens: Sequence[Tuple[str, str]]):
+        # Any indexable sequence of (value, tag) pairs works, e.g. the lists
+        # from Tokenizer.tokenize or a TokenSlice from Tokenizer.tokenize_corpus.
         self.tokens = tokens
         self.position = 0
 
@@ -20,154 +140,298 @@ class Parser:
         return self.expression()
 
     def consume(self, expected_tag: str) -> Tuple[str, str]:
-        if self.position >= len(self.tokens):
-            raise ValueError(f"Unexpected end of input, expected {expected_tag}")
-        token = self.tokens[self.position]
-        if token[1] != expected_tag:
-            raise ValueError(f"Expected token {expected_tag} but got {token[1]} at position {self.position}")
+        token = _expect(self.tokens, self.position, expected_tag)
         self.position += 1
         return token
 
     def expression(self) -> ASTNode:
-        node = self.logical_term()
-        #debug_print(f"Parsed term: {node}")
-
-        while self.position < len(self.tokens) and self.tokens[self.position][1] in ('AND', 'OR'):
-            operator = self.tokens[self.position]
-            #debug_print(f"Parsing operator in expression: {operator}")
-            self.position += 1
-            right = self.logical_term()
-            node = ASTNode(operator[0], [node, right])
-            #debug_print(f"Parsed expression with operator: {node}")
-
-        return node
-
-    def logical_term(self) -> ASTNode:
-        node = self.equality()
-        #debug_print(f"Parsed equality: {node}")
-
-        while self.position < len(self.tokens) and self.tokens[self.position][1] in ('EQUAL', 'NOT_EQUAL'):
-            operator = self.tokens[self.position]
-            #debug_print(f"Parsing operator in logical term: {operator}")
-            self.position += 1
-            right = self.equality()
-            node = ASTNode(operator[0], [node, right])
-            #debug_print(f"Parsed logical term with operator: {node}")
-
-        return node
-
-    def equality(self) -> ASTNode:
-        node = self.relational()
-        #debug_print(f"Parsed relational: {node}")
-
-        while self.position < len(self.tokens) and self.tokens[self.position][1] in ('GREATER', 'LESS', 'GREATER_EQUAL', 'LESS_EQUAL'):
-            operator = self.tokens[self.position]
-            #debug_print(f"Parsing operator in equality: {operator}")
-            self.position += 1
-            right = self.relational()
-            node = ASTNode(operator[0], [node, right])
-            #debug_print(f"Parsed equality with operator: {node}")
-
-        return node
-
-    def relational(self) -> ASTNode:
-        node = self.term()
-        #debug_print(f"Parsed term in relational: {node}")
-
-        while self.position < len(self.tokens) and self.tokens[self.position][1] in ('PLUS', 'MINUS'):
-            operator = self.tokens[self.position]
-            #debug_print(f"Parsing operator in relational: {operator}")
-            self.position += 1
-            right = self.term()
-            node = ASTNode(operator[0], [node, right])
-            #debug_print(f"Parsed relational with operator: {node}")
-
-        return node
-
-    def term(self) -> ASTNode:
-        node = self.factor()
-        #debug_print(f"Parsed factor in term: {node}")
-
-        while self.position < len(self.tokens) and self.tokens[self.position][1] in ('MULTIPLY', 'DIVIDE', 'MODULUS', 'BITWISE_AND'):
-            operator = self.tokens[self.position]
-            #debug_print(f"Parsing operator in term: {operator}")
-            self.position += 1
-            right = self.factor()
-            node = ASTNode(operator[0], [node, right])
-            #debug_print(f"Parsed term with operator: {node}")
-
-        return node
-
-    def factor(self) -> ASTNode:
-        if self.position >= len(self.tokens):
-            raise ValueError("Unexpected end of input")
-        token = self.tokens[self.position]
-        if token[1] in ('TRUE', 'FALSE'):
-            self.position += 1
-            return ASTNode(token[0])
-        if token[1] == 'ADDRESS_LITERAL':
-            self.position += 1
-            return ASTNode(token[0])
-        if token[1] == 'BYTES_LITERAL':
-            self.position += 1
-            return ASTNode(token[0])
-        if token[1] == 'LPAREN':
-            self.position += 1
-            node = self.expression()
-            self.consume('RPAREN')
-            return node
-        elif token[1] in ('IDENTIFIER', 'MSG_SENDER', 'MSG_ORIGIN', 'INTEGER', 'FLOAT', 'SCIENTIFIC'):
-            self.position += 1
-            node = ASTNode(token[0])
-            return self.postfix(node)
-        elif token[1] == 'NOT':
-            self.position += 1
-            node = self.factor()
-            node = ASTNode('!', [node])
-            return node
-        elif token[1] in ('PLUS', 'MINUS'):
-            self.position += 1
-            node = self.factor()
-            node = ASTNode(token[0], [node])
-            return node
-        raise ValueError(f"Unexpected token {token[1]} at position {self.position}")
-
-    def postfix(self, node: ASTNode) -> ASTNode:
-        while self.position < len(self.tokens) and self.tokens[self.position][1] in ('DOT', 'LBRACKET', 'LPAREN'):
-            token = self.tokens[self.position]
-
-            if token[1] == 'DOT':
-                self.position += 1
-                member_token = self.consume('IDENTIFIER')
-                # Important fix: preserve indexing clearly
-                node = ASTNode(f"{node.value}.{member_token[0]}", node.children)
-            elif token[1] == 'LBRACKET':
-                self.position += 1
-                index_node = self.expression()
-                self.consume('RBRACKET')
-                node = ASTNode(f"{node.value}[]", [index_node])
-            elif token[1] == 'LPAREN':
-                self.position += 1
-                args = []
-                while self.position < len(self.tokens) and self.tokens[self.position][1] != 'RPAREN':
-                    args.append(self.expression())
-                    if self.position < len(self.tokens) and self.tokens[self.position][1] == 'COMMA':
-                        self.position += 1
-                self.consume('RPAREN')
-                node = ASTNode(f"{node.value}()", args)
-        return node
-
-
-    def function_call(self, token: Tuple[str, str]) -> ASTNode:
-        function_name = token[0]
-        self.position += 1  # Consume FUNCTION_CALL token
-        self.consume('LPAREN')
-        args = []
-        while self.position < len(self.tokens) and self.tokens[self.position][1] != 'RPAREN':
-            args.append(self.expression())
-            if self.position < len(self.tokens) and self.tokens[self.position][1] == 'COMMA':
-                self.position += 1
-        self.consume('RPAREN')
-        node = ASTNode(function_name, args)
-        #debug_print(f"Parsed function call: {node}")
-        return node
\ No newline at end of file
+        """Parse one expression starting at `self.position` (trailing tokens are left unread)."""
+        tokens = self.tokens
+        pos = self.position
+        # Tag lookahead with an end-of-input sentinel, so no bounds checks below.
+        if isinstance(tokens, TokenSlice):
+            tags = tokens.tags()
+        else:
+            tags = [token[1] for token in tokens]
+        tags.append(None)
+
+        # The frame being filled; enclosing frames are saved on `frames`.
+        kind, base, args = _TOP, None, None
+        operands: List[ASTNode] = []
+        operators: List[Tuple[int, str]] = []
+        frames = []
+
+        while True:
+            # ---- Operand: prefix operators and '(' until a leaf ----
+            tag = tags[pos]
+            while tag not in _LEAVES:
+                if tag == 'LPAREN':
+                    frames.append((kind, base, args, operands, operators))
+                    kind, base, args = _PAREN, None, None
+                    operands, operators = [], []
+                elif tag in PREFIX_OPERATORS:
+                    operators.append((_PREFIX, PREFIX_OPERATORS[tag]))
+                elif tag is None:
+                    raise ValueError("Unexpected end of input")
+                else:
+                    raise ValueError(f"Unexpected token {tag} at position {pos}")
+                pos += 1
+                tag = tags[pos]
+            node = ASTNode(tokens[pos][0])
+            pos += 1
+            postfix = tag in _POSTFIX_LEAVES
+
+            # ---- After a factor: postfixes, prefixes, then a binary operator or
+            # the end of the current frame (which may close several frames) ----
+            while True:
+                if postfix:
+                    tag = tags[pos]
+                    while tag == 'DOT':
+                        member = _expect(tokens, pos + 1, 'IDENTIFIER')[0]
+                        node = ASTNode(f"{node.value}.{member}", node.children)
+                        pos += 2
+                        tag = tags[pos]
+                    if tag == 'LBRACKET':
+                        frames.append((kind, base, args, operands, operators))
+                        kind, base, args = _INDEX, node, None
+                        operands, operators = [], []
+                        pos += 1
+                        break
+                    if tag == 'LPAREN':
+                        pos += 1
+                        if tags[pos] != 'RPAREN' and tags[pos] is not None:
+                            frames.append((kind, base, args, operands, operators))
+                            kind, base, args = _CALL, node, []
+                            operands, operators = [], []
+                            break
+                        _expect(tokens, pos, 'RPAREN')
+                        node = ASTNode(f"{node.value}()", [])
+                        pos += 1
+                        continue
+
+                # Factor complete: apply pending prefix operators (innermost first).
+                while operators and operators[-1][0] == _PREFIX:
+                    node = ASTNode(operators.pop()[1], [node])
+                operands.append(node)
+
+                precedence = BINARY_PRECEDENCE.get(tags[pos])
+                if precedence is not None:
+                    if operators and operators[-1][0] >= precedence:
+                        _reduce(operands, operators, precedence)
+                    operators.append((precedence, tokens[pos][0]))
+                    pos += 1
+                    break
+
+                # No binary operator follows: the current frame's expression is complete.
+                _reduce(operands, operators, _PREFIX + 1)
+                result = operands[0]
+                if kind == _TOP:
+                    self.position = pos
+                    return result
+                if kind == _CALL:
+                    args.append(result)
+                    if tags[pos] == 'COMMA':
+                        pos += 1
+                    if tags[pos] != 'RPAREN' and tags[pos] is not None:
+                        operands, operators = [], []  # next argument
+                        break
+                    _expect(tokens, pos, 'RPAREN')
+                    node = ASTNode(f"{base.value}()", args)
+                    postfix = True
+                elif kind == _INDEX:
+                    _expect(tokens, pos, 'RBRACKET')
+                    node = ASTNode(f"{base.value}[]", [result])
+                    postfix = True
+                else:  # _PAREN: no postfix after a parenthesized expression
+                    _expect(tokens, pos, 'RPAREN')
+                    node = result
+                    postfix = False
+                pos += 1
+                kind, base, args, operands, operators = frames.pop()
+
+    @classmethod
+    def parse_corpus(cls, corpus: Iterable[Optional[Sequence[Tuple[str, str]]]]) -> 'ASTArena':
+        """
+        Parse every predicate of a token corpus (e.g. from `Tokenizer.tokenize_corpus`)
+        into one `ASTArena`. Predicates that fail to lex or parse keep their index,
+        get an empty tree and an entry in `arena.errors`.
+        """
+        arena = ASTArena()
+        lex_errors = getattr(corpus, 'errors', {})
+        for i, tokens in enumerate(corpus):
+            try:
+                if tokens is None:
+                    raise ValueError(lex_errors.get(i, "Predicate could not be tokenized"))
+                arena.add(cls(tokens).parse())
+            except ValueError as e:
+                arena.add(None)
+                arena.errors[i] = str(e)
+        return arena
+
+
+# ---- Flat AST storage ----
+
+# Operator node values get a small opcode so traversals can dispatch on an int;
+# every other node (identifiers, literals, calls, index/member access) is OTHER.
+OPCODES = ('', '&&', '||', '!', '==', '!=', '>', '<', '>=', '<=', '+', '-', '*', '/', '%', '&')
+OP_OTHER = 0
+_OPCODE_IDS = {op: i for i, op in enumerate(OPCODES) if op}
+
+
+class ArenaNode:
+    """
+    Read-only view of one node in an `ASTArena`.
+
+    Exposes `value` / `children` like `ASTNode` (children are built on access),
+    so code that only reads trees - `ASTRewriter.normalize`,
+    `comparator_light.normalize_ast`, `Comparator._to_sympy_expr` - accepts it
+    unchanged. Use `ASTArena.to_ast` for a mutable copy.
+    """
+    __slots__ = ('arena', 'index')
+
+    def __init__(self, arena: 'ASTArena', index: int):
+        self.arena = arena
+        self.index = index
+
+    @property
+    def value(self) -> str:
+        return self.arena.values[self.arena.value_ids[self.index]]
+
+    @property
+    def op(self) -> int:
+        return self.arena.ops[self.index]
+
+    @property
+    def kind(self) -> int:
+        return node_kind(self.value, self.arena.child_count[self.index])[0]
+
+    @property
+    def literal(self) -> Union[int, float, bool, None]:
+        return node_kind(self.value, self.arena.child_count[self.index])[1]
+
+    @property
+    def children(self) -> List['ArenaNode']:
+        arena = self.arena
+        first = arena.first_child[self.index]
+        return [ArenaNode(arena, k) for k in range(first, first + arena.child_count[self.index])]
+
+    def __eq__(self, other):
+        return isinstance(other, ArenaNode) and other.arena is self.arena and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.arena), self.index))
+
+    def __repr__(self):
+        return repr(self.arena.to_ast(self))
+
+
+class ASTArena:
+    """
+    Compact storage for the parse trees of a whole corpus of predicates.
+
+    Nodes live in parallel arrays indexed by node id:
+      - ops:         array('B') opcode (see `OPCODES`; OP_OTHER for non-operators)
+      - value_ids:   array('I') index into `values`, the interned node values
+      - first_child: array('I') id of the first child
+      - child_count: array('I') number of children; a node's children are the
+                     consecutive ids first_child .. first_child + child_count - 1
+      - roots:       array('I') root node id of each predicate
+    Trees are laid out breadth-first, so siblings are always adjacent.
+    Predicates added as None (see `Parser.parse_corpus`) have an empty-valued
+    root and an entry in `errors`.
+    """
+
+    def __init__(self, trees: Iterable[Optional[ASTNode]] = ()):
+        self.ops = array('B')
+        self.value_ids = array('I')
+        self.first_child = array('I')
+        self.child_count = array('I')
+        self.roots = array('I')
+        self.values: List[str] = []
+        self._value_index: Dict[str, int] = {}
+        self.errors: Dict[int, str] = {}
+        for tree in trees:
+            self.add(tree)
+
+    def _value_id(self, value: str) -> int:
+        vid = self._value_index.get(value)
+        if vid is None:
+            vid = self._value_index[value] = len(self.values)
+            self.values.append(value)
+        return vid
+
+    def add(self, tree: Optional[ASTNode]) -> int:
+        """Append one tree (`ASTNode` or anything with `value`/`children`); return its predicate index."""
+        ops, value_ids, first_child, child_count = self.ops, self.value_ids, self.first_child, self.child_count
+        value_id, opcode = self._value_id, _OPCODE_IDS.get
+        root = len(ops)
+        self.roots.append(root)
+        if tree is None:
+            tree = ASTNode('')
+        queue = [tree]
+        ops.append(opcode(tree.value, OP_OTHER))
+        value_ids.append(value_id(tree.value))
+        first_child.append(0)
+        child_count.append(0)
+        k = root
+        for node in queue:  # `queue` grows while we walk it: breadth-first order
+            kids = node.children
+            if kids:
+                first_child[k] = len(ops)
+                child_count[k] = len(kids)
+                for child in kids:
+                    ops.append(opcode(child.value, OP_OTHER))
+                    value_ids.append(value_id(child.value))
+                    first_child.append(0)
+                    child_count.append(0)
+                queue.extend(kids)
+            k += 1
+        return len(self.roots) - 1
+
+    def __len__(self) -> int:
+        return len(self.roots)
+
+    def __getitem__(self, i: int) -> ArenaNode:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("predicate index out of range")
+        if i in self.errors:
+            raise ValueError(self.errors[i])
+        return ArenaNode(self, self.roots[i])
+
+    def __iter__(self):
+        # Predicates that failed to parse yield None instead of raising.
+        for i in range(len(self)):
+            yield self[i] if i not in self.errors else None
+
+    def span(self, i: int) -> range:
+        """Node ids of predicate i; breadth-first layout makes them one contiguous run."""
+        end = self.roots[i + 1] if i + 1 < len(self.roots) else len(self.ops)
+        return range(self.roots[i], end)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.ops)
+
+    def nbytes(self) -> int:
+        """Size of the node arrays plus the interned value strings."""
+        arrays = (self.ops, self.value_ids, self.first_child, self.child_count, self.roots)
+        return sum(a.itemsize * len(a) for a in arrays) + sum(len(v.encode('utf-8')) for v in self.values)
+
+    def to_ast(self, node) -> ASTNode:
+        """Rebuild a fresh `ASTNode` tree from a predicate index or an `ArenaNode`."""
+        k = node.index if isinstance(node, ArenaNode) else self.roots[node]
+        values, value_ids, first_child, child_count = self.values, self.value_ids, self.first_child, self.child_count
+        root = ASTNode(values[value_ids[k]])
+        stack = [(k, root)]
+        while stack:
+            k, out = stack.pop()
+            first = first_child[k]
+            for c in range(first, first + child_count[k]):
+                child = ASTNode(values[value_ids[c]])
+                out.children.append(child)
+                stack.append((c, child))
+            if out.children:
+                out.reclassify()
+        return root
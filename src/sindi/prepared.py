@@ -0,0 +1,69 @@
+# src/sindi/prepared.py
+"""
+Predicates prepared once for many comparisons.
+
+`Comparator.prepare` / `ComparatorRulesOnly.prepare` return a
+`PreparedPredicate`. Each pipeline stage (normalized AST, SymPy expression,
+simplified expression, Z3 term) is computed by the owning comparator the
+first time it is read and kept on the object, so comparing one predicate
+against N others pays its preprocessing once instead of N times.
+"""
+from __future__ import annotations
+
+__all__ = ["PreparedPredicate"]
+
+_UNSET = object()
+
+
+class PreparedPredicate:
+    """
+    A predicate string bound to the comparator that prepared it.
+
+    Stages are produced by the comparator's own methods (`_parse_predicate`,
+    `_to_sympy_expr`, `_simplify`, `_z3_form`); a comparator that has no
+    such stage (the rules-only one stops at the AST) raises ValueError.
+    """
+
+    __slots__ = ("text", "comparator", "_ast", "_sympy", "_simplified", "_z3")
+
+    def __init__(self, comparator, text: str):
+        self.text = text
+        self.comparator = comparator
+        self._ast = self._sympy = self._simplified = self._z3 = _UNSET
+
+    def __repr__(self) -> str:
+        return f"PreparedPredicate({self.text!r})"
+
+    def _stage(self, name: str):
+        fn = getattr(self.comparator, name, None)
+        if fn is None:
+            raise ValueError(f"{type(self.comparator).__name__} does not compute {name.strip('_')}")
+        return fn
+
+    @property
+    def ast(self):
+        """Rewritten, parsed and normalized AST (an interned `HNode`)."""
+        if self._ast is _UNSET:
+            self._ast = self._stage("_parse_predicate")(self.text)
+        return self._ast
+
+    @property
+    def sympy(self):
+        """SymPy expression of `ast`."""
+        if self._sympy is _UNSET:
+            self._sympy = self._stage("_to_sympy_expr")(self.ast)
+        return self._sympy
+
+    @property
+    def simplified(self):
+        """`sympy` after simplification."""
+        if self._simplified is _UNSET:
+            self._simplified = self._stage("_simplify")(self.sympy)
+        return self._simplified
+
+    @property
+    def z3(self):
+        """Z3 term: of `simplified`, or of `ast` directly under the z3 engine."""
+        if self._z3 is _UNSET:
+            self._z3 = self._stage("_z3_form")(self)
+        return self._z3
@@ -0,0 +1,171 @@
+# src/sindi/reduce.py
+"""
+Reduce a set of predicates to its strongest members.
+
+`strongest(predicates, engine=...)` keeps every predicate that no other
+predicate is strictly stronger than, and says why each other one was
+removed. It keeps a running antichain of the current maxima and compares
+each new predicate only against those: a predicate weaker than a maximum is
+dropped at once, and a predicate stronger than some maxima replaces them.
+Maxima that `symbols.SymbolIndex` shows cannot be related to the new
+predicate are skipped without a comparison.
+
+Like `order`, this assumes the engine's answers are consistent (a
+preorder); only then is the result the same as comparing every pair.
+Neither the light rules nor the z3 engine's per-pair non-negativity domain
+guarantee that. With answers that are not transitive the result depends on
+the visiting order, and a predicate can be removed as weaker than one that
+is removed later.
+
+Candidates are visited strongest-looking first (`strength`, a syntactic
+guess), so the maxima are usually found early and later predicates need
+few comparisons. For consistent answers the guess only affects the number
+of comparisons, not the result.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, NamedTuple, Union
+
+from .batch import BATCH_ENGINES, _make_comparator
+from .hashcons import HNode
+from .prepared import PreparedPredicate
+from .symbols import SymbolIndex, signature, solver_signature
+from .utils import debug
+from .verdict import Outcome
+
+__all__ = ["Removal", "Reduction", "strongest", "strength"]
+
+# Guessed strength of relations: an equality pins a value, a strict bound
+# excludes one more point than a non-strict one, '!=' excludes just one.
+_RELATION_STRENGTH = {"==": 4.0, ">": 2.5, "<": 2.5, ">=": 2.0, "<=": 2.0, "!=": 1.0}
+
+
+class Removal(NamedTuple):
+    """Predicate `index` was removed: `reason` "weaker" or "equivalent" than predicate `by`."""
+    index: int
+    reason: str
+    by: int
+
+
+class Reduction:
+    """
+    Result of `strongest`.
+
+      - predicates: the input predicates, in order
+      - kept:       indices of the strongest predicates, in input order
+      - removed:    a `Removal` for every other predicate, in input order
+      - errors:     index -> "Type: message" for predicates that could not be
+                    parsed or compared (such a predicate is kept)
+      - comparisons: `compare` calls made
+    """
+
+    __slots__ = ("predicates", "kept", "removed", "errors", "comparisons")
+
+    def __init__(self, predicates: List[str], kept: List[int], removed: List[Removal],
+                 errors: Dict[int, str], comparisons: int):
+        self.predicates = predicates
+        self.kept = kept
+        self.removed = removed
+        self.errors = errors
+        self.comparisons = comparisons
+
+    @property
+    def kept_predicates(self) -> List[str]:
+        return [self.predicates[i] for i in self.kept]
+
+    def explain(self, removal: Removal) -> str:
+        """E.g. "weaker than 'x > 5'"."""
+        relation = "weaker than" if removal.reason == "weaker" else "equivalent to"
+        return f"{relation} {self.predicates[removal.by]!r}"
+
+    def __repr__(self) -> str:
+        return (f"Reduction({len(self.kept)} kept, {len(self.removed)} removed, "
+                f"{len(self.errors)} errors, {self.comparisons} comparisons)")
+
+
+def strength(node: HNode) -> float:
+    """Cheap syntactic guess of how strong a normalized predicate is (higher: stronger)."""
+    if node.value == "&&":
+        return sum(strength(c) for c in node.children)
+    if node.value == "||":
+        return min(strength(c) for c in node.children) / 2
+    return _RELATION_STRENGTH.get(node.value, 2.0)  # boolean atoms and negations
+
+
+def _error(e: Exception) -> str:
+    return f"{type(e).__name__}: {e}"
+
+
+def strongest(predicates: Iterable[Union[str, PreparedPredicate]], engine: str = "sympy",
+              keep_equivalent: bool = True, **comparator_kwargs) -> Reduction:
+    """
+    Strongest predicates of `predicates` (see the module docstring).
+
+    `engine` is one of `batch.BATCH_ENGINES`; other keyword arguments
+    configure the comparator. With `keep_equivalent=False`, only the first
+    of equivalent predicates is kept. A predicate that fails to parse or
+    compare is kept and reported in `errors`; a comparison that fails or
+    runs out of budget counts as incomparable.
+    """
+    if engine not in BATCH_ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; expected one of {', '.join(BATCH_ENGINES)}")
+    comparator = _make_comparator(engine, comparator_kwargs)
+    texts = [p.text if isinstance(p, PreparedPredicate) else p for p in predicates]
+
+    errors: Dict[int, str] = {}
+    prepared: Dict[int, PreparedPredicate] = {}
+    scores: Dict[int, float] = {}
+    signatures = {}
+    verdict_cache = getattr(comparator, "verdict_cache", None)
+    for i, text in enumerate(texts):
+        p = comparator.prepare(text)
+        try:
+            scores[i] = strength(p.ast)
+            signatures[i] = signature(p.ast)
+            if signatures[i] is None and engine != "light":
+                signatures[i] = solver_signature(p.ast, verdict_cache)
+        except Exception as e:
+            errors[i] = _error(e)
+            continue
+        prepared[i] = p
+
+    maxima: List[int] = []
+    index = SymbolIndex()  # of the maxima
+    removals: Dict[int, Removal] = {}
+    comparisons = 0
+    for c in sorted(prepared, key=lambda i: (-scores[i], i)):  # strongest-looking first
+        removal, replaced = None, {}
+        related = index.related(signatures[c])
+        for m in maxima:
+            if m not in related:
+                continue
+            comparisons += 1
+            try:
+                outcome = Outcome(comparator.compare(prepared[m], prepared[c]))
+            except Exception as e:
+                errors.setdefault(c, _error(e))
+                continue
+            if outcome is Outcome.FIRST_STRONGER:
+                removal = Removal(c, "weaker", m)
+                break
+            if outcome is Outcome.EQUIVALENT and not keep_equivalent:
+                if m < c:  # the earliest of equivalent predicates stays
+                    removal = Removal(c, "equivalent", m)
+                    break
+                replaced[m] = "equivalent"
+            if outcome is Outcome.SECOND_STRONGER:
+                replaced[m] = "weaker"
+        if removal is not None:
+            removals[c] = removal
+            continue
+        for m, reason in replaced.items():
+            removals[m] = Removal(m, reason, c)
+            index.discard(m)
+        maxima = [m for m in maxima if m not in replaced] + [c]
+        index.add(c, signatures[c])
+    debug('> Strongest: %d of %d predicates kept after %d comparisons',
+          len(texts) - len(removals), len(texts), comparisons)
+
+    kept = [i for i in range(len(texts)) if i not in removals]
+    removed = [removals[i] for i in sorted(removals)]
+    return Reduction(texts, kept, removed, errors, comparisons)
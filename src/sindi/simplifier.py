@@ -1,6 +1,6 @@
 import sympy as sp
 from typing import Union
-from .parser import ASTNode
+from .parser import ASTNode, LITERAL_INT, LITERAL_FLOAT, CALL, INDEX, MEMBER
 
 
 class Simplifier:
@@ -84,48 +84,28 @@ class Simplifier:
         # ---> END OF SUBTRACTION HANDLING <---
 
 
-        # Handle numbers (constants without children)
+        # Handle literals and plain names (nodes without children)
         # Placed after operator checks
         elif not node.children:
-            try:
-                # Use sp.Integer for whole numbers, sp.Float for decimals/scientific
-                if '.' in node.value or 'e' in node.value or 'E' in node.value:
-                     # Use Float for anything that looks like a float or scientific notation
-                     return sp.Float(node.value)
-                else:
-                    # Otherwise, assume integer
-                    return sp.Integer(int(node.value))
-            except ValueError:
-                # If it's not a number, treat as a symbol (variable name)
-                # Replace '.' typically found in Solidity state vars like 'owner.balance'
-                return sp.Symbol(node.value.replace('.', '_'))
-
-        # Handle function calls like balanceOf(to) or name()
-        # Checking for '()' might be fragile; consider a dedicated node type from parser if possible.
-        elif '(' in node.value and ')' in node.value: # Basic check for function call syntax in value
-             func_name = node.value.replace('()', '')
-             # Replace dots in function names if needed (e.g., token.balanceOf -> token_balanceOf)
-             safe_func_name = func_name.replace('.', '_')
-
-             # Proceed to treat as a function call
+            kind = node.kind
+            if kind == LITERAL_INT:
+                return sp.Integer(node.literal)
+            if kind == LITERAL_FLOAT:
+                return sp.Float(node.value)
+            # Anything else (names, booleans, argument-less calls) is a symbol.
+            # Replace '.' typically found in Solidity state vars like 'owner.balance'
+            return sp.Symbol(node.value.replace('.', '_'))
+
+        # Function calls like balanceOf(to), indexed access a[b] and member
+        # access on either (a[b].c): uninterpreted functions of the children.
+        elif node.kind in (CALL, INDEX, MEMBER):
+             if node.kind == INDEX and len(node.children) != 1:
+                  raise ValueError(f"Invalid structure for indexed access node: {node}")
+             # Replace dots in names (e.g., token.balanceOf -> token_balanceOf)
+             safe_name = node.value.replace('()', '').replace('[]', '').replace('.', '_')
              args = [self._to_sympy(child) for child in node.children]
-             # Use sp.Function for undefined functions
              # We assume Solidity functions are uninterpreted unless mapped specifically
-             return sp.Function(safe_func_name)(*args)
-
-        # Handle indexed access: a[b] or potentially a[b].c (parser dependent)
-        # This logic might need refinement based on exact AST structure for complex cases
-        elif '[]' in node.value: # Basic check for indexing syntax in value
-             # Simplistic handling: Treat array[index] as Function('array')(index)
-             base_name = node.value.replace('[]', '')
-             safe_base_name = base_name.replace('.', '_') # Handle cases like map.value[key] -> map_value[key]
-
-             # Ensure there is exactly one child representing the index
-             if len(node.children) == 1:
-                  index_arg = self._to_sympy(node.children[0])
-                  return sp.Function(safe_base_name)(index_arg)
-             else:
-                  raise ValueError(f"Invalid structure for indexed access node: {node}")
+             return sp.Function(safe_name)(*args)
 
         # --- Fallback for unknown node types ---
         # If none of the above matched, it's an unexpected structure.
@@ -0,0 +1,150 @@
+# src/sindi/symbols.py
+"""
+Free atoms of normalized predicates, and an index that uses them to skip
+pairs that cannot be related.
+
+An atom is what the comparators treat as a variable: an identifier (`x`),
+a member access (`msg.sender`), an indexed value (`balances[]`) or a call
+(`owner()`), named by its node `value`. Atoms inside an index or call count
+too (`balances[msg.sender]` mentions `balances[]` and `msg.sender`).
+
+Two satisfiable, not always true predicates that share no variable cannot
+imply each other. `signature` proves both properties for the predicates
+`comparator_light` can (relations between atoms and constants, and &&/||
+trees of them) and returns their atom keys: the coarse names under which
+atoms that are one solver symbol always coincide. `SymbolIndex` buckets
+predicates by those keys. A predicate without a signature might be
+unsatisfiable or valid, so the index treats it as related to everything;
+`solver_signature` settles that with two Z3 satisfiability checks instead.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, FrozenSet, Hashable, Optional, Set
+
+from .comparator_light import _atom_key, _contingency
+from .hashcons import HNode
+from .parser import CALL, IDENTIFIER, INDEX, MEMBER
+from .utils import debug
+
+__all__ = ["ATOM_KINDS", "atoms", "signature", "solver_signature", "could_relate", "SymbolIndex"]
+
+ATOM_KINDS = frozenset((IDENTIFIER, MEMBER, INDEX, CALL))
+
+# Z3 translator of `solver_signature` and the version its answers are cached
+# under, set on first use.
+_translator = None
+_cache_version = None
+
+
+def atoms(node: HNode) -> FrozenSet[str]:
+    """Names of the atoms in a normalized predicate."""
+    found = set()
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if n.kind in ATOM_KINDS:
+            found.add(n.value)
+        stack.extend(n.children)
+    return frozenset(found)
+
+
+def signature(node: HNode) -> Optional[FrozenSet[str]]:
+    """Atom keys of a predicate proven satisfiable and falsifiable, else None."""
+    contingency = _contingency(node)
+    if contingency is None or not (contingency[1] and contingency[2]):
+        return None
+    return contingency[0]
+
+
+def solver_signature(node: HNode, cache=None) -> Optional[FrozenSet[str]]:
+    """
+    For a predicate `signature` proves nothing about: the keys of its
+    symbols (`Z3Translator.symbols`) if Z3 finds it satisfiable and
+    falsifiable over non-negative atoms, and so over the reals too; else
+    None (also if Z3 cannot translate it). Imports Z3 on first use.
+    `cache`, a `VerdictCache`, keeps Z3's answer across runs.
+    """
+    global _translator, _cache_version
+    if _translator is None:
+        import z3
+        from . import __version__
+        from .z3_engine import Z3Translator
+        _cache_version = f"z3 contingency sindi {__version__} z3 {z3.get_version_string()}"
+        _translator = Z3Translator()
+    try:
+        contingent = None
+        if cache is not None:
+            from .verdict_cache import fingerprint
+            key = (_cache_version, fingerprint(node), fingerprint(node))
+            known = cache.get(*key)
+            contingent = None if known is None else known[0]
+        if contingent is None:
+            contingent = _translator.is_contingent(node)
+            if cache is not None:
+                cache.put(*key, contingent)
+        if not contingent:
+            return None
+        symbols = _translator.symbols(node)
+    except Exception as e:
+        debug('> No solver signature for %s: %s', node, e)
+        return None
+    return frozenset(_atom_key(s) if isinstance(s, HNode) else s for s in symbols)
+
+
+def could_relate(a: Optional[FrozenSet[str]], b: Optional[FrozenSet[str]]) -> bool:
+    """Whether predicates with signatures `a` and `b` may imply one another."""
+    return a is None or b is None or not a.isdisjoint(b)
+
+
+class SymbolIndex:
+    """
+    Items (predicate indices, texts, ...) bucketed by signature. `related`
+    answers which items could be related to a signature, without an engine.
+    """
+
+    def __init__(self):
+        self._signatures: Dict[Hashable, Optional[FrozenSet[str]]] = {}
+        self._buckets: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._wildcards: Set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._signatures
+
+    def signature(self, item: Hashable) -> Optional[FrozenSet[str]]:
+        return self._signatures[item]
+
+    def add(self, item: Hashable, sig: Optional[FrozenSet[str]]) -> None:
+        """Index `item` under `sig` (from `signature`; None: related to everything)."""
+        self.discard(item)
+        self._signatures[item] = sig
+        if sig is None:
+            self._wildcards.add(item)
+        else:
+            for key in sig:
+                self._buckets[key].add(item)
+
+    def discard(self, item: Hashable) -> None:
+        if item not in self._signatures:
+            return
+        sig = self._signatures.pop(item)
+        if sig is None:
+            self._wildcards.discard(item)
+            return
+        for key in sig:
+            bucket = self._buckets[key]
+            bucket.discard(item)
+            if not bucket:
+                del self._buckets[key]
+
+    def related(self, sig: Optional[FrozenSet[str]]) -> Set[Hashable]:
+        """Items that could imply or be implied by a predicate with signature `sig`."""
+        if sig is None:
+            return set(self._signatures)
+        found = set(self._wildcards)
+        for key in sig:
+            found.update(self._buckets.get(key, ()))
+        return found
@@ -1,61 +1,79 @@
 import re
-from typing import List, Tuple
+from array import array
+from decimal import Decimal
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+# Group name used in the master regex for patterns that carry no tag (whitespace).
+_SKIP = 'SKIP'
 
 class Tokenizer:
+    # Token patterns in priority order: at every position the first pattern that
+    # matches wins, exactly like trying them one by one. Sub-groups are named so
+    # they survive being merged into the single master regex below.
+    TOKEN_PATTERNS = [
+        (r'\bmsg\.sender\b', 'MSG_SENDER'),
+        (r'\bmsg\.origin\b', 'MSG_ORIGIN'),
+        (r'\brequire\b', 'REQUIRE'),
+        (r'==', 'EQUAL'),
+        (r'!=', 'NOT_EQUAL'),
+        (r'>=', 'GREATER_EQUAL'),
+        (r'<=', 'LESS_EQUAL'),
+        (r'>', 'GREATER'),
+        (r'<', 'LESS'),
+        (r'&&', 'AND'),
+        (r'\|\|', 'OR'),
+        (r'\!', 'NOT'),
+        (r'\&', 'BITWISE_AND'),
+        (r'\?', 'QUESTION'),
+        (r':', 'COLON'),
+        (r'\(', 'LPAREN'),
+        (r'\)', 'RPAREN'),
+        (r'\+', 'PLUS'),
+        (r'\-', 'MINUS'),
+        (r'\*', 'MULTIPLY'),
+        (r'\/', 'DIVIDE'),
+        (r'\%', 'MODULUS'),
+        (r'\.', 'DOT'),
+        (r',', 'COMMA'),
+        (r'=', 'ASSIGN'),
+        (r'\[', 'LBRACKET'),
+        (r'\]', 'RBRACKET'),
+        (r'\"[^\"]*\"', 'STRING_LITERAL'),
+
+        # --- Handle 10**k wei as one numeric token (fallback if string rewriter didn't run) ---
+        (r'(?i:\b10\s*\*\*\s*(?P<wei_exp>\d+)\s*wei\b)', 'WEI_POW10'),
+
+        # ---- Numbers (order matters: scientific before float/int) ----
+        (r'\b\d(?:_?\d)*(?:\.\d(?:_?\d)*)?[eE][+-]?\d+(?:_?\d)*\b', 'SCIENTIFIC'),
+        (r'\b\d(?:_?\d)*\.\d(?:_?\d)*\b', 'FLOAT'),
+        (r'\b\d(?:_?\d)*\b', 'INTEGER'),
+
+        (r'\btrue\b', 'TRUE'),
+        (r'\bfalse\b', 'FALSE'),
+        (r'0x[0-9a-fA-F]{40}', 'ADDRESS_LITERAL'),
+        (r'0x[0-9a-fA-F]+', 'BYTES_LITERAL'),
+        (r'\b(?P<time_num>\d(?:_?\d)*)\s*(?P<time_unit>seconds|minutes|hours|days|weeks)\b', 'TIME_UNIT'),
+        (r'[a-zA-Z_]\w*', 'IDENTIFIER'),
+        (r'\s+', None),
+    ]
+
+    TIME_UNITS = {
+        'seconds': 1,
+        'minutes': 60,
+        'hours': 3600,
+        'days': 86400,
+        'weeks': 604800,
+    }
+
+    # One alternation with a named group per tag; Python tries alternatives left
+    # to right, which preserves the priority order of TOKEN_PATTERNS.
+    _MASTER = re.compile('|'.join(
+        f'(?P<{tag or _SKIP}>{pattern})' for pattern, tag in TOKEN_PATTERNS
+    ))
+
     def __init__(self):
-        self.token_patterns = [
-            (r'\bmsg\.sender\b', 'MSG_SENDER'),
-            (r'\bmsg\.origin\b', 'MSG_ORIGIN'),
-            (r'\brequire\b', 'REQUIRE'),
-            (r'==', 'EQUAL'),
-            (r'!=', 'NOT_EQUAL'),
-            (r'>=', 'GREATER_EQUAL'),
-            (r'<=', 'LESS_EQUAL'),
-            (r'>', 'GREATER'),
-            (r'<', 'LESS'),
-            (r'&&', 'AND'),
-            (r'\|\|', 'OR'),
-            (r'\!', 'NOT'),
-            (r'\&', 'BITWISE_AND'),
-            (r'\?', 'QUESTION'),
-            (r':', 'COLON'),
-            (r'\(', 'LPAREN'),
-            (r'\)', 'RPAREN'),
-            (r'\+', 'PLUS'),
-            (r'\-', 'MINUS'),
-            (r'\*', 'MULTIPLY'),
-            (r'\/', 'DIVIDE'),
-            (r'\%', 'MODULUS'),
-            (r'\.', 'DOT'),
-            (r',', 'COMMA'),
-            (r'=', 'ASSIGN'),
-            (r'\[', 'LBRACKET'),
-            (r'\]', 'RBRACKET'),
-            (r'\"[^\"]*\"', 'STRING_LITERAL'),
-
-            # --- Handle 10**k wei as one numeric token (fallback if string rewriter didn't run) ---
-            (r'(?i)\b10\s*\*\*\s*(\d+)\s*wei\b', 'WEI_POW10'),
-
-            # ---- Numbers (order matters: scientific before float/int) ----
-            (r'\b\d(?:_?\d)*(?:\.\d(?:_?\d)*)?[eE][+-]?\d+(?:_?\d)*\b', 'SCIENTIFIC'),
-            (r'\b\d(?:_?\d)*\.\d(?:_?\d)*\b', 'FLOAT'),
-            (r'\b\d(?:_?\d)*\b', 'INTEGER'),
-
-            (r'\btrue\b', 'TRUE'),
-            (r'\bfalse\b', 'FALSE'),
-            (r'0x[0-9a-fA-F]{40}', 'ADDRESS_LITERAL'),
-            (r'0x[0-9a-fA-F]+', 'BYTES_LITERAL'),
-            (r'\b\d(?:_?\d)*\s*(seconds|minutes|hours|days|weeks)\b', 'TIME_UNIT'),
-            (r'[a-zA-Z_]\w*', 'IDENTIFIER'),
-            (r'\s+', None),
-        ]
-        self.time_units = {
-            'seconds': 1,
-            'minutes': 60,
-            'hours': 3600,
-            'days': 86400,
-            'weeks': 604800,
-        }
+        self.token_patterns = self.TOKEN_PATTERNS
+        self.time_units = self.TIME_UNITS
 
     def normalize(self, predicate: str) -> str:
         predicate = re.sub(r'\s+', '', predicate)
@@ -68,60 +86,236 @@ class Tokenizer:
 
     def tokenize(self, predicate: str) -> List[Tuple[str, str]]:
         tokens = []
+        append = tokens.append
+        match_at = self._MASTER.match
         position = 0
         length = len(predicate)
 
         while position < length:
-            match = None
-            for pattern, tag in self.token_patterns:
-                regex = re.compile(pattern)
-                match = regex.match(predicate, position)
-                if match:
-                    if tag:
-                        value = match.group(0)
-
-                        if tag == 'TIME_UNIT':
-                            num, unit = re.match(r'(\d(?:_?\d)*)\s*(\w+)', value).groups()
-                            num = int(num.replace('_', ''))
-                            value = str(num * self.time_units[unit])
-                            tag = 'INTEGER'
-
-                        elif tag == 'WEI_POW10':
-                            # Turn "10**18 wei" into a big integer literal token
-                            m = re.match(r'(?i)\b10\s*\*\*\s*(\d+)\s*wei\b', value)
-                            k = int(m.group(1)) if m else 0
-                            value = str(10 ** k)
-                            tag = 'INTEGER'
-
-                        elif tag in ('SCIENTIFIC', 'FLOAT', 'INTEGER'):
-                            # Strip underscores from numeric tokens
-                            value = value.replace('_', '')
-                            if tag == 'SCIENTIFIC':
-                                # Normalize to INTEGER by evaluating (safe enough for our use)
-                                # Example: 9e18 -> 9000000000000000000
-                                try:
-                                    from decimal import Decimal
-                                    value = str(int(Decimal(value)))
-                                    tag = 'INTEGER'
-                                except Exception:
-                                    # Fall back to float path if Decimal fails
-                                    value = str(int(float(value)))
-                                    tag = 'INTEGER'
-
-                        tokens.append((value, tag))
-                    position = match.end()
-                    break
-            if not match:
-                if predicate[position] == '(':
-                    tokens.append(('(', 'LPAREN'))
-                    position += 1
-                elif predicate[position] == ')':
-                    tokens.append((')', 'RPAREN'))
-                    position += 1
-                elif predicate[position] == ',':
-                    tokens.append((',', 'COMMA'))
-                    position += 1
-                else:
-                    raise ValueError(f"Unexpected character: {predicate[position]} at position {position}")
+            match = match_at(predicate, position)
+            if match is None:
+                raise ValueError(f"Unexpected character: {predicate[position]} at position {position}")
+            tag = match.lastgroup
+            position = match.end()
+            if tag == _SKIP:
+                continue
+            if tag in _CANONICALIZED:
+                value, tag = _canonical(tag, match)
+            else:
+                value = match.group()
+            append((value, tag))
 
         return tokens
+
+    def tokenize_corpus(self, source: Union[str, bytes, Iterable[str]]) -> 'TokenCorpus':
+        """
+        Bulk-lex many predicates in one pass over a shared buffer.
+        `source` is either newline-separated text (one predicate per line) or
+        an iterable of predicate strings. See `TokenCorpus`.
+        """
+        return TokenCorpus(source)
+
+
+# Tags whose token value is rewritten rather than copied from the input.
+_CANONICALIZED = frozenset(('INTEGER', 'FLOAT', 'SCIENTIFIC', 'TIME_UNIT', 'WEI_POW10'))
+
+
+def _canonical(tag: str, match: 're.Match') -> Tuple[str, str]:
+    """Turn a numeric-ish match into its canonical (value, tag) token."""
+    value = match.group()
+    if tag in ('INTEGER', 'FLOAT'):
+        # Strip underscores from numeric tokens
+        return value.replace('_', ''), tag
+
+    if tag == 'TIME_UNIT':
+        num = int(match.group('time_num').replace('_', ''))
+        return str(num * Tokenizer.TIME_UNITS[match.group('time_unit')]), 'INTEGER'
+
+    if tag == 'WEI_POW10':
+        # Turn "10**18 wei" into a big integer literal token
+        return str(10 ** int(match.group('wei_exp'))), 'INTEGER'
+
+    # SCIENTIFIC: normalize to INTEGER by evaluating (safe enough for our use)
+    # Example: 9e18 -> 9000000000000000000
+    value = value.replace('_', '')
+    try:
+        return str(int(Decimal(value))), 'INTEGER'
+    except Exception:
+        # Fall back to float path if Decimal fails
+        return str(int(float(value))), 'INTEGER'
+
+
+# ---------------- Corpus-level lexing ----------------
+
+# Raw tag ids as stored in TokenCorpus.tags (index into TAGS).
+TAGS: List[str] = [tag for _, tag in Tokenizer.TOKEN_PATTERNS if tag]
+_TAG_IDS: Dict[str, int] = {tag: i for i, tag in enumerate(TAGS)}
+# Tag reported to consumers (numeric forms all surface as INTEGER, like tokenize()).
+_PUBLIC_TAGS: List[str] = [
+    'INTEGER' if tag in ('SCIENTIFIC', 'TIME_UNIT', 'WEI_POW10') else tag for tag in TAGS
+]
+_TAG_PATTERNS: Dict[str, 're.Pattern'] = {
+    tag: re.compile(pattern) for pattern, tag in Tokenizer.TOKEN_PATTERNS if tag
+}
+# Byte-level twin of the master regex, used to scan the shared buffer in place.
+# Note that \w, \s and \b are ASCII-only here, which is what Solidity allows.
+_MASTER_BYTES = re.compile(Tokenizer._MASTER.pattern.encode('ascii'))
+_SKIP_ID = -1
+# match.lastindex (number of the outermost matching group) -> raw tag id
+_GROUP_TAG_IDS: Dict[int, int] = {
+    number: _TAG_IDS.get(name, _SKIP_ID)
+    for name, number in _MASTER_BYTES.groupindex.items()
+    if name in _TAG_IDS or name == _SKIP
+}
+
+
+class TokenSlice(Sequence):
+    """
+    Tokens of one predicate inside a `TokenCorpus`.
+
+    Behaves like the `List[Tuple[str, str]]` returned by `Tokenizer.tokenize`
+    (so it can be handed straight to `Parser`), but each `(value, tag)` pair is
+    built on access from the corpus arrays.
+    """
+    __slots__ = ('_corpus', '_lo', '_hi')
+
+    def __init__(self, corpus: 'TokenCorpus', lo: int, hi: int):
+        self._corpus = corpus
+        self._lo = lo
+        self._hi = hi
+
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < self._hi - self._lo:
+            raise IndexError("token index out of range")
+        return self._corpus.token(self._lo + i)
+
+    def tag(self, i: int) -> str:
+        """Tag of the i-th token without materializing its value."""
+        return _PUBLIC_TAGS[self._corpus.tags[self._lo + i]]
+
+    def tags(self) -> List[str]:
+        """Tags of all tokens, straight from the corpus tag array."""
+        return [_PUBLIC_TAGS[t] for t in self._corpus.tags[self._lo:self._hi]]
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class TokenCorpus:
+    """
+    Flat, compact token storage for a whole corpus of predicates.
+
+    All predicates live in one UTF-8 buffer (one per line). Lexing fills:
+      - tags:   array('B') of raw tag ids (see `TAGS`)
+      - starts: array('I') of token start offsets into `buffer`
+      - ends:   array('I') of token end offsets into `buffer`
+      - bounds: array('I') with len(corpus) + 1 entries; predicate i owns
+                tokens bounds[i] .. bounds[i + 1] - 1
+      - lines:  array('I') of predicate start offsets into `buffer`
+    Token text is only decoded (from a memoryview slice) when asked for.
+    Predicates that fail to lex get no tokens and an entry in `errors`;
+    indexing them raises the same ValueError `Tokenizer.tokenize` would.
+    """
+
+    def __init__(self, source: Union[str, bytes, Iterable[str]]):
+        if isinstance(source, str):
+            source = source.encode('utf-8')
+        elif not isinstance(source, (bytes, bytearray)):
+            # Newlines delimit predicates, so any inside one become plain spaces.
+            source = ''.join(p.replace('\n', ' ') + '\n' for p in source).encode('utf-8')
+        self.buffer = bytes(source)
+        self.view = memoryview(self.buffer)
+        self.tags = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        self.bounds = array('I', [0])
+        self.lines = array('I')
+        self.errors: Dict[int, str] = {}
+        self._lex()
+
+    def _lex(self) -> None:
+        buf = self.buffer
+        finditer = _MASTER_BYTES.finditer
+        group_ids = _GROUP_TAG_IDS
+        tags, starts, ends, bounds = self.tags, self.starts, self.ends, self.bounds
+        lines, errors = self.lines, self.errors
+        add_tag, add_start, add_end = tags.append, starts.append, ends.append
+        line_start = 0
+        size = len(buf)
+
+        while line_start < size:
+            lines.append(line_start)
+            line_end = buf.find(b'\n', line_start)
+            if line_end < 0:
+                line_end = size
+            # finditer() skips over unlexable input, so a gap between consecutive
+            # matches (or before the end of the line) is a lexing error.
+            position = line_start
+            for match in finditer(buf, line_start, line_end):
+                start, end = match.span()
+                if start != position:
+                    break
+                tag_id = group_ids[match.lastindex]
+                if tag_id != _SKIP_ID:
+                    add_tag(tag_id)
+                    add_start(start)
+                    add_end(end)
+                position = end
+            if position != line_end:
+                char = buf[position:position + 1].decode('utf-8', 'replace')
+                errors[len(lines) - 1] = f"Unexpected character: {char} at position {position - line_start}"
+                del tags[bounds[-1]:], starts[bounds[-1]:], ends[bounds[-1]:]
+            bounds.append(len(tags))
+            line_start = line_end + 1
+
+    def __len__(self) -> int:
+        return len(self.bounds) - 1
+
+    def __getitem__(self, i: int) -> TokenSlice:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("predicate index out of range")
+        if i in self.errors:
+            raise ValueError(self.errors[i])
+        return TokenSlice(self, self.bounds[i], self.bounds[i + 1])
+
+    def __iter__(self):
+        # Predicates that failed to lex yield None instead of raising.
+        for i in range(len(self)):
+            yield self[i] if i not in self.errors else None
+
+    @property
+    def num_tokens(self) -> int:
+        return len(self.tags)
+
+    def text(self, k: int) -> str:
+        """Raw source text of token k (no numeric canonicalization)."""
+        return str(self.view[self.starts[k]:self.ends[k]], 'utf-8')
+
+    def tag(self, k: int) -> str:
+        return _PUBLIC_TAGS[self.tags[k]]
+
+    def value(self, k: int) -> str:
+        """Token value exactly as `Tokenizer.tokenize` would report it."""
+        raw = TAGS[self.tags[k]]
+        text = self.text(k)
+        if raw in _CANONICALIZED:
+            return _canonical(raw, _TAG_PATTERNS[raw].match(text))[0]
+        return text
+
+    def token(self, k: int) -> Tuple[str, str]:
+        return self.value(k), self.tag(k)
+
+    def predicate_text(self, i: int) -> str:
+        """Source line of predicate i."""
+        start = self.lines[i]
+        end = self.buffer.find(b'\n', start)
+        return str(self.view[start:end if end >= 0 else len(self.buffer)], 'utf-8')
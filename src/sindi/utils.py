@@ -1,5 +1,7 @@
 import os
+from collections import OrderedDict, namedtuple
 from contextlib import contextmanager
+from typing import Hashable
 
 def _truthy(envvar: str) -> bool:
     val = os.environ.get(envvar, "")
@@ -29,6 +31,23 @@ def printer(string, level: int = 0):
         return
     print("  " * level + str(string))
 
+def debug_enabled() -> bool:
+    """Whether debug output is on; guard debug-only work (beyond formatting) with it."""
+    return not _QUIET
+
+def debug(msg, *args, level: int = 0):
+    """
+    Lazy `printer`: nothing is formatted unless debug output is on. `msg` is
+    a %-style format for `args`, or a callable returning the text.
+    """
+    if _QUIET:
+        return
+    if callable(msg):
+        msg = msg()
+    elif args:
+        msg = msg % args
+    print("  " * level + str(msg))
+
 @contextmanager
 def debug_logging(enabled: bool = True):
     """Temporarily toggle debug logging within a 'with' block."""
@@ -39,3 +58,65 @@ def debug_logging(enabled: bool = True):
         yield
     finally:
         _QUIET = prev
+
+
+def env_int(envvar: str, default: int) -> int:
+    """Integer setting from the environment; `default` when unset or blank."""
+    val = os.environ.get(envvar, "").strip()
+    if not val:
+        return default
+    try:
+        return int(val)
+    except ValueError:
+        raise ValueError(f"{envvar} must be an integer, got {val!r}") from None
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+class BoundedLRU:
+    """
+    Size-bounded LRU map with hit/miss/eviction counters (see `cache_info`).
+    Values must not be None; `get` returns None on a miss. Safe to share
+    between threads: a racing eviction only costs a recomputation.
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize < 0:
+            raise ValueError("maxsize must be >= 0")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable):
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            self._data.move_to_end(key)
+        except KeyError:  # evicted by another thread in between
+            pass
+        return value
+
+    def put(self, key: Hashable, value) -> None:
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        while len(self._data) > self.maxsize:
+            try:
+                self._data.popitem(last=False)
+            except KeyError:
+                break
+            self.evictions += 1
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+    def cache_clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
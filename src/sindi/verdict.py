@@ -0,0 +1,184 @@
+# src/sindi/verdict.py
+"""
+Structured comparison results.
+
+`Comparator.compare_detailed` (and `CascadeComparator.compare_detailed`)
+return a `Verdict`: the `Outcome` of the pair, both implications, what
+decided it, and how many wall-clock nanoseconds each pipeline stage took
+within that call. `compare` returns `Verdict.text`, the familiar sentence.
+
+Stage times are exclusive: a stage entered while another one runs (e.g. a
+simplification inside the solver's implication check) is charged to the
+inner stage only. Stages a prepared predicate had already computed cost 0.
+"""
+from __future__ import annotations
+
+import enum
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional, Tuple
+
+__all__ = ["Outcome", "Verdict", "STAGES", "UNKNOWN_VERDICT"]
+
+UNKNOWN_VERDICT = "The verdict is unknown (time or memory budget exceeded)."
+
+# Pipeline stages, in order; "cache" is the verdict cache lookup and "rules"
+# the cascade's solver-free tier.
+STAGES = ("cache", "rewrite", "tokenize", "parse", "normalize", "rules", "sympy", "simplify", "solver")
+
+
+class Outcome(enum.Enum):
+    """The verdict of a pair; each value is the sentence `compare` returns."""
+
+    FIRST_STRONGER = "The first predicate is stronger."
+    SECOND_STRONGER = "The second predicate is stronger."
+    EQUIVALENT = "The predicates are equivalent."
+    INCOMPARABLE = "The predicates are not equivalent and neither is stronger."
+    UNKNOWN = UNKNOWN_VERDICT
+
+    @classmethod
+    def of(cls, implies_1_to_2: bool, implies_2_to_1: bool) -> "Outcome":
+        if implies_1_to_2 and implies_2_to_1:
+            return cls.EQUIVALENT
+        if implies_1_to_2:
+            return cls.FIRST_STRONGER
+        if implies_2_to_1:
+            return cls.SECOND_STRONGER
+        return cls.INCOMPARABLE
+
+    @property
+    def implications(self) -> Tuple[Optional[bool], Optional[bool]]:
+        """(1 -> 2, 2 -> 1) of the outcome, the inverse of `of`; (None, None) for UNKNOWN."""
+        return _IMPLICATIONS[self]
+
+
+_IMPLICATIONS = {
+    Outcome.EQUIVALENT: (True, True),
+    Outcome.FIRST_STRONGER: (True, False),
+    Outcome.SECOND_STRONGER: (False, True),
+    Outcome.INCOMPARABLE: (False, False),
+    Outcome.UNKNOWN: (None, None),
+}
+
+
+class Verdict:
+    """
+    Result of one comparison. `implies_1_to_2` / `implies_2_to_1` are None
+    when the outcome is UNKNOWN; `decided_by` names the engine ("sympy",
+    "z3") or tier ("rules") that settled it, or "cache" for a verdict
+    found in a `VerdictCache`; `timings_ns` maps every name in
+    STAGES to the nanoseconds spent in it.
+    """
+
+    __slots__ = ("outcome", "implies_1_to_2", "implies_2_to_1", "decided_by", "timings_ns")
+
+    def __init__(self, outcome: Outcome, implies_1_to_2: Optional[bool], implies_2_to_1: Optional[bool],
+                 decided_by: Optional[str], timings_ns: Optional[Dict[str, int]] = None):
+        self.outcome = outcome
+        self.implies_1_to_2 = implies_1_to_2
+        self.implies_2_to_1 = implies_2_to_1
+        self.decided_by = decided_by
+        self.timings_ns = dict.fromkeys(STAGES, 0) if timings_ns is None else timings_ns
+
+    @classmethod
+    def from_implications(cls, implies_1_to_2: bool, implies_2_to_1: bool, decided_by: str,
+                          timings_ns: Optional[Dict[str, int]] = None) -> "Verdict":
+        return cls(Outcome.of(implies_1_to_2, implies_2_to_1), implies_1_to_2, implies_2_to_1,
+                   decided_by, timings_ns)
+
+    @classmethod
+    def unknown(cls, timings_ns: Optional[Dict[str, int]] = None) -> "Verdict":
+        return cls(Outcome.UNKNOWN, None, None, None, timings_ns)
+
+    @property
+    def text(self) -> str:
+        return self.outcome.value
+
+    @property
+    def total_ns(self) -> int:
+        return sum(self.timings_ns.values())
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return (f"Verdict({self.outcome.name}, implies_1_to_2={self.implies_1_to_2}, "
+                f"implies_2_to_1={self.implies_2_to_1}, decided_by={self.decided_by!r}, "
+                f"total_ns={self.total_ns})")
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+class StageClock:
+    """Exclusive per-stage wall-clock time of one comparison (see `stage`)."""
+
+    __slots__ = ("ns", "_stack", "_t", "_next")
+
+    def __init__(self):
+        self.ns: Dict[str, int] = dict.fromkeys(STAGES, 0)
+        self._stack = []
+        self._t = time.perf_counter_ns()
+        self._next = None
+
+    def _charge(self) -> None:
+        now = time.perf_counter_ns()
+        if self._stack:
+            self.ns[self._stack[-1]] += now - self._t
+        self._t = now
+
+    def stage(self, name: str) -> "StageClock":
+        """`with clock.stage(name):` charges the enclosed time to `name`, pausing the enclosing stage."""
+        self._next = name
+        return self
+
+    def __enter__(self):
+        self._charge()
+        self._stack.append(self._next)
+
+    def __exit__(self, *exc):
+        self._charge()
+        self._stack.pop()
+
+
+class _NoClock:
+    __slots__ = ()
+    _idle = nullcontext()
+
+    def stage(self, name: str):
+        return self._idle
+
+
+NO_CLOCK = _NoClock()
+
+
+class StageTimer:
+    """Per-thread current `StageClock` of a comparator; NO_CLOCK outside `compare_detailed`."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def clock(self):
+        return getattr(self._local, "clock", NO_CLOCK)
+
+    def stage(self, name: str):
+        return self.clock.stage(name)
+
+    @contextmanager
+    def timing(self):
+        """Yield the running clock, or install a fresh one for the enclosed comparison."""
+        clock = getattr(self._local, "clock", None)
+        if clock is not None:
+            yield clock
+            return
+        clock = self._local.clock = StageClock()
+        try:
+            yield clock
+        finally:
+            del self._local.clock
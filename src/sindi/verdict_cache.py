@@ -0,0 +1,310 @@
+# src/sindi/verdict_cache.py
+"""
+Verdicts kept on disk across processes and runs.
+
+A `VerdictCache` is an SQLite file of implications between predicates. A row
+is keyed by (engine version, fingerprint of p1, fingerprint of p2):
+
+  - the engine version (`Comparator.cache_version`, ...) names the engine,
+    its settings and the SInDi / solver versions, so an upgrade never
+    reads verdicts another version produced;
+  - a fingerprint (`fingerprint`) is a digest of the normalized AST, so
+    predicates that only differ in spelling share their verdicts.
+
+Each row holds both implications of the pair and answers it either way
+round. A direction that is not known yet (`implies` computes one) is NULL.
+The file is opened in WAL mode, so many processes can read it while one
+writes; hits are only read, and their recency is written back in batches.
+It holds at most `max_entries` rows and evicts the least recently
+used ones; the cap is checked every sixteenth of it, so it can be exceeded
+by that much in between.
+
+Comparators take `verdict_cache=` (a path or a `VerdictCache`); without one
+they use `SINDI_VERDICT_CACHE` (a path) if it is set. `symbols.solver_signature`
+keeps its Z3 checks in the same file, under a version of its own.
+`sindi cache stats`, `sindi cache vacuum` and `sindi cache clear` inspect and
+maintain the file.
+"""
+from __future__ import annotations
+
+import atexit
+import functools
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+from .config import VERDICT_CACHE_ENV
+from .hashcons import HNode
+from .utils import CacheInfo, debug, env_int
+
+__all__ = ["VerdictCache", "open_cache", "resolve_cache", "fingerprint", "default_path",
+           "VERDICT_CACHE_ENV", "VERDICT_CACHE_SIZE_ENV", "DEFAULT_MAX_ENTRIES"]
+
+VERDICT_CACHE_SIZE_ENV = "SINDI_VERDICT_CACHE_SIZE"
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+# Bump when the table layout changes; older files are emptied.
+SCHEMA = 1
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    version  TEXT    NOT NULL,
+    fp1      TEXT    NOT NULL,
+    fp2      TEXT    NOT NULL,
+    forward  INTEGER,
+    backward INTEGER,
+    used     REAL    NOT NULL,
+    hits     INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (version, fp1, fp2)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS verdicts_used ON verdicts (used);
+"""
+
+_UPSERT_SQL = """
+INSERT INTO verdicts (version, fp1, fp2, forward, backward, used) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (version, fp1, fp2) DO UPDATE SET
+    forward = coalesce(excluded.forward, forward),
+    backward = coalesce(excluded.backward, backward),
+    used = excluded.used
+"""
+
+_TOUCH_SQL = "UPDATE verdicts SET used = ?, hits = hits + 1 WHERE version = ? AND fp1 = ? AND fp2 = ?"
+
+# Hits whose recency is written back in one transaction; a lookup itself never writes.
+_TOUCH_BATCH = 256
+
+Implications = Tuple[Optional[bool], Optional[bool]]
+
+
+def default_path() -> str:
+    """`SINDI_VERDICT_CACHE`, else verdicts.sqlite3 in the user's cache directory."""
+    path = os.environ.get(VERDICT_CACHE_ENV, "").strip()
+    if path:
+        return path
+    base = os.environ.get("XDG_CACHE_HOME", "").strip() or os.path.join("~", ".cache")
+    return os.path.join(os.path.expanduser(base), "sindi", "verdicts.sqlite3")
+
+
+@functools.lru_cache(maxsize=65536)
+def fingerprint(node: HNode) -> str:
+    """Digest of a normalized predicate: equal for structurally equal trees."""
+    return hashlib.blake2b(node.sort_key().encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _flag(value: Optional[int]) -> Optional[bool]:
+    return None if value is None else bool(value)
+
+
+class VerdictCache:
+    """
+    Implications of predicate pairs in the SQLite file `path` (see the module
+    docstring). `max_entries` defaults to `SINDI_VERDICT_CACHE_SIZE`, else
+    DEFAULT_MAX_ENTRIES. Safe to share between threads; a process that
+    inherits the object through fork reconnects. SQLite errors (a file
+    locked for too long, a full disk) are logged and count as misses.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], max_entries: Optional[int] = None):
+        if max_entries is None:
+            max_entries = env_int(VERDICT_CACHE_SIZE_ENV, DEFAULT_MAX_ENTRIES)
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.path = os.fspath(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._evict_every = max(1, max_entries // 16)
+        self._puts = 0
+        self._touched: List[Tuple[float, str, str, str]] = []  # hits not yet written back
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = None
+        self._connect()
+
+    def __repr__(self) -> str:
+        return f"VerdictCache({self.path!r}, max_entries={self.max_entries})"
+
+    def __reduce__(self):
+        # Worker processes open the same file (see `open_cache`).
+        return open_cache, (self.path, self.max_entries)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # Autocommit: a writer holds the lock for one statement only.
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA:
+            conn.execute("BEGIN IMMEDIATE")  # another process may be creating it too
+            try:
+                if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA:
+                    conn.execute("DROP TABLE IF EXISTS verdicts")
+                    for statement in _SCHEMA_SQL.split(";"):
+                        if statement.strip():
+                            conn.execute(statement)
+                    conn.execute(f"PRAGMA user_version={SCHEMA}")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        if self._pid not in (None, os.getpid()):
+            self._touched = []  # forked: the parent writes its own hits back
+        self._conn, self._pid = conn, os.getpid()
+        return conn
+
+    def _flush(self, conn: sqlite3.Connection) -> None:
+        if self._touched:
+            touched, self._touched = self._touched, []
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(_TOUCH_SQL, touched)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        """Write pending hits back and close the connection."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                try:
+                    self._flush(self._conn)
+                except sqlite3.Error as e:
+                    debug('> Verdict cache %s: hits not written back: %s', self.path, e)
+                self._conn.close()
+            self._conn = None
+
+    # ---- verdicts ----
+
+    def get(self, version: str, fp1: str, fp2: str) -> Optional[Implications]:
+        """(p1 -> p2, p2 -> p1) of a cached pair, None for a direction not known; None on a miss."""
+        swap = fp1 > fp2
+        key = (version, fp2, fp1) if swap else (version, fp1, fp2)
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT forward, backward FROM verdicts WHERE version = ? AND fp1 = ? AND fp2 = ?",
+                                   key).fetchone()
+                if row is not None:
+                    self._touched.append((time.time(), *key))
+                    if len(self._touched) >= _TOUCH_BATCH:
+                        self._flush(conn)
+        except sqlite3.Error as e:
+            debug('> Verdict cache %s unreadable: %s', self.path, e)
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        forward, backward = _flag(row[0]), _flag(row[1])
+        return (backward, forward) if swap else (forward, backward)
+
+    def put(self, version: str, fp1: str, fp2: str,
+            implies_1_to_2: Optional[bool], implies_2_to_1: Optional[bool] = None) -> None:
+        """Store what is known of the pair; a None direction keeps what the row already holds."""
+        if fp1 > fp2:
+            fp1, fp2, implies_1_to_2, implies_2_to_1 = fp2, fp1, implies_2_to_1, implies_1_to_2
+        try:
+            with self._lock:
+                conn = self._connect()
+                self._flush(conn)
+                conn.execute(_UPSERT_SQL, (version, fp1, fp2, implies_1_to_2, implies_2_to_1, time.time()))
+                self._puts += 1
+                if self._puts % self._evict_every == 0:
+                    self._evict(conn)
+        except sqlite3.Error as e:
+            debug('> Verdict cache %s not written: %s', self.path, e)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        self._flush(conn)
+        excess = conn.execute("SELECT count(*) FROM verdicts").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute("DELETE FROM verdicts WHERE (version, fp1, fp2) IN "
+                         "(SELECT version, fp1, fp2 FROM verdicts ORDER BY used LIMIT ?)", (excess,))
+            self.evictions += excess
+            debug('> Verdict cache %s: evicted %d least recently used rows', self.path, excess)
+
+    # ---- maintenance ----
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT count(*) FROM verdicts").fetchone()[0]
+
+    def cache_info(self) -> CacheInfo:
+        """This object's hits, misses and evictions, with the file's cap and size (as `BoundedLRU`)."""
+        return CacheInfo(self.hits, self.misses, self.evictions, self.max_entries, len(self))
+
+    def stats(self) -> Dict[str, object]:
+        """Rows, lifetime hits and rows per engine version, and the size of the file (with its WAL)."""
+        with self._lock:
+            conn = self._connect()
+            self._flush(conn)
+            entries, hits = conn.execute("SELECT count(*), coalesce(sum(hits), 0) FROM verdicts").fetchone()
+            versions = dict(conn.execute("SELECT version, count(*) FROM verdicts GROUP BY version ORDER BY version"))
+        size = sum(os.path.getsize(p) for p in (self.path, self.path + "-wal") if os.path.exists(p))
+        return {"path": self.path, "entries": entries, "max_entries": self.max_entries, "hits": hits,
+                "bytes": size, "versions": versions}
+
+    def vacuum(self) -> None:
+        """Apply the size cap now, fold the WAL into the file and give free pages back to the OS."""
+        with self._lock:
+            conn = self._connect()
+            self._evict(conn)
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def clear(self) -> None:
+        """Delete every verdict."""
+        with self._lock:
+            conn = self._connect()
+            self._touched = []
+            conn.execute("DELETE FROM verdicts")
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+# Open caches by absolute path, shared by the comparators of a process.
+_caches: Dict[str, VerdictCache] = {}
+_caches_lock = threading.Lock()
+
+
+@atexit.register
+def _close_caches() -> None:
+    for cache in list(_caches.values()):
+        cache.close()
+
+
+def open_cache(path: Union[str, os.PathLike], max_entries: Optional[int] = None) -> VerdictCache:
+    """The process's `VerdictCache` for `path`, opened on first use."""
+    key = os.path.abspath(os.fspath(path))
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None or (max_entries is not None and cache.max_entries != max_entries):
+            cache = _caches[key] = VerdictCache(path, max_entries)
+        return cache
+
+
+def resolve_cache(verdict_cache: Union[None, bool, str, os.PathLike, VerdictCache]) -> Optional[VerdictCache]:
+    """
+    A comparator's `verdict_cache` argument as a cache: a `VerdictCache` as
+    is, a path opened with `open_cache`, True for `default_path()`, False
+    for none, and None for `SINDI_VERDICT_CACHE` if it is set.
+    """
+    if isinstance(verdict_cache, VerdictCache):
+        return verdict_cache
+    if verdict_cache is False:
+        return None
+    if verdict_cache is True:
+        verdict_cache = default_path()
+    if verdict_cache is None:
+        verdict_cache = os.environ.get(VERDICT_CACHE_ENV, "").strip() or None
+        if verdict_cache is None:
+            return None
+    return open_cache(verdict_cache)
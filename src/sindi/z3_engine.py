@@ -0,0 +1,451 @@
+# src/sindi/z3_engine.py
+"""
+Direct AST -> Z3 translation, bypassing SymPy.
+
+`Comparator(engine="z3")` decides implication with Z3 alone: each normalized
+predicate (an interned `HNode`) is translated straight into a Z3 formula and
+`p1 -> p2` holds iff `p1 and not p2` is unsatisfiable.
+
+Arithmetic atoms are assumed non-negative (Solidity-like domains) in the same
+situations the SymPy engine assumes it (`Comparator._z3_implies_with_nonneg`
+and the numeric-scaling branch of `_implies`): when one predicate has a
+numeric `==` and the other an ordering or `!=`, or when either scales by a
+numeric factor (a constant other than +-1, or a division).
+
+Sorts are decided by context: an atom (identifier, member, index or call) is
+a Bool constant where a condition is expected and a Real constant where a
+number is. Index/member/call atoms are named after their structure
+(`balances[](to)`), so the same subexpression always maps to the same
+constant. `&` and `%` become uninterpreted functions (BITAND, MOD) over the
+reals; any other unknown operator becomes an uninterpreted function too.
+
+Queries go through a `SolverSession`: one long-lived solver per comparator
+and thread, with symbol domains declared once and each check run in a
+push/pop scope under assumption literals.
+"""
+from __future__ import annotations
+
+import threading
+from typing import FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import z3
+
+from .budget import Budget, BudgetExceeded
+from .hashcons import HNode, intern_ast
+from .parser import (LITERAL_INT, LITERAL_FLOAT, LITERAL_BOOL, IDENTIFIER, MEMBER, INDEX, CALL,
+                     UNARY, BINARY_OP)
+from .utils import BoundedLRU
+
+__all__ = ["Z3Translator", "SolverSession", "DEFAULT_TRANSLATION_CACHE_SIZE"]
+
+DEFAULT_TRANSLATION_CACHE_SIZE = 1 << 14
+# A session starts over once it has declared this many symbol domains.
+DEFAULT_SESSION_SYMBOLS = 1 << 12
+# Z3's "no limit" value for the timeout / max_memory solver parameters.
+_Z3_UNLIMITED = 4294967295
+# reason_unknown() of a check that ran out of time or memory.
+_OUT_OF_BUDGET = ("timeout", "canceled", "max. memory exceeded", "memout")
+
+LOGICAL_OPS = frozenset(('&&', '||', '!'))
+ORDER_OPS = frozenset(('>', '<', '>=', '<='))
+EQUALITY_OPS = frozenset(('==', '!='))
+ATOM_KINDS = (IDENTIFIER, MEMBER, INDEX, CALL)
+# Operators with no arithmetic meaning in the reals, kept as opaque functions.
+UNINTERPRETED = {'&': 'BITAND', '%': 'MOD'}
+_INTERPRETED = LOGICAL_OPS | ORDER_OPS | EQUALITY_OPS | frozenset(('+', '-', '*', '/'))
+
+# Contexts a node is translated in.
+BOOL, REAL = 0, 1
+
+_EMPTY: FrozenSet[z3.ArithRef] = frozenset()
+
+# What a translated subtree contains, for deciding on non-negativity.
+HAS_EQ, HAS_REL, HAS_SCALE = 1, 2, 4
+
+
+def _mixes_eq(flags1: int, flags2: int) -> bool:
+    return bool((flags1 & HAS_EQ and flags2 & HAS_REL) or (flags1 & HAS_REL and flags2 & HAS_EQ))
+
+
+def _is_atom(node: HNode) -> bool:
+    return node.kind in ATOM_KINDS
+
+
+def _boolean_shaped(node: HNode) -> bool:
+    """Whether `node` is a condition by construction (so `==` over it is an iff)."""
+    if node.kind == LITERAL_BOOL:
+        return True
+    if node.kind in (UNARY, BINARY_OP):
+        return node.value in LOGICAL_OPS or node.value in ORDER_OPS or node.value in EQUALITY_OPS
+    return False
+
+
+def _operand_context(node: HNode) -> int:
+    """Context of the operands of `node` (all operands share one)."""
+    op = node.value
+    if node.kind in (UNARY, BINARY_OP):
+        if op in LOGICAL_OPS:
+            return BOOL
+        if op in EQUALITY_OPS:
+            return BOOL if any(_boolean_shaped(c) for c in node.children) else REAL
+    return REAL
+
+
+def _is_scale_factor(node: HNode) -> bool:
+    return node.kind in (LITERAL_INT, LITERAL_FLOAT) and node.literal not in (1, -1)
+
+
+def _coerce(term, have: int, want: int):
+    if have == want:
+        return term
+    if want == BOOL:
+        return term != 0  # C-like truthiness of a number
+    return z3.If(term, z3.RealVal(1), z3.RealVal(0))
+
+
+class SolverSession:
+    """
+    One long-lived `z3.Solver` for many small implication queries.
+
+    Each symbol's domain (`x >= 0`) is asserted once, guarded by its own
+    literal, and switched on per query by passing the guard as an
+    assumption. Queries run in a push/pop scope, and `entails_both` checks
+    the two directions of a pair in the same scope under one assumption
+    literal each. Not thread-safe: keep one session per thread.
+
+    While `budget` is set, every check gets the time left as Z3's `timeout`
+    (and the memory cap as `max_memory`), and a check that gives up for
+    lack of either raises BudgetExceeded instead of answering "unknown".
+    """
+
+    def __init__(self, max_symbols: int = DEFAULT_SESSION_SYMBOLS):
+        self.max_symbols = max_symbols
+        self.solver = z3.Solver()
+        self.budget: Optional[Budget] = None
+        self._limits = None  # (timeout, max_memory) last applied to the solver
+        self._guards = {}
+        self._directions = (z3.Bool("sindi!1->2"), z3.Bool("sindi!2->1"))
+
+    def _check(self, *assumptions) -> z3.CheckSatResult:
+        budget = self.budget
+        limits = (None, None)
+        if budget is not None:
+            budget.check()
+            limits = (budget.remaining_ms(), budget.max_memory_mb)
+        if limits != self._limits:
+            timeout, memory = limits
+            self.solver.set(timeout=_Z3_UNLIMITED if timeout is None else max(timeout, 1),
+                            max_memory=_Z3_UNLIMITED if memory is None else memory)
+            self._limits = limits
+        result = self.solver.check(*assumptions)
+        if result == z3.unknown and budget is not None:
+            reason = self.solver.reason_unknown()
+            if reason in _OUT_OF_BUDGET:
+                raise BudgetExceeded(f"z3: {reason}")
+            budget.check()
+        return result
+
+    def reset(self) -> None:
+        """Drop every declared domain (the solver is reused)."""
+        self.solver.reset()
+        self._guards.clear()
+        self._limits = None
+
+    def nonneg(self, atoms: Iterable[z3.ArithRef]) -> List[z3.BoolRef]:
+        """Assumption literals enabling `atom >= 0` for each of `atoms`."""
+        atoms = list(atoms)
+        if len(self._guards) + len(atoms) > self.max_symbols:
+            self.reset()
+        guards = []
+        for atom in atoms:
+            guard = self._guards.get(atom)
+            if guard is None:
+                guard = self._guards[atom] = z3.Bool(f"sindi!nonneg!{atom}")
+                self.solver.add(z3.Implies(guard, atom >= 0))
+            guards.append(guard)
+        return guards
+
+    def check(self, *formulas, assumptions=()) -> z3.CheckSatResult:
+        """Satisfiability of `formulas` in a scope of their own."""
+        solver = self.solver
+        solver.push()
+        try:
+            solver.add(*formulas)
+            return self._check(*assumptions)
+        finally:
+            solver.pop()
+
+    def entails(self, f1, f2, assumptions=()) -> z3.CheckSatResult:
+        """Result of checking `f1 and not f2` (unsat means f1 -> f2)."""
+        return self.check(f1, z3.Not(f2), assumptions=assumptions)
+
+    def entails_both(self, f1, f2, assumptions=()) -> Tuple[z3.CheckSatResult, z3.CheckSatResult]:
+        """`entails(f1, f2)` and `entails(f2, f1)` in one scope."""
+        solver = self.solver
+        d12, d21 = self._directions
+        solver.push()
+        try:
+            solver.add(z3.Implies(d12, z3.And(f1, z3.Not(f2))), z3.Implies(d21, z3.And(f2, z3.Not(f1))))
+            return self._check(*assumptions, d12), self._check(*assumptions, d21)
+        finally:
+            solver.pop()
+
+    def entails_many(self, fixed, others: Sequence, assumptions: Sequence = (),
+                     reverse: bool = False) -> List[z3.CheckSatResult]:
+        """
+        `entails(fixed, g)` for each `g` in `others` (`entails(g, fixed)` if
+        `reverse`), with `fixed` asserted once for the whole batch and each
+        candidate checked in a nested scope. `assumptions[i]`, if given, are
+        the assumption literals of the i-th check.
+        """
+        solver = self.solver
+        solver.push()
+        try:
+            solver.add(z3.Not(fixed) if reverse else fixed)
+            results = []
+            for i, other in enumerate(others):
+                solver.push()
+                try:
+                    solver.add(other if reverse else z3.Not(other))
+                    results.append(self._check(*(assumptions[i] if assumptions else ())))
+                finally:
+                    solver.pop()
+            return results
+        finally:
+            solver.pop()
+
+
+class Z3Translator:
+    """
+    Translates normalized ASTs into Z3 formulas and decides implication.
+
+    Translations are memoized per (subtree, context) in a bounded LRU, so a
+    predicate (or a subexpression shared by many predicates) is translated
+    once. Every formula comes with the set of Real atoms it mentions, which
+    is what the non-negativity assumptions range over, and the HAS_* flags
+    that decide whether they are made.
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_TRANSLATION_CACHE_SIZE, nonneg: bool = True):
+        self.nonneg = nonneg
+        self.cache = BoundedLRU(cache_size)
+        self._symbols = BoundedLRU(cache_size)
+        self._unsat = BoundedLRU(cache_size)
+        self._functions = {}
+        self._local = threading.local()
+
+    def session(self) -> SolverSession:
+        """This thread's solver session."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = SolverSession()
+        return session
+
+    def _function(self, name: str, arity: int):
+        key = (name, arity)
+        fn = self._functions.get(key)
+        if fn is None:
+            fn = self._functions[key] = z3.Function(name, *([z3.RealSort()] * (arity + 1)))
+        return fn
+
+    def translate(self, node, ctx: int = BOOL) -> Tuple[z3.ExprRef, FrozenSet[z3.ArithRef], int]:
+        """
+        `(term, real_atoms, flags)` for `node` in context `ctx` (BOOL for a whole
+        predicate). Accepts any AST; non-interned trees are interned first.
+        """
+        if not isinstance(node, HNode):
+            node = intern_ast(node)
+        cache = self.cache
+        hit = cache.get((node, ctx))
+        if hit is not None:
+            return hit
+        # Iterative post-order over (node, context) pairs, so deep chains
+        # do not hit the recursion limit.
+        done = {}
+        stack = [(node, ctx, False)]
+        while stack:
+            n, c, expanded = stack.pop()
+            key = (n, c)
+            if key in done:
+                continue
+            if not expanded:
+                hit = cache.get(key)
+                if hit is not None:
+                    done[key] = hit
+                    continue
+                stack.append((n, c, True))
+                child_ctx = REAL if _is_atom(n) else _operand_context(n)
+                stack.extend((ch, child_ctx, False) for ch in n.children if (ch, child_ctx) not in done)
+                continue
+            done[key] = result = self._build(n, c, done)
+            cache.put(key, result)
+        return done[(node, ctx)]
+
+    def _build(self, n: HNode, ctx: int, done):
+        kind = n.kind
+        if kind == LITERAL_BOOL:
+            return _coerce(z3.BoolVal(n.literal), BOOL, ctx), _EMPTY, 0
+        if kind in (LITERAL_INT, LITERAL_FLOAT):
+            return _coerce(z3.RealVal(n.literal), REAL, ctx), _EMPTY, 0
+
+        if _is_atom(n):
+            # Children of an atom only contribute to its name: `f()(a, (+ b 1))`.
+            name = n.value
+            if n.children:
+                name += f"({', '.join(done[(ch, REAL)][0].sexpr() for ch in n.children)})"
+            if ctx == BOOL:
+                return z3.Bool(name), _EMPTY, 0
+            atom = z3.Real(name)
+            return atom, frozenset((atom,)), 0
+
+        child_ctx = _operand_context(n)
+        parts = [done[(ch, child_ctx)] for ch in n.children]
+        args = [t for t, _, _ in parts]
+        atoms = frozenset().union(*(a for _, a, _ in parts)) if len(parts) > 1 else parts[0][1]
+        flags = 0
+        for _, _, f in parts:
+            flags |= f
+        op = n.value
+        if op in ORDER_OPS or op == '!=':
+            flags |= HAS_REL
+        elif op == '==' and child_ctx == REAL:
+            flags |= HAS_EQ
+        elif op == '/' or (op == '*' and any(_is_scale_factor(ch) for ch in n.children)):
+            flags |= HAS_SCALE
+
+        if op == '&&':
+            term = z3.And(*args)
+        elif op == '||':
+            term = z3.Or(*args)
+        elif op == '!':
+            term = z3.Not(args[0])
+        elif op == '==' and len(args) == 2:
+            term = args[0] == args[1]
+        elif op == '!=' and len(args) == 2:
+            term = args[0] != args[1]
+        elif op in ORDER_OPS and len(args) == 2:
+            a, b = args
+            term = a > b if op == '>' else a < b if op == '<' else a >= b if op == '>=' else a <= b
+        elif op == '+':
+            term = args[0] if len(args) == 1 else z3.Sum(*args)
+        elif op == '-' and len(args) == 1:
+            term = -args[0]
+        elif op == '-' and len(args) == 2:
+            term = args[0] - args[1]
+        elif op == '*':
+            term = args[0]
+            for a in args[1:]:
+                term = term * a
+        elif op == '/' and len(args) == 2:
+            term = args[0] / args[1]
+        else:
+            term = self._function(UNINTERPRETED.get(op, op), len(args))(*args)
+        have = BOOL if z3.is_bool(term) else REAL
+        return _coerce(term, have, ctx), atoms, flags
+
+    def formula(self, node) -> z3.BoolRef:
+        """Z3 formula of a whole predicate."""
+        return self.translate(node)[0]
+
+    def real_atoms(self, node) -> FrozenSet[z3.ArithRef]:
+        return self.translate(node)[1]
+
+    def symbols(self, node: HNode) -> FrozenSet:
+        """
+        Everything a predicate's meaning depends on: its atom subtrees and
+        uninterpreted operators. Predicates with disjoint symbols constrain
+        disjoint constants.
+        """
+        found = self._symbols.get(node)
+        if found is None:
+            found = set()
+            stack = [node]
+            while stack:
+                n = stack.pop()
+                if _is_atom(n):
+                    found.add(n)
+                    continue
+                if n.kind in (UNARY, BINARY_OP) and n.value not in _INTERPRETED:
+                    found.add(n.value)
+                stack.extend(n.children)
+            found = frozenset(found)
+            self._symbols.put(node, found)
+        return found
+
+    def _is_unsat(self, node: HNode, negate: bool, domains: bool) -> bool:
+        """Whether `node` (`not node` if `negate`) is unsatisfiable, with or without atom domains."""
+        key = (node, negate, domains)
+        found = self._unsat.get(key)
+        if found is None:
+            term, atoms, _ = self.translate(node)
+            session = self.session()
+            assumptions = session.nonneg(atoms) if domains else ()
+            found = session.check(z3.Not(term) if negate else term, assumptions=assumptions) == z3.unsat
+            self._unsat.put(key, found)
+        return found
+
+    def is_contingent(self, node: HNode) -> bool:
+        """Whether `node` is satisfiable and falsifiable with non-negative atoms (hence also without)."""
+        return not self._is_unsat(node, False, True) and not self._is_unsat(node, True, True)
+
+    def _nonneg_atoms(self, t1, t2) -> FrozenSet[z3.ArithRef]:
+        """Atoms whose domain is assumed when checking translations `t1` against `t2`."""
+        _, atoms1, flags1 = t1
+        _, atoms2, flags2 = t2
+        if self.nonneg and ((flags1 | flags2) & HAS_SCALE or _mixes_eq(flags1, flags2)):
+            return atoms1 | atoms2
+        return _EMPTY
+
+    def _query(self, node1, node2):
+        t1 = self.translate(node1)
+        t2 = self.translate(node2)
+        session = self.session()
+        return session, t1[0], t2[0], session.nonneg(self._nonneg_atoms(t1, t2))
+
+    def implies(self, node1, node2) -> bool:
+        """Whether predicate `node1` implies `node2` (unknown counts as no)."""
+        session, f1, f2, assumptions = self._query(node1, node2)
+        return session.entails(f1, f2, assumptions) == z3.unsat
+
+    def implies_both(self, node1, node2) -> Tuple[bool, bool]:
+        """`(implies(node1, node2), implies(node2, node1))` in one solver scope."""
+        session, f1, f2, assumptions = self._query(node1, node2)
+        r12, r21 = session.entails_both(f1, f2, assumptions)
+        return r12 == z3.unsat, r21 == z3.unsat
+
+    def implies_many(self, node, others: Sequence, reverse: bool = False) -> List[bool]:
+        """
+        `implies(node, o)` for each of `others` (`implies(o, node)` if
+        `reverse`). `node` itself is a trivial yes. When a candidate shares no
+        symbol with `node`, `a -> b` holds iff `a` is unsatisfiable or `b`
+        is valid, which is decided once per predicate and cached; the rest
+        are checked against `node` asserted once in a single solver scope.
+        """
+        node = node if isinstance(node, HNode) else intern_ast(node)
+        others = [o if isinstance(o, HNode) else intern_ast(o) for o in others]
+        fixed = self.translate(node)
+        fixed_symbols = self.symbols(node)
+        out: List[bool] = [True] * len(others)
+        todo = []
+        for i, o in enumerate(others):
+            if o is node:
+                continue
+            if fixed_symbols.isdisjoint(self.symbols(o)):
+                domains = bool(self._nonneg_atoms(fixed, self.translate(o)))
+                lhs, rhs = (o, node) if reverse else (node, o)
+                out[i] = self._is_unsat(lhs, False, domains) or self._is_unsat(rhs, True, domains)
+            else:
+                todo.append(i)
+        if not todo:
+            return out
+        terms = [self.translate(others[i]) for i in todo]
+        session = self.session()
+        needs = [self._nonneg_atoms(fixed, t) for t in terms]
+        # Declare all domains in one go: a session that starts over drops earlier guards.
+        union = frozenset().union(*needs)
+        guards = dict(zip(union, session.nonneg(union)))
+        assumptions = [[guards[a] for a in need] for need in needs]
+        results = session.entails_many(fixed[0], [t[0] for t in terms], assumptions, reverse)
+        for i, r in zip(todo, results):
+            out[i] = r == z3.unsat
+        return out
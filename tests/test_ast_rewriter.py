@@ -0,0 +1,75 @@
+import unittest
+
+from src.sindi.ast_rewriter import ASTRewriter
+from src.sindi.comparator_light import normalize_ast
+from src.sindi.hashcons import intern_ast, make_node
+from src.sindi.parser import Parser
+from src.sindi.tokenizer import Tokenizer
+
+
+def n(value, *children):
+    return make_node(value, children)
+
+
+class TestASTRewriter(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = Tokenizer()
+        self.rewriter = ASTRewriter()
+
+    def normalize(self, predicate):
+        return self.rewriter.normalize(Parser(self.tokenizer.tokenize(predicate)).parse(), intern=True)
+
+    def test_rules_apply_in_pass_order(self):
+        # !! is cancelled after boolean-equality folding, so `true == x` survives.
+        self.assertIs(self.normalize("!!true == x"), n('==', n('true'), n('x')))
+        # A subtraction is moved across a relation once, not repeatedly.
+        self.assertIs(self.normalize("a - b - c < d"),
+                      n('<', n('-', n('a'), n('b')), n('+', n('c'), n('d'))))
+        # The finalized-bitmask rewrite runs after sorting and does not re-sort.
+        self.assertIs(self.normalize("(x & MarketplaceLib.FLAG_MASK_FINALIZED) == 0 && y < 1"),
+                      n('&&', n('<', n('y'), n('1')),
+                        n('!', n('MarketplaceLib.isFinalized()', n('x')))))
+        self.assertIs(self.normalize("isOwner() && now > t"),
+                      n('&&', n('==', n('msg.sender'), n('owner()')),
+                        n('>', n('block.timestamp'), n('t'))))
+
+    def test_light_normalizer_skips_local_forms(self):
+        ast = Parser(self.tokenizer.tokenize("x == false && isOwner()")).parse()
+        self.assertIs(normalize_ast(ast), n('&&', n('!', n('x')), n('isOwner()')))
+
+    def test_deep_chain_without_recursion_limit(self):
+        depth = 5000
+        node = self.normalize(" - ".join(f"x{i}" for i in range(depth)) + " > y == true")
+        self.assertEqual(node.value, '>')
+        self.assertIs(node.children[1], n('+', n(f"x{depth - 1}"), n('y')))
+        node = node.children[0]
+        for i in range(depth - 2, 0, -1):
+            self.assertEqual((node.value, node.children[1].value), ('-', f"x{i}"))
+            node = node.children[0]
+        self.assertIs(node, n('x0'))
+
+    def test_memo_counts_repeated_subtrees_and_stays_bounded(self):
+        preds = ["msg.sender == owner() && x - 1 < y", "x - 1 < y || msg.sender == owner()",
+                 "balances[to] + amount <= cap"]
+        plain = ASTRewriter(memo_size=0)
+        self.assertIsNone(plain.memo)
+        rewriter = ASTRewriter(memo_size=4)
+        for p in preds:
+            ast = Parser(self.tokenizer.tokenize(p)).parse()
+            self.assertIs(rewriter.normalize(ast, intern=True), plain.normalize(ast, intern=True))
+        info = rewriter.memo.cache_info()
+        # `x - 1`, `x - 1 < y` and `msg.sender == owner()` repeat in the second predicate.
+        self.assertEqual((info.hits, info.misses), (3, 8))
+        self.assertEqual((info.currsize, info.maxsize, info.evictions), (4, 4, 4))
+
+        # An interned input that is already memoized is answered at the root.
+        raw = intern_ast(Parser(self.tokenizer.tokenize(preds[2])).parse())
+        hits = rewriter.memo.hits
+        self.assertIs(rewriter.normalize(raw, intern=True), plain.normalize(raw, intern=True))
+        self.assertEqual(rewriter.memo.hits, hits + 1)
+        rewriter.memo.cache_clear()
+        self.assertEqual(rewriter.memo.cache_info(), (0, 0, 0, 4, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import pytest
+from src.sindi.batch import compare_many
+from src.sindi.comparator import Comparator
+from src.sindi.verdict import Verdict
+
+PAIRS = [
+    ("a > b", "a >= b"),
+    ("x >", "y > 1"),  # parse error
+    ("x > 10", "x > 5"),
+    ("a > b / 2", "a > b"),
+    ("msg.sender == owner && x > 1", "x > 1"),
+    ("isOwner()", "msg.sender == owner()"),
+] * 3
+
+
+@pytest.mark.parametrize("engine", ["z3", "cascade", "light"])
+def test_compare_many_streams_in_order_and_isolates_failures(engine):
+    results = list(compare_many(PAIRS, engine=engine, workers=2, chunksize=2))
+    assert [r.index for r in results] == list(range(len(PAIRS)))
+    for r, (p1, p2) in zip(results, PAIRS):
+        if p1 == "x >":
+            assert r.verdict is None and r.error.startswith("ValueError")
+        else:
+            assert r.error is None and r.verdict == Comparator(engine="z3").compare(p1, p2)
+    assert list(compare_many(PAIRS, engine=engine, workers=1)) == results
+
+
+def test_compare_many_unordered_detailed_and_validation():
+    results = list(compare_many(PAIRS, engine="z3", workers=3, chunksize=1, ordered=False, detailed=True))
+    assert sorted(r.index for r in results) == list(range(len(PAIRS)))
+    assert all(isinstance(r.verdict, Verdict) for r in results if r.error is None)
+    stream = compare_many(iter(PAIRS), engine="light", workers=2)
+    assert next(stream).verdict == "The first predicate is stronger."
+    stream.close()  # shuts the pool down early
+    for bad in (dict(engine="smt"), dict(workers=0), dict(chunksize=0), dict(engine="light", detailed=True),
+                dict(workers=2, isolate=True), dict(timeout_ms=-1)):
+        with pytest.raises(ValueError):
+            compare_many(PAIRS, **bad)
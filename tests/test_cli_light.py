@@ -47,3 +47,17 @@ def test_cli_compare_rules_only(p1, p2, expected):
     rc, out, _ = run_cli("compare", p1, p2, "--light")
     assert rc == 0
     assert out.strip() == expected
+
+
+def test_light_commands_do_not_import_solvers():
+    # -X importtime lists every module the process imported on stderr.
+    for args in (["rewrite", "now > a"], ["parse", "now > a"], ["compare", "a > b", "a >= b", "--light"]):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "src.sindi", *args],
+                              cwd=str(REPO_ROOT), env=ENV, text=True, capture_output=True)
+        assert proc.returncode == 0, proc.stderr
+        imported = {line.split("|")[-1].strip() for line in proc.stderr.splitlines() if line.startswith("import time:")}
+        assert "sympy" not in imported and "z3" not in imported, args
+    proc = subprocess.run([sys.executable, "-c", "import sys, src.sindi as s; s.ComparatorRulesOnly; "
+                           "print('sympy' in sys.modules, 'z3' in sys.modules)"],
+                          cwd=str(REPO_ROOT), env=ENV, text=True, capture_output=True)
+    assert proc.stdout.split() == ["False", "False"], proc.stderr
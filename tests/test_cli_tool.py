@@ -111,6 +111,26 @@ def test_cli_compare_full(p1, p2, expected):
     assert out.strip() == expected
 
 
+def test_cli_compare_z3_engine():
+    rc, out, _ = run_cli("compare", "a > b / 2", "a > b", "--engine", "z3")
+    assert rc == 0
+    assert out.strip() == "The second predicate is stronger."
+
+
+def test_cli_compare_cascade_engine():
+    rc, out, _ = run_cli("compare", "a > b", "a >= b", "--engine", "cascade", "--json")
+    assert rc == 0
+    data = json.loads(out)
+    assert data["verdict"] == "The first predicate is stronger."
+    assert data["tier"] == "rules"
+
+
+def test_cli_compare_with_budget():
+    rc, out, _ = run_cli("compare", "a > b", "a >= b", "--timeout-ms", "10000", "--isolate")
+    assert rc == 0
+    assert out.strip() == "The first predicate is stronger."
+
+
 def test_cli_compare_from_files(tmp_path: Path):
     p1 = tmp_path / "p1.txt"
     p2 = tmp_path / "p2.txt"
@@ -127,3 +147,15 @@ def test_cli_compare_verbose_json_payload():
     assert data["verdict"] == "The predicates are equivalent."
     assert "rewritten" in data and "ast" in data
     assert "p1" in data["rewritten"] and "p2" in data["rewritten"]
+
+
+def test_cli_cache_stats_and_clear(tmp_path: Path):
+    path = str(tmp_path / "verdicts.sqlite3")
+    for _ in range(2):
+        rc, out, _ = run_cli("compare", "a > b", "a >= b", "--engine", "z3", "--cache", path)
+        assert out.strip() == "The first predicate is stronger."
+    rc, out, _ = run_cli("cache", "stats", "--path", path, "--json")
+    stats = json.loads(out)
+    assert stats["entries"] == 1 and stats["hits"] == 1
+    rc, out, _ = run_cli("cache", "clear", "--path", path)
+    assert rc == 0 and out.startswith("Cleared 1 verdicts")
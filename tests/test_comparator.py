@@ -2,6 +2,7 @@ import json
 from pathlib import Path
 import pytest
 from src.sindi.comparator import Comparator
+from src.sindi.cascade import CascadeComparator
 
 # --- Test Case Loading ---
 
@@ -46,4 +47,214 @@ def test_comparator_with_json_data(predicate1, predicate2, expected):
     actual_result = comparator.compare(predicate1, predicate2)
 
     # Assert that the actual result from the comparator matches the expected outcome
-    assert actual_result == expected
\ No newline at end of file
+    assert actual_result == expected
+
+@pytest.mark.parametrize("predicate1, predicate2, expected", load_test_cases())
+def test_z3_engine_with_json_data(predicate1, predicate2, expected):
+    assert Comparator(engine="z3").compare(predicate1, predicate2) == expected
+
+CASCADE = CascadeComparator()
+
+@pytest.mark.parametrize("predicate1, predicate2, expected", load_test_cases())
+def test_cascade_with_json_data(predicate1, predicate2, expected):
+    assert CASCADE.compare(predicate1, predicate2) == expected
+    assert CASCADE.last_tier in ("rules", "solver")
+
+def test_cascade_escalates_only_undecided_pairs():
+    cascade = CascadeComparator()
+    assert cascade.compare("a > b", "a >= b") == "The first predicate is stronger."
+    assert cascade.last_tier == "rules"
+    assert cascade.compare("x > 0", "y > 0") == "The predicates are not equivalent and neither is stronger."
+    assert cascade.last_tier == "rules"
+    verdict = cascade.compare_detailed("a > b / 2", "a > b")
+    assert verdict.text == "The second predicate is stronger."
+    assert cascade.last_tier == "solver" and verdict.decided_by == "sympy"
+    assert verdict.timings_ns["rules"] > 0 and verdict.timings_ns["solver"] > 0
+    assert cascade.tier_counts == {"rules": 2, "solver": 1}
+
+def test_z3_engine_translates_ast_directly():
+    import z3
+    comparator = Comparator(engine="z3")
+    p = comparator.prepare("balances[f(a, b + 1)].amount >= x")
+    # Index/call atoms name one constant per (normalized) structure.
+    assert comparator.implies("balances[f(a, 1 + b)].amount > x", p)
+    assert not comparator.implies("balances[f(b, 1 + a)].amount > x", p)
+    assert isinstance(p.z3, z3.BoolRef) and p.z3 is p.z3
+    # `&` and `%` are uninterpreted functions.
+    assert comparator.compare("(flags & 4) != 0", "(flags & 4) > 0") == "The second predicate is stronger."
+    assert comparator.compare("x % 2 == 0", "x % 2 == 0 || y > 1") == "The first predicate is stronger."
+    with pytest.raises(ValueError):
+        Comparator(engine="smt")
+    chain = " + ".join(f"x{i}" for i in range(3000))
+    assert comparator.compare(f"{chain} > 1", f"{chain} >= 1") == "The first predicate is stronger."
+
+def test_z3_queries_share_one_session_per_thread():
+    import threading
+    import z3
+    from src.sindi.z3_engine import SolverSession
+    comparator = Comparator(engine="z3")
+    session = comparator.z3_translator.session()
+    assert comparator.compare("a > b / 2", "a > b") == "The second predicate is stronger."
+    assert comparator.compare("x == 1", "x > 0") == "The first predicate is stronger."
+    assert comparator.z3_translator.session() is session and session.solver.num_scopes() == 0
+    assert len(session.nonneg([z3.Real("a"), z3.Real("b"), z3.Real("x")])) == 3
+    assert len(session.solver.assertions()) == 3  # one guarded domain per symbol
+    other = []
+    thread = threading.Thread(target=lambda: other.append(comparator.z3_translator.session()))
+    thread.start()
+    thread.join()
+    assert other[0] is not session
+
+    small = SolverSession(max_symbols=2)
+    x, y, z = z3.Reals("x y z")
+    small.nonneg([x, y])
+    assert small.entails(x + y < 0, x < 0, small.nonneg([x, y])) == z3.unsat
+    assert small.entails_both(x > 1, x > 0) == (z3.unsat, z3.sat)
+    small.nonneg([z])  # over the limit: starts over
+    assert len(small.solver.assertions()) == 1
+
+def test_entails_many_pops_its_scopes_when_a_check_raises(monkeypatch):
+    import z3
+    from src.sindi.z3_engine import SolverSession
+    session = SolverSession()
+    x = z3.Real("x")
+    session.nonneg([x])
+    before = len(session.solver.assertions())
+
+    def fail(*assumptions):
+        raise z3.Z3Exception("canceled")
+
+    monkeypatch.setattr(session, "_check", fail)
+    with pytest.raises(z3.Z3Exception):
+        session.entails_many(x > 1, [x > 0, x > 2])
+    assert session.solver.num_scopes() == 0
+    assert len(session.solver.assertions()) == before
+
+@pytest.mark.parametrize("engine", ["sympy", "z3"])
+def test_implies_many_matches_implies(engine):
+    comparator = Comparator(engine=engine)
+    base = comparator.prepare("a > b / 2 && x > 10")
+    candidates = ["x > 5", "a > b", "a > b / 2 && x > 10", "y < 3", "y >= 0", "x > x", "x != x",
+                  "(flags & 4) != 0", "a > b / 2 && x > 10 || y == 1"]
+    assert comparator.implies_many(base, candidates) == [comparator.implies(base, c) for c in candidates]
+    assert comparator.implied_by_many(base, candidates) == [comparator.implies(c, base) for c in candidates]
+    if engine == "z3":  # no shared symbols: decided by (un)satisfiability of each side
+        assert comparator.implies_many("x > x", ["x != x", "y > 0"]) == [False, True]
+        assert comparator.implied_by_many("y > 0", ["z == 1", "y - 1 > 0"]) == [False, True]
+
+def test_compare_detailed_reports_implications_and_stage_times():
+    from src.sindi.verdict import STAGES, Outcome
+    comparator = Comparator(simplify_cache_size=0)
+    verdict = comparator.compare_detailed("a > b", "a >= b")
+    assert verdict.outcome is Outcome.FIRST_STRONGER and str(verdict) == comparator.compare("a > b", "a >= b")
+    assert (verdict.implies_1_to_2, verdict.implies_2_to_1, verdict.decided_by) == (True, False, "sympy")
+    assert set(verdict.timings_ns) == set(STAGES)
+    for stage in ("rewrite", "tokenize", "parse", "normalize", "sympy", "simplify", "solver"):
+        assert verdict.timings_ns[stage] > 0, stage
+    assert verdict.timings_ns["rules"] == 0
+    # Stages a prepared predicate already computed are not paid again.
+    p1, p2 = comparator.prepare("x > 1"), comparator.prepare("x > 2")
+    comparator.compare(p1, p2)
+    again = comparator.compare_detailed(p1, p2)
+    assert again.outcome is Outcome.SECOND_STRONGER and again.timings_ns["parse"] == 0
+    z3_verdict = Comparator(engine="z3").compare_detailed("x > x", "x != x")
+    assert (z3_verdict.decided_by, z3_verdict.timings_ns["solver"]) == ("rules", 0)
+
+def test_quiet_mode_skips_debug_only_work(monkeypatch, capsys):
+    import src.sindi.comparator as comparator_module
+    from src.sindi.utils import debug_logging
+    calls = []
+    satisfiable = comparator_module.satisfiable
+    monkeypatch.setattr(comparator_module, "satisfiable", lambda *a, **kw: calls.append(a) or satisfiable(*a, **kw))
+    comparator = Comparator(simplify_cache_size=0)
+    with debug_logging(False):
+        assert comparator.compare("a > b", "a >= b") == "The first predicate is stronger."
+    assert len(calls) == 2 and capsys.readouterr().out == ""  # one check per direction, nothing printed
+    with debug_logging(True):
+        comparator.compare("a > b", "a >= b")
+    assert len(calls) == 4 and "Implication a > b -> a >= b using satisfiable: True" in capsys.readouterr().out
+
+def test_budget_exceeded_gives_unknown_verdict():
+    import time
+    from src.sindi.budget import UNKNOWN_VERDICT
+    terms = " * ".join(f"(a{i} + b{i} - c{i})" for i in range(6))
+    slow = (f"{terms} > x && x >= y / 3", f"{terms} >= x + 1 || y > 2 * x")  # ~45s of sp.simplify
+    for comparator in (Comparator(simplify_cache_size=0, timeout_ms=200),
+                       Comparator(simplify_cache_size=0, isolate=True)):
+        t0 = time.perf_counter()
+        verdict = comparator.compare_detailed(*slow, timeout_ms=200)
+        assert verdict.text == UNKNOWN_VERDICT and verdict.implies_1_to_2 is None
+        assert time.perf_counter() - t0 < 5
+        # The comparator stays usable (an isolated worker is restarted).
+        assert comparator.compare("a > b", "a >= b", timeout_ms=10000) == "The first predicate is stronger."
+        comparator.close()
+    n = 6
+    hard = (" && ".join(f"x{i} * x{i} * y{i} - x{(i+1)%n} * y{(i+2)%n} * 3 > x{(i+3)%n} * y{i} * 7 - 5" for i in range(n)),
+            " || ".join(f"x{i} * y{i} * y{(i+1)%n} < x{(i+2)%n} * x{i} + 2" for i in range(n)))
+    assert Comparator(engine="z3").compare(*hard, timeout_ms=200) == UNKNOWN_VERDICT
+    with pytest.raises(ValueError):
+        Comparator(timeout_ms=0)
+
+def test_prepared_predicates_cache_stages_and_match_compare():
+    comparator = Comparator()
+    base = comparator.prepare("a >= b && x > 10")
+    ast, simplified = base.ast, base.simplified
+    for other in ("a >= b", "x > 5 && a >= b", "y < 3"):
+        assert comparator.compare(base, comparator.prepare(other)) == comparator.compare(base.text, other)
+    assert base.ast is ast and base.simplified is simplified
+    assert comparator.implies(base, "x > 5") and not comparator.implies("x > 5", base)
+    assert comparator.implies("x > x", "x != x") is False
+    assert base.z3 is base.z3
+    # A predicate prepared by another comparator is re-prepared, not trusted.
+    from src.sindi.comparator_light import ComparatorRulesOnly
+    light = ComparatorRulesOnly().prepare("a >= b")
+    assert comparator.compare(light, "a > b") == "The second predicate is stronger."
+    with pytest.raises(ValueError):
+        light.sympy
+
+
+def test_simplify_cache_counts_and_bounds(monkeypatch):
+    comparator = Comparator(simplify_cache_size=2)
+    assert comparator.simplify_cache is not Comparator().simplify_cache
+    for _ in range(2):
+        assert comparator.compare("a + 1 > b", "b < 1 + a") == "The predicates are equivalent."
+    assert comparator.compare("x > 2", "x >= 2") == "The first predicate is stronger."
+    info = comparator.simplify_cache.cache_info()
+    assert info.hits == 2 and info.currsize == info.maxsize == 2 and info.evictions > 0
+    assert Comparator(simplify_cache_size=0).simplify_cache is None
+
+    import src.sindi.comparator as comparator_module
+    monkeypatch.setattr(comparator_module, "_shared_simplify_cache", None)
+    monkeypatch.setenv("SINDI_SIMPLIFY_CACHE_SIZE", "7")
+    assert Comparator().simplify_cache.maxsize == 7
+    monkeypatch.setattr(comparator_module, "_shared_simplify_cache", None)
+    monkeypatch.setenv("SINDI_SIMPLIFY_CACHE_SIZE", "lots")
+    with pytest.raises(ValueError):
+        Comparator()
+
+
+def test_simplify_strategies_and_budget():
+    import sympy as sp
+    a, b = sp.symbols("a b")
+    expr = sp.And(a + 1 > b, sp.Or(a + 1 > b, b < 0))
+    assert Comparator(simplify_strategy="none")._simplify(expr) is expr
+    assert Comparator(simplify_strategy="logic")._simplify(expr) == (a - b > -1)
+    linear = Comparator(simplify_strategy="linear")
+    assert linear._simplify(2 * (a - b) >= 2 - b) == linear._simplify(2 - b <= 2 * a - 2 * b)
+    assert linear._simplify(2 * (a - b) >= 2 - b) == (b + 2 - 2 * a <= 0)
+    assert Comparator(simplify_cache_size=0, simplify_budget=2)._simplify(expr) is expr
+    with pytest.raises(ValueError):
+        Comparator(simplify_strategy="fast")
+    for strategy in ("logic", "linear", "none"):
+        comparator = Comparator(simplify_strategy=strategy)
+        assert comparator.compare("a - 1 < b", "a <= b") == "The second predicate is stronger."
+
+
+def test_algebraic_equivalence_ignores_strategy_and_budget():
+    import sympy as sp
+    a, b, c = sp.symbols("a b c")
+    f = sp.Function("f")
+    for kwargs in ({}, {"simplify_strategy": "none"}, {"simplify_strategy": "logic"}, {"simplify_budget": 1}):
+        comparator = Comparator(**kwargs)
+        assert comparator._implies(a * (b + c), a * b + a * c)
+        assert comparator._implies(f(a * (b + c)), f(a * b + a * c))
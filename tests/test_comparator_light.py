@@ -1,4 +1,4 @@
-from src.sindi.comparator_light import ComparatorRulesOnly
+from src.sindi.comparator_light import ComparatorRulesOnly, decide_implication
 
 C = ComparatorRulesOnly()
 
@@ -32,3 +32,25 @@ def test_mul_factors_rhs():
 def test_owner_rewrites_work_the_same():
     assert C.compare("isOwner()", "msg.sender == owner()") == "The predicates are equivalent."
     assert C.compare("_owner == msg.sender", "owner() == msg.sender") == "The predicates are equivalent."
+
+def test_prepared_predicates_and_implies():
+    base = C.prepare("a >= b && x > 10")
+    assert C.compare(base, "a >= b") == "The first predicate is stronger."
+    assert C.implies(base, C.prepare("x > 5")) and not C.implies("x > 5", base)
+    assert C.implies("x > x", "x != x") is False and C.implies("x != x", "x > x") is True
+    assert base.ast is C.prepare("x > 10 && a >= b").ast
+
+def test_implies_many_matches_implies():
+    candidates = ["x > 5", "a >= b", "x > x", "a >= b && x > 10", "y < 3"]
+    assert C.implies_many("a >= b && x > 10", candidates) == [
+        C.implies("a >= b && x > 10", c) for c in candidates]
+    assert C.implied_by_many("x != x", candidates) == [C.implies(c, "x != x") for c in candidates]
+
+def test_decide_implication_is_tri_state():
+    ast = lambda s: C.prepare(s).ast
+    assert decide_implication(ast("a >= b && x > 10"), ast("x > 10")) is True
+    assert decide_implication(ast("x > 10"), ast("a >= b && x > 10")) is False
+    assert decide_implication(ast("x > 0"), ast("y > 0")) is False
+    assert decide_implication(ast("a < b"), ast("a < b || c")) is True
+    assert decide_implication(ast("x > 0"), ast("x != 0")) is None  # equal under non-negative domains
+    assert decide_implication(ast("a > b / 2"), ast("a > b")) is None
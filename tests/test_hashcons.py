@@ -0,0 +1,66 @@
+import pickle
+import unittest
+
+from src.sindi.ast_rewriter import ASTRewriter
+from src.sindi.comparator_light import ComparatorRulesOnly, normalize_ast
+from src.sindi.hashcons import HNode, intern_ast, make_node, same_tree
+from src.sindi.parser import ASTNode, LITERAL_INT, Parser
+from src.sindi.tokenizer import Tokenizer
+
+
+class TestHashCons(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = Tokenizer()
+
+    def parse(self, predicate):
+        return Parser(self.tokenizer.tokenize(predicate)).parse()
+
+    def test_structurally_equal_trees_are_identical(self):
+        a = intern_ast(self.parse("balances[to] + amount <= cap && !paused"))
+        b = intern_ast(self.parse("balances[to] + amount <= cap && !paused"))
+        self.assertIs(a, b)
+        self.assertIsNot(a, intern_ast(self.parse("balances[to] + amount < cap && !paused")))
+        self.assertIs(make_node("+", [make_node("x"), make_node("1")]),
+                      make_node("+", (make_node("x"), make_node("1"))))
+        self.assertEqual(len({a, b}), 1)
+
+    def test_repr_and_round_trip_match_astnode(self):
+        ast = self.parse("f(a, b)[i].c != 0 || x == y")
+        node = intern_ast(ast)
+        self.assertEqual(repr(node), repr(ast))
+        self.assertEqual(node.sort_key(), repr(ast))
+        copy = node.to_ast()
+        self.assertIsInstance(copy, ASTNode)
+        self.assertEqual(repr(copy), repr(ast))
+        self.assertIs(pickle.loads(pickle.dumps(node)), node)
+
+    def test_nodes_are_immutable(self):
+        node = make_node("a")
+        with self.assertRaises(AttributeError):
+            node.value = "b"
+        self.assertIsInstance(node.children, tuple)
+        self.assertEqual((make_node("42").kind, make_node("42").literal), (LITERAL_INT, 42))
+
+    def test_same_tree_falls_back_to_repr(self):
+        self.assertTrue(same_tree(ASTNode("a"), make_node("a")))
+        self.assertFalse(same_tree(make_node("a"), make_node("b")))
+
+    def test_normalizers_return_interned_trees(self):
+        ast = self.parse("b + a == x - 1 && true == c")
+        self.assertIsInstance(ASTRewriter().normalize(ast, intern=True), HNode)
+        mutable = ASTRewriter().normalize(ast)  # the default: a fresh ASTNode
+        self.assertIsInstance(mutable, ASTNode)
+        self.assertEqual(repr(mutable), repr(ASTRewriter().normalize(ast, intern=True)))
+        self.assertIs(normalize_ast(ast), normalize_ast(self.parse("c && a + b == x - 1")))
+        self.assertEqual(ast.value, '&&')  # caller's tree untouched
+        self.assertEqual(repr(ast.children[1].children[0]), repr(ASTNode('true')))
+
+    def test_wide_conjunction_subsumption(self):
+        atoms = [f"v{i} >= {i}" for i in range(200)]
+        big = " && ".join(f"({a})" for a in reversed(atoms))
+        small = " && ".join(atoms[::3])
+        self.assertEqual(ComparatorRulesOnly().compare(big, small), "The first predicate is stronger.")
+
+
+if __name__ == '__main__':
+    unittest.main()
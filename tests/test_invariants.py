@@ -0,0 +1,28 @@
+import pytest
+from src.sindi.invariants import InvariantSet
+
+PREDICATES = ["x > 1", "x > 5", "y == 2", "y > 0", "balances[msg.sender] > 0", "msg.sender == owner", "x >"]
+
+
+def test_invariant_set_add_remove_and_sync():
+    s = InvariantSet(PREDICATES, engine="z3")
+    assert s.strongest == ["x > 5", "y == 2", "balances[msg.sender] > 0", "msg.sender == owner", "x >"]
+    assert s.stronger_than("x > 1") == {"x > 5"} and list(s.errors) == ["x >"]
+    assert s.comparisons == 2  # the x- and y-pairs only; "x >" is never compared
+    s.remove("x > 5")
+    assert "x > 1" in s.strongest and s.comparisons == 2
+    assert s.add("x > 5") is True and s.comparisons == 2  # the stored edge answers
+    added, removed = s.sync(["x > 1", "x > 9", "y == 2", "y > 0"])
+    assert added == ["x > 9"] and len(removed) == 4
+    assert s.strongest == ["y == 2", "x > 9"]
+    with pytest.raises(ValueError):
+        s.remove("z > 0")
+
+
+def test_invariant_set_save_and_load(tmp_path):
+    s = InvariantSet(PREDICATES, engine="z3")
+    s.save(tmp_path / "set.json")
+    loaded = InvariantSet.load(tmp_path / "set.json")
+    assert loaded.engine == "z3" and list(loaded) == list(s) and loaded.strongest == s.strongest
+    loaded.sync(PREDICATES + ["x >= 7"])
+    assert loaded.comparisons == 1 and loaded.stronger_than("x > 5") == {"x >= 7"}
@@ -0,0 +1,27 @@
+import pytest
+from src.sindi.comparator import Comparator
+from src.sindi.order import implication_matrix
+
+PREDICATES = ["x > 5", "x > 1", "x >= 2", "x > 5", "1 < x", "x > 0 && x > 1", "y == 0", "x > 5 && y == 0"]
+
+
+@pytest.mark.parametrize("engine", ["z3", "cascade", "light"])
+def test_implication_matrix_matches_pairwise_implies(engine):
+    order = implication_matrix(PREDICATES, engine=engine)
+    if engine != "light":
+        cmp = Comparator(engine="z3")
+        assert order.matrix == [[p == q or cmp.implies(p, q) for q in PREDICATES] for p in PREDICATES]
+    assert order.comparisons < order.naive_comparisons == 8 * 7
+    assert order.class_of[0] == order.class_of[3]  # same normalized AST
+
+
+def test_implication_matrix_classes_and_hasse_diagram():
+    order = implication_matrix(PREDICATES, engine="z3")
+    classes = [sorted(PREDICATES[i] for i in members) for members in order.classes]
+    assert classes == [["x > 5", "x > 5"], ["1 < x", "x > 0 && x > 1", "x > 1"], ["x >= 2"], ["y == 0"],
+                       ["x > 5 && y == 0"]]  # over the reals, x >= 2 is strictly stronger than x > 1
+    assert sorted(order.hasse) == [(0, 2), (2, 1), (4, 0), (4, 3)]  # no (0, 1): it goes through x >= 2
+    chain = implication_matrix([f"x > {c}" for c in range(10)], engine="z3")
+    assert len(chain.hasse) == 9 and chain.comparisons < chain.naive_comparisons / 2
+    with pytest.raises(ValueError):
+        implication_matrix(PREDICATES, engine="smt")
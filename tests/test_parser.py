@@ -1,6 +1,7 @@
 import unittest
 from src.sindi.tokenizer import Tokenizer
-from src.sindi.parser import Parser, ASTNode
+from src.sindi.parser import Parser, ASTNode, ASTArena, ArenaNode, OPCODES, KIND_NAMES, node_kind
+from src.sindi.ast_rewriter import ASTRewriter
 
 
 class TestParser(unittest.TestCase):
@@ -41,7 +42,105 @@ class TestParser(unittest.TestCase):
         parser = Parser(tokens)
         ast = parser.parse()
         expected_ast = ASTNode('obj.methodCall(param1, param2)')
-      
+
+    def test_parse_precedence_and_prefix(self):
+        ast = Parser(self.tokenizer.tokenize("-a * b + c > d || !e")).parse()
+        expected_ast = ASTNode('||', [
+            ASTNode('>', [
+                ASTNode('+', [ASTNode('*', [ASTNode('-', [ASTNode('a')]), ASTNode('b')]), ASTNode('c')]),
+                ASTNode('d'),
+            ]),
+            ASTNode('!', [ASTNode('e')]),
+        ])
+        self.assertEqual(repr(ast), repr(expected_ast))
+
+    def test_parse_postfix_chain(self):
+        ast = Parser(self.tokenizer.tokenize("balances[f(a, b + 1)].amount >= x.y()")).parse()
+        expected_ast = ASTNode('>=', [
+            ASTNode('balances[].amount', [
+                ASTNode('f()', [ASTNode('a'), ASTNode('+', [ASTNode('b'), ASTNode('1')])]),
+            ]),
+            ASTNode('x.y()'),
+        ])
+        self.assertEqual(repr(ast), repr(expected_ast))
+
+    def test_parse_long_disjunction_without_recursion_limit(self):
+        n = 10000
+        tokens = self.tokenizer.tokenize(" || ".join(f"x == {i}" for i in range(n)))
+        node = Parser(tokens).parse()
+        depth = 0
+        while node.value == '||':
+            self.assertEqual(node.children[1].value, '==')
+            node = node.children[0]
+            depth += 1
+        self.assertEqual(depth, n - 1)
+        self.assertEqual(repr(node), repr(ASTNode('==', [ASTNode('x'), ASTNode('0')])))
+
+    def test_parse_errors(self):
+        for predicate in ("a >", "f(a", "a[1", "(a", "a."):
+            with self.assertRaises(ValueError):
+                Parser(self.tokenizer.tokenize(predicate)).parse()
+
+    def test_node_kinds_and_literals(self):
+        ast = Parser(self.tokenizer.tokenize(
+            "-a.b + balances[f(x, 1_000)].amount * 2.5 > owner() && true != !c")).parse()
+        seen = {}
+        stack = [ast]
+        while stack:
+            node = stack.pop()
+            seen[node.value] = (KIND_NAMES[node.kind], node.literal)
+            stack.extend(node.children)
+        self.assertEqual(seen, {
+            '&&': ('binary-op', None), '>': ('binary-op', None), '+': ('binary-op', None),
+            '*': ('binary-op', None), '!=': ('binary-op', None),
+            '-': ('unary', None), '!': ('unary', None),
+            'a.b': ('member', None), 'c': ('identifier', None), 'x': ('identifier', None),
+            'balances[].amount': ('member', None), 'f()': ('call', None), 'owner()': ('call', None),
+            '1000': ('literal-int', 1000), '2.5': ('literal-float', 2.5), 'true': ('literal-bool', True),
+        })
+        self.assertEqual(KIND_NAMES[node_kind('a[]', 1)[0]], 'index')
+        self.assertEqual(KIND_NAMES[node_kind('-', 2)[0]], 'binary-op')
+
+    def test_hex_literals_and_reclassify(self):
+        ast = Parser(self.tokenizer.tokenize("x == 0x10")).parse()
+        hex_node = ast.children[1]
+        self.assertEqual((KIND_NAMES[hex_node.kind], hex_node.literal), ('literal-int', 16))
+        self.assertEqual(node_kind('0xZZ', 0)[0], node_kind('x', 0)[0])
+        node = ASTNode('a')
+        node.value, node.children = '!', [ASTNode('b')]
+        node.reclassify()
+        self.assertEqual((KIND_NAMES[node.kind], node.literal), ('unary', None))
+        for tree in (ast, node):
+            copy = ASTArena([tree]).to_ast(0)
+            self.assertEqual((copy.kind, copy.children[0].literal), (tree.kind, tree.children[0].literal))
+
+    def test_arena_round_trip_and_layout(self):
+        preds = ["balances[f(a, b + 1)].amount >= x.y()", "!(a && b) || c % 2 == 0", "owner()"]
+        trees = [Parser(self.tokenizer.tokenize(p)).parse() for p in preds]
+        arena = ASTArena(trees)
+        self.assertEqual(len(arena), 3)
+        self.assertEqual(len(arena.values), len(set(arena.values)))
+        for i, tree in enumerate(trees):
+            self.assertEqual(repr(arena.to_ast(i)), repr(tree))
+            self.assertEqual(repr(arena[i]), repr(tree))
+            self.assertEqual(len(arena.span(i)), len(repr(tree).split('ASTNode(')) - 1)
+        root = arena[1]
+        self.assertIsInstance(root, ArenaNode)
+        self.assertEqual((root.value, OPCODES[root.op]), ('||', '||'))
+        self.assertEqual([c.value for c in root.children], ['!', '=='])
+
+    def test_parse_corpus_records_errors_and_feeds_normalizer(self):
+        preds = ["a - 1 < b", "a >", "x # y", "true == c"]
+        arena = Parser.parse_corpus(self.tokenizer.tokenize_corpus(preds))
+        self.assertEqual(sorted(arena.errors), [1, 2])
+        self.assertEqual([node is None for node in arena], [False, True, True, False])
+        with self.assertRaises(ValueError):
+            arena[2]
+        rewriter = ASTRewriter()
+        for i in (0, 3):
+            ref = rewriter.normalize(Parser(self.tokenizer.tokenize(preds[i])).parse(), intern=True)
+            self.assertIs(rewriter.normalize(arena[i], intern=True), ref)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,56 @@
+import pytest
+from src.sindi import reduce as reduce_module
+from src.sindi.comparator import Comparator
+from src.sindi.comparator_light import ComparatorRulesOnly
+from src.sindi.reduce import Removal, strongest
+
+PREDICATES = ["x > 1", "x >= 2", "x > 5", "1 < x", "x >", "y > 0", "y > 0 && z == 1", "x > 5", "z != 4"]
+
+
+def _maximal(predicates, cmp):
+    """Brute force: predicates no other predicate is strictly stronger than."""
+    return [p for p in predicates
+            if not any(cmp.compare(q, p) == "The first predicate is stronger." for q in predicates)]
+
+
+def test_strongest_matches_all_pairs_and_explains_removals():
+    reduction = strongest(PREDICATES, engine="z3")
+    valid = [p for p in PREDICATES if p != "x >"]
+    assert [p for p in reduction.kept_predicates if p != "x >"] == _maximal(valid, Comparator(engine="z3"))
+    assert reduction.kept_predicates == ["x > 5", "x >", "y > 0 && z == 1", "x > 5"]  # z == 1 -> z != 4
+    assert list(reduction.errors) == [4]  # unparsable: kept and reported
+    assert reduction.removed[0] == Removal(0, "weaker", 2)
+    assert reduction.explain(reduction.removed[0]) == "weaker than 'x > 5'"
+    assert reduction.comparisons < len(valid) * (len(valid) - 1) / 2
+
+
+def test_strongest_equivalents_and_engines():
+    reduction = strongest(["x > 1", "1 < x", "x > 1 && x > 0"], engine="z3", keep_equivalent=False)
+    assert reduction.kept == [0] and {r.reason for r in reduction.removed} == {"equivalent"}
+    assert strongest(["x > 1", "1 < x"], engine="z3").kept == [0, 1]
+    assert strongest(["x >= 1", "x > 5", "x >= 7"], engine="light").kept_predicates == ["x >= 7"]
+    with pytest.raises(ValueError):
+        strongest(PREDICATES, engine="smt")
+
+
+class _Cyclic(ComparatorRulesOnly):
+    """Not transitive: "x > 1" is stronger than "x > 2", "x > 2" than "x > 3", "x > 3" than "x > 1"."""
+    ORDER = ["x > 1", "x > 2", "x > 3"]
+
+    def compare(self, predicate1, predicate2):
+        i, j = self.ORDER.index(predicate1.text), self.ORDER.index(predicate2.text)
+        if i == j:
+            return "The predicates are equivalent."
+        if (i + 1) % 3 == j:
+            return "The first predicate is stronger."
+        return "The second predicate is stronger."
+
+
+def test_strongest_with_a_non_transitive_engine(monkeypatch):
+    monkeypatch.setattr(reduce_module, "_make_comparator", lambda engine, kwargs: _Cyclic(verdict_cache=False))
+    reduction = strongest(_Cyclic.ORDER, engine="light")
+    # Every predicate has a stronger one, so comparing all pairs keeps none;
+    # the running maxima keep the last one visited, and "x > 2" stays removed
+    # by "x > 1" although "x > 1" is removed as well.
+    assert reduction.kept_predicates == ["x > 3"]
+    assert reduction.removed == [Removal(0, "weaker", 2), Removal(1, "weaker", 0)]
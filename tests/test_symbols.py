@@ -0,0 +1,39 @@
+from src.sindi.comparator_light import ComparatorRulesOnly
+from src.sindi.symbols import SymbolIndex, atoms, could_relate, signature, solver_signature
+
+light = ComparatorRulesOnly()
+
+
+def _sig(predicate):
+    return signature(light.prepare(predicate).ast)
+
+
+def test_atoms_and_signatures():
+    assert atoms(light.prepare("balances[msg.sender] > f(x) + 1").ast) == {"balances[]", "msg.sender", "f()", "x"}
+    assert _sig("x > 1 && msg.sender == owner") == {"x", "msg", "owner"}
+    assert _sig("!paused || y != 0") == {"paused", "y"}
+    # Unsatisfiable or valid over the non-negative reals, or not provable: no signature.
+    for predicate in ("x < 0", "x >= 0", "x > x", "a + b > c", "key.a < key.b"):
+        assert _sig(predicate) is None, predicate
+    assert not could_relate(_sig("x > 1"), _sig("y == 2"))
+    assert could_relate(_sig("x > 1"), _sig("x < y")) and could_relate(None, _sig("y == 2"))
+
+
+def test_solver_signature_settles_what_the_rules_cannot():
+    def solver_sig(predicate):
+        return solver_signature(light.prepare(predicate).ast)
+
+    assert solver_sig("a + b > c") == {"a", "b", "c"}
+    assert solver_sig("key.a < key.b") == {"key"}
+    assert solver_sig("a + b >= 0") is None  # valid over the non-negative reals
+    assert solver_sig("a - a > 0") is None  # unsatisfiable
+
+
+def test_symbol_index_related():
+    index = SymbolIndex()
+    for i, p in enumerate(["x > 1", "y == 2", "x < y", "z != 3", "a + b > c"]):
+        index.add(i, _sig(p))
+    assert index.related(_sig("x >= 5")) == {0, 2, 4}
+    assert index.related(None) == {0, 1, 2, 3, 4}
+    index.discard(2)
+    assert index.related(_sig("y > 0")) == {1, 4} and len(index) == 4
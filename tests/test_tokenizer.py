@@ -2,6 +2,7 @@ import unittest
 import csv
 import os
 from src.sindi.tokenizer import Tokenizer
+from src.sindi.parser import Parser
 
 
 
@@ -46,6 +47,48 @@ class TestTokenizer(unittest.TestCase):
     #     self.assertEqual(self.tokenizer.tokenize(predicate), expected_tokens)
 
 
+    def test_numeric_literals_are_canonicalized(self):
+        self.assertEqual(self.tokenizer.tokenize("1_000 + 1e18"), [
+            ('1000', 'INTEGER'),
+            ('+', 'PLUS'),
+            ('1000000000000000000', 'INTEGER'),
+        ])
+        self.assertEqual(self.tokenizer.tokenize("x == 10 ** 18 WEI"), [
+            ('x', 'IDENTIFIER'),
+            ('==', 'EQUAL'),
+            ('1000000000000000000', 'INTEGER'),
+        ])
+
+    def test_longest_operator_wins_by_priority(self):
+        tags = [t for _, t in self.tokenizer.tokenize("!a != b && c & d")]
+        self.assertEqual(tags, ['NOT', 'IDENTIFIER', 'NOT_EQUAL', 'IDENTIFIER',
+                                'AND', 'IDENTIFIER', 'BITWISE_AND', 'IDENTIFIER'])
+
+    def test_unexpected_character(self):
+        with self.assertRaises(ValueError):
+            self.tokenizer.tokenize("a > #b")
+
+    def test_corpus_matches_per_predicate_tokenize(self):
+        preds = ["msg.sender == msg.origin", "a >= 1_000 && b < 1e3", "x # y", "", "f(a, b)[i].c != 0"]
+        corpus = self.tokenizer.tokenize_corpus(preds)
+        self.assertEqual(len(corpus), len(preds))
+        self.assertEqual(list(corpus.errors), [2])
+        with self.assertRaises(ValueError):
+            corpus[2]
+        for i, p in enumerate(preds):
+            if i != 2:
+                self.assertEqual(list(corpus[i]), self.tokenizer.tokenize(p))
+                self.assertEqual(corpus[i].tags(), [tag for _, tag in self.tokenizer.tokenize(p)])
+        self.assertEqual(corpus.predicate_text(4), preds[4])
+
+    def test_corpus_from_text_buffer_feeds_parser(self):
+        corpus = self.tokenizer.tokenize_corpus("a > b\nc <= d + 1\n")
+        self.assertEqual(len(corpus), 2)
+        self.assertEqual(corpus.tag(corpus.bounds[1] + 1), 'LESS_EQUAL')
+        ast = Parser(corpus[1]).parse()
+        ref = Parser(self.tokenizer.tokenize("c <= d + 1")).parse()
+        self.assertEqual(repr(ast), repr(ref))
+
     def test_normalize_complex_predicate(self):
         predicate = "( msg.sender!=msg.origin && a>=b )"
         normalized_predicate = "( msg.sender != msg.origin && a >= b )"
@@ -0,0 +1,58 @@
+from src.sindi.comparator import Comparator
+from src.sindi.comparator_light import ComparatorRulesOnly
+from src.sindi.symbols import solver_signature
+from src.sindi.verdict import Outcome
+from src.sindi.verdict_cache import VerdictCache
+
+
+def test_verdicts_persist_across_comparators_and_answer_the_reversed_pair(tmp_path):
+    path = tmp_path / "verdicts.sqlite3"
+    first = Comparator(engine="z3", verdict_cache=path)
+    assert first.compare_detailed("a > b", "a >= b").decided_by == "z3"
+
+    second = Comparator(engine="z3", verdict_cache=VerdictCache(path))
+    verdict = second.compare_detailed("a >= b", "a > b")
+    assert verdict.decided_by == "cache" and verdict.outcome is Outcome.SECOND_STRONGER
+    assert verdict.timings_ns["cache"] > 0
+    assert second.implies("a > b", "a >= b") and not second.implies("a >= b", "a > b")
+    assert second.verdict_cache.cache_info().hits == 3
+    # Other engines and settings have verdicts of their own.
+    assert Comparator(verdict_cache=path).compare_detailed("a > b", "a >= b").decided_by == "sympy"
+
+
+def test_implies_stores_one_direction(tmp_path):
+    cmp = Comparator(engine="z3", verdict_cache=tmp_path / "verdicts.sqlite3")
+    assert cmp.implies("x > 1", "x > 0")
+    assert cmp.compare_detailed("x > 1", "x > 0").decided_by == "z3"  # the other direction was missing
+    assert cmp.compare_detailed("x > 0", "x > 1").decided_by == "cache"
+
+
+def test_light_comparator_cache_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("SINDI_VERDICT_CACHE", str(tmp_path / "env.sqlite3"))
+    light = ComparatorRulesOnly()
+    assert light.compare("a > b", "a >= b") == "The first predicate is stronger."
+    assert light.compare("a >= b", "a > b") == "The second predicate is stronger."
+    assert light.implies("a > b", "a >= b")
+    assert light.verdict_cache.cache_info()[:2] == (2, 1)
+    assert ComparatorRulesOnly(verdict_cache=False).verdict_cache is None
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = VerdictCache(tmp_path / "small.sqlite3", max_entries=3)
+    for p in "abc":
+        cache.put("v", p, "z", True, False)
+    assert cache.get("v", "z", "a") == (False, True)  # reversed pair; "a" is now the most recent
+    cache.put("v", "d", "z", None, True)
+    assert len(cache) == 3 and cache.get("v", "b", "z") is None
+    assert cache.get("v", "d", "z") == (None, True)
+    stats = cache.stats()
+    assert stats["entries"] == 3 and stats["versions"] == {"v": 3} and stats["hits"] == 2
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_solver_signature_checks_are_cached(tmp_path):
+    cache = VerdictCache(tmp_path / "verdicts.sqlite3")
+    node = ComparatorRulesOnly(verdict_cache=False).prepare("a + b > c").ast
+    assert solver_signature(node, cache) == solver_signature(node, cache) == {"a", "b", "c"}
+    assert cache.cache_info()[:2] == (1, 1)
@@ -3,8 +3,7 @@ import sys
 
 # import our comparator module from the parent directory
 sys.path.append('../..')
-import src.sindi.comparator as cp
-import src.sindi.comparator_light as cp_light
+import src.sindi.reduce as sindi_reduce
 
 
 import re
@@ -12,8 +11,9 @@ import time
 import os
 
 
-comparator = cp_light.ComparatorRulesOnly()
 output_folder = ""
+# Clusters of the current contract that lost / kept all their predicates
+cluster_results = {"kept": [], "removed": []}
 
 def parse_daikon_list(predicates: list):
    """Takes a list of predicates and outputs a list of parsed predicats"""
@@ -96,6 +96,7 @@ def reduce_json(path: str, contract_addr: str):
       entry["preconditions"] =reduced_preconditions
       total_list_red += reduced_postconditions + reduced_preconditions
 
+   write_cluster_results(contract_addr)
    json_out = open(f"{output_folder}/{contract_addr}.json", "w")
    json.dump(data, json_out, indent=4)
    json_out.close()
@@ -135,59 +136,37 @@ def reduce_json(path: str, contract_addr: str):
 
 def find_strongest_predicate(preds: list, contract_addr: str, all_preds_dict: dict):
     """Takes a list of predicates preds and finds the strongest ones in the list"""
-    before_preds = preds.copy()
-    
-    for first_pred in preds:
-        stronger_predicate_exists = False
-        for second_pred in preds:
-            if '"' in first_pred or '"' in second_pred:
-               continue
-            try:
-               result = comparator.compare(first_pred, second_pred)
-               if result == 'The predicates are equivalent.':
-                  continue
-               if result == 'The first predicate is stronger.':
-                  preds.remove(second_pred)
-               if result == 'The second predicate is stronger.':
-                  preds.remove(first_pred)
-            except Exception as e:
-               print('- - -' * 20)
-               print(f"Error comparing predicates: {first_pred} and {second_pred}. Error: {e}")
-               print('- - -' * 20)
-               continue
-            
-
-    # Define file paths for removed and kept predicates
-    removed_file_path = f"{output_folder}/removed/{contract_addr}-removed.json"
-    kept_file_path = f"{output_folder}/kept/{contract_addr}-kept.json"
-    
-    # Prepare output data
+    # Predicates with string literals are not compared; they are always kept.
+    comparable = [pred for pred in preds if '"' not in pred]
+    reduction = sindi_reduce.strongest(comparable, engine="light")
+    for index, error in reduction.errors.items():
+        print('- - -' * 20)
+        print(f"Error comparing predicate: {comparable[index]}. Error: {error}")
+        print('- - -' * 20)
+
+    removed = {comparable[removal.index] for removal in reduction.removed}
+    kept = [pred for pred in preds if pred not in removed]
+
+    # Buffered per cluster; write_cluster_results writes them once per contract
     output_data = {
-        "before_preds": parse_original(all_preds_dict, [before_preds]), 
-        "after_preds": parse_original(all_preds_dict, [preds])
+        "before_preds": parse_original(all_preds_dict, [preds]),
+        "after_preds": parse_original(all_preds_dict, [kept]),
+        "removal_reasons": {
+            all_preds_dict[comparable[removal.index]]: reduction.explain(removal)
+            for removal in reduction.removed
+        },
     }
+    cluster_results["removed" if removed else "kept"].append(output_data)
+    return kept
 
-    # Select the appropriate file path based on whether predicates were removed
-    file_path = removed_file_path if len(preds) != len(before_preds) else kept_file_path
-
-    # Load existing data, append new data, and write back to the file
-    if os.path.exists(file_path):
-        with open(file_path, "r") as file:
-            existing_data = json.load(file)
-    else:
-        existing_data = []
 
-    existing_data.append(output_data)
-    
-    with open(file_path, "w") as file:
-        json.dump(existing_data, file, indent=4)
-
-    # Error handling for unexpected increase in predicates
-    if len(preds) > len(before_preds):
-        print("ERROR")
-        exit()
-    
-    return preds
+def write_cluster_results(contract_addr: str):
+    """Writes the buffered kept/removed clusters of a contract, one file each"""
+    for outcome, clusters in cluster_results.items():
+        if clusters:
+            with open(f"{output_folder}/{outcome}/{contract_addr}-{outcome}.json", "w") as file:
+                json.dump(clusters, file, indent=4)
+        clusters.clear()
 
 
 def regex_parse(a: str,):
@@ -17,7 +17,6 @@ def _ensure_sindi_on_path():
 
 _ensure_sindi_on_path()
 
-import src.sindi.comparator as cp  
 from src.sindi.comparator_light import ComparatorRulesOnly as LightComparator
 
 # ----------------------------------------------------------------------------
@@ -44,6 +43,24 @@ def compare_pair(comparator, old_pred: Optional[str], new_pred: Optional[str]) -
     except Exception as e:
         return f"ERROR: {e}"
 
+def timing_columns(comparator, old_pred: Optional[str], new_pred: Optional[str]) -> Dict[str, Any]:
+    """
+    Verdict plus where its time went (`compare_detailed`): deciding engine,
+    total milliseconds and the slowest pipeline stage.
+    """
+    if not old_pred or not new_pred:
+        return {"verdict": "SKIPPED (predicate missing)"}
+    try:
+        v = comparator.compare_detailed(old_pred, new_pred)
+    except Exception as e:
+        return {"verdict": f"ERROR: {e}"}
+    return {
+        "verdict": v.text,
+        "decided_by": v.decided_by,
+        "total_ms": round(v.total_ns / 1e6, 3),
+        "slowest_stage": max(v.timings_ns, key=v.timings_ns.get),
+    }
+
 # ----------------------------------------------------------------------------
 # Main
 # ----------------------------------------------------------------------------
@@ -54,17 +71,28 @@ def main() -> int:
     ap.add_argument("-o", "--output", required=True, help="Path to output CSV.")
     ap.add_argument("--light", action="store_true", help="Use solver-free light comparator (if available).")
     ap.add_argument("--print-summary", action="store_true", help="Print a verdict histogram at the end.")
+    ap.add_argument("--timeout-ms", type=int, default=None,
+                    help="Per-pair time budget; pairs over it get an 'unknown' verdict.")
+    ap.add_argument("--max-memory-mb", type=int, default=None, help="Per-pair memory budget.")
+    ap.add_argument("--isolate", action="store_true",
+                    help="Compare in a worker process that is killed when a pair goes over budget.")
+    ap.add_argument("--timings", action="store_true",
+                    help="Add decided_by, total_ms and slowest_stage columns (full comparator only).")
     args = ap.parse_args()
 
-    # Choose comparator
+    # Choose comparator (the full one pulls in SymPy and Z3, so only import it when used)
+    if not args.light or LightComparator is None:
+        import src.sindi.comparator as cp
     if args.light:
         if LightComparator is None:
             print("[warn] --light requested but light comparator not importable; falling back to full comparator.")
-            comparator = cp.Comparator()
+            comparator = cp.Comparator(timeout_ms=args.timeout_ms, max_memory_mb=args.max_memory_mb,
+                                       isolate=args.isolate)
         else:
             comparator = LightComparator()
     else:
-        comparator = cp.Comparator()
+        comparator = cp.Comparator(timeout_ms=args.timeout_ms, max_memory_mb=args.max_memory_mb,
+                                   isolate=args.isolate)
 
     # Load JSON
     with open(args.input, "r", encoding="utf-8") as f:
@@ -86,6 +114,9 @@ def main() -> int:
         "new_predicate",
         "verdict",
     ]
+    timings = args.timings and hasattr(comparator, "compare_detailed")
+    if timings:
+        fieldnames += ["decided_by", "total_ms", "slowest_stage"]
     os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
     out_f = open(args.output, "w", newline="", encoding="utf-8")
     writer = csv.DictWriter(out_f, fieldnames=fieldnames)
@@ -96,7 +127,8 @@ def main() -> int:
     for i, rec in enumerate(records):
         old_pred = _get_pred(rec.get("old_norm_args"))
         new_pred = _get_pred(rec.get("new_norm_args"))
-        verdict = compare_pair(comparator, old_pred, new_pred)
+        extra = timing_columns(comparator, old_pred, new_pred) if timings else {}
+        verdict = extra.pop("verdict") if timings else compare_pair(comparator, old_pred, new_pred)
 
         row = {
             "idx": i,
@@ -108,6 +140,7 @@ def main() -> int:
             "old_predicate": old_pred,
             "new_predicate": new_pred,
             "verdict": verdict,
+            **extra,
         }
         writer.writerow(row)
 